@@ -3,17 +3,20 @@ Authentication endpoints (login, current user)
 """
 
 from datetime import timedelta
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from backend.config import settings
-from backend.database.connection import get_db
+from backend.database.connection import AsyncSessionLocal, get_db
 from backend.database import schemas
 from backend.services.user_service import UserService
+from backend.utils.cache import current_user_cache, organization_domains_cache
 from backend.utils.security import create_access_token
-from backend.database.models import UserRole
+from backend.database.models import Domain, User, UserRole
 
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -23,6 +26,23 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
+async def _load_current_user(user_id: int) -> Optional[Tuple[User, List[Domain]]]:
+    """
+    Load a user and its accessible domains for current_user_cache
+    
+    Uses its own short session, so the returned objects are detached and
+    can be shared between requests (each request merges its own copy).
+    """
+    async with AsyncSessionLocal() as session:
+        service = UserService(session)
+        user = await service.get_by_id(user_id)
+        if user is None:
+            return None
+        # User domains are derived from organization domains
+        domains = await service.get_user_domains(user_id)
+    return user, domains
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
@@ -44,10 +64,19 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    service = UserService(db)
-    user = await service.get_by_id(int(user_id))
-    if user is None:
-        raise credentials_exception
+    # Dashboards poll several endpoints per second - serve the user row and
+    # its domains from a short-lived cache (writers invalidate it)
+    cached = current_user_cache.get(int(user_id))
+    if cached is None:
+        cached = await _load_current_user(int(user_id))
+        if cached is None:
+            raise credentials_exception
+        current_user_cache.set(int(user_id), cached)
+    cached_user, cached_domains = cached
+    
+    # Copy the cached snapshot into this request's session without a query
+    user = await db.merge(cached_user, load=False)
+    user_domains_list = [await db.merge(domain, load=False) for domain in cached_domains]
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Kullanıcı pasif durumda")
     
@@ -58,11 +87,10 @@ async def get_current_user(
         from backend.utils.logger import logger
         logger.warning(f"User {user.id} has no organization_id, refreshing from database")
     
-    # Load user's domains from organization (not from user_domains table)
-    # User domains are now derived from organization domains
-    user_domains_list = await service.get_user_domains(user.id)
-    # Set domains on user object for backward compatibility
-    user.domains = user_domains_list
+    # Set domains on user object for backward compatibility. Attach them as
+    # already-committed state: a plain assignment would mark the many-to-many
+    # dirty and the request's next flush would re-INSERT existing user_domains rows
+    set_committed_value(user, "domains", user_domains_list)
     
     return user
 
@@ -130,14 +158,6 @@ async def register(
     """
     service = UserService(db)
 
-    # Check if user already exists
-    existing_user = await service.get_by_email(user_data.email)
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
     # Determine target organization to check if this is first user
     from backend.database import crud as org_crud
     organization_id = None
@@ -156,8 +176,7 @@ async def register(
         organization_id = 1
     
     # Check if this is the first user in the organization
-    user_count = await org_crud.get_organization_user_count(db, organization_id)
-    is_first_user = user_count == 0
+    is_first_user = not await org_crud.organization_has_users(db, organization_id)
     
     # Validate role for self-registration
     if not is_first_user:
@@ -178,6 +197,12 @@ async def register(
 
     # Create new user (first user will automatically get ADMIN role in user_service)
     user = await service.create_user(user_data)
+    if user is None:
+        # Duplicate email (rejected by the INSERT itself)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     # Generate access token
     access_token = create_access_token(
@@ -241,6 +266,10 @@ async def select_domains(
         if success:
             added_domains.append({"id": domain.id, "name": domain.name, "type": domain.type})
     
+    if added_domains:
+        organization_domains_cache.invalidate(current_user.organization_id)
+        current_user_cache.clear()
+    
     return {
         "message": "Domains added to organization successfully", 
         "domains": added_domains
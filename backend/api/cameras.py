@@ -5,7 +5,7 @@ Manage cameras (webcam, RTSP, file sources)
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
 from backend.database.connection import get_db
 from backend.database import crud, schemas
@@ -23,21 +23,29 @@ async def get_cameras(
     skip: int = 0,
     limit: int = 100,
     domain_id: int = None,
+    after_id: Optional[int] = None,
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all cameras with optional domain filtering
     
-    - **skip**: Number of records to skip (default: 0)
+    - **skip**: Number of records to skip (default: 0, deprecated: use after_id)
     - **limit**: Maximum number of records to return (default: 100)
     - **domain_id**: Filter by domain (optional)
+    - **after_id**: Return cameras with id greater than this - pass the last id of the previous page
     
     **Note:** Only cameras from the current user's organization are returned.
     """
     service = CameraService(db)
     # CRITICAL: Filter by organization_id for multi-tenant isolation
-    cameras = await service.get_all(skip=skip, limit=limit, domain_id=domain_id, organization_id=current_user.organization_id)
+    cameras = await service.get_all(
+        skip=skip,
+        limit=limit,
+        domain_id=domain_id,
+        organization_id=current_user.organization_id,
+        after_id=after_id
+    )
     return cameras
 
 
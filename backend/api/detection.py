@@ -19,6 +19,7 @@ from backend.utils.video_recorder import VideoRecorder
 from backend.utils.logger import logger
 from backend.database.connection import get_db
 from backend.database import schemas, crud
+from backend.services.domain_service import DomainService
 from backend.services.violation_service import ViolationService
 
 router = APIRouter(prefix="/detection", tags=["Detection"])
@@ -217,12 +218,14 @@ async def detect_frame(
         required_ppe = None
         actual_domain_id = None
 
+        # Domains and their rules come from DomainService's TTL caches (read every frame)
+        domain_service = DomainService(db)
         if camera_id and camera_id > 0:
             # Get camera from database to find its domain
             camera = await crud.get_camera_by_id(db, camera_id)
             if camera and camera.domain_id:
                 actual_domain_id = camera.domain_id
-                domain = await crud.get_domain_by_id(db, actual_domain_id)
+                domain = await domain_service.get_by_id(actual_domain_id)
                 if domain:
                     domain_type = domain.type
                     logger.info(f"Camera {camera_id} ({camera.name}) is in domain: {domain_type} (domain_id={actual_domain_id})")
@@ -233,14 +236,14 @@ async def detect_frame(
         elif domain_id:
             # Fallback: If no camera_id, use domain_id from request (for testing)
             actual_domain_id = domain_id
-            domain = await crud.get_domain_by_id(db, domain_id)
+            domain = await domain_service.get_by_id(domain_id)
             if domain:
                 domain_type = domain.type
                 logger.info(f"Using domain from request parameter: {domain_type} (domain_id={domain_id})")
 
         # Get required PPE rules for the domain
         if actual_domain_id:
-            rules = await crud.get_domain_rules(db, actual_domain_id)
+            rules = await domain_service.get_rules(actual_domain_id)
             required_rules = [r for r in rules if r.is_required]
             if required_rules:
                 # Map PPE type names to best.pt model class names
@@ -406,17 +409,16 @@ async def detect_frame(
                         if snapshot_path:
                             logger.info(f"[FACE RECOGNITION] Starting face matching for violation snapshot: {snapshot_path}")
                             try:
-                                # Get organization_id from camera
-                                camera = await crud.get_camera_by_id(db, camera_id)
+                                # Get organization_id from the camera loaded above (no second lookup)
                                 if camera and camera.organization_id:
                                     logger.info(f"[FACE RECOGNITION] Camera found: id={camera_id}, organization_id={camera.organization_id}")
                                     # Try to import FaceRecognitionService - make it optional
                                     try:
-                                        from backend.services.face_recognition_service import FaceRecognitionService
+                                        from backend.services.face_recognition_service import get_face_recognition_service
                                         from backend.config import settings
                                         
                                         logger.info("[FACE RECOGNITION] FaceRecognitionService imported successfully")
-                                        face_service = FaceRecognitionService()
+                                        face_service = get_face_recognition_service()
                                         # Construct full snapshot path
                                         snapshot_full_path = settings.data_dir / snapshot_path if not Path(snapshot_path).is_absolute() else Path(snapshot_path)
                                         
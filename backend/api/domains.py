@@ -3,14 +3,17 @@ Domain API endpoints
 Manage work domains (construction, manufacturing, etc.)
 """
 
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from backend.database.connection import get_db
+from backend.database.connection import AsyncSessionLocal, get_db
 from backend.database import crud, schemas
 from backend.services.domain_service import DomainService
 from backend.services.ppe_type_service import PPETypeService
+from backend.services.violation_service import ViolationService
+from backend.utils.cache import domain_rules_cache
 from backend.utils.logger import logger
 from backend.utils.permissions import has_permission, Permission
 from backend.api.auth import get_current_user
@@ -24,16 +27,18 @@ router = APIRouter(prefix="/domains", tags=["Domains"])
 async def get_domains(
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all domains with pagination
     
-    - **skip**: Number of records to skip (default: 0)
+    - **skip**: Number of records to skip (default: 0, deprecated: use after_id)
     - **limit**: Maximum number of records to return (default: 100)
+    - **after_id**: Return domains with id greater than this - pass the last id of the previous page
     """
     service = DomainService(db)
-    domains = await service.get_all(skip=skip, limit=limit)
+    domains = await service.get_all(skip=skip, limit=limit, after_id=after_id)
     return domains
 
 
@@ -172,6 +177,45 @@ async def get_domain_rules(
     return rules
 
 
+async def _domain_stats(domain_id: int, organization_id: Optional[int]) -> dict:
+    """Violation stats in a session of their own, so they can run beside the request's queries"""
+    async with AsyncSessionLocal() as session:
+        return await ViolationService(session).get_statistics(domain_id, organization_id=organization_id)
+
+
+@router.get("/{domain_id}/overview", response_model=schemas.DomainOverviewResponse)
+async def get_domain_overview(
+    domain_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get a domain with its violation stats, active cameras and PPE rules
+    
+    Replaces the separate stats / cameras / rules calls of a dashboard card.
+    The three lookups run concurrently (stats and rules are usually served
+    from cache), so the card waits for one round-trip instead of three.
+    
+    **Note:** Stats and cameras are limited to the current user's organization.
+    """
+    service = DomainService(db)
+    domain = await service.get_by_id(domain_id)
+    if not domain:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Domain with id {domain_id} not found"
+        )
+    
+    # get_rules loads in its own session on a cache miss, so only the camera
+    # query uses the request session
+    stats, cameras, rules = await asyncio.gather(
+        _domain_stats(domain_id, current_user.organization_id),
+        crud.get_cameras_by_domain(db, domain_id, organization_id=current_user.organization_id),
+        service.get_rules(domain_id),
+    )
+    return {"domain": domain, "stats": stats, "cameras": cameras, "rules": rules}
+
+
 @router.post("/{domain_id}/rules", response_model=schemas.DomainPPERuleResponse, status_code=status.HTTP_201_CREATED)
 async def create_domain_rule(
     domain_id: int,
@@ -207,5 +251,7 @@ async def create_domain_rule(
             detail=f"PPE type with id {rule.ppe_type_id} not found"
         )
     
-    return await crud.create_domain_rule(db, rule)
+    created_rule = await crud.create_domain_rule(db, rule)
+    domain_rules_cache.invalidate(domain_id)
+    return created_rule
 
@@ -4,20 +4,55 @@ Endpoints for managing email notification schedules
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, text
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
-from backend.database.connection import get_db
+from backend.database.connection import engine, get_db
 from backend.database.models import NotificationSchedule, ScheduleType
-from backend.services.scheduler_service import get_scheduler_service
+from backend.services.scheduler_service import SchedulerService, get_scheduler_service
 from backend.utils.logger import logger
 
 
 router = APIRouter(prefix="/api/notification-schedules", tags=["Notification Schedules"])
 
+_DELETE_OK = {"message": "Schedule deleted successfully"}
+
+_STMT_ALL_SCHEDULES = select(NotificationSchedule)
+
+# On PostgreSQL the list endpoint lets the database build the response JSON.
+# The shape mirrors NotificationSchedule.to_dict(): enum names are stored, so
+# lower() yields the ScheduleType value, and timestamps serialize as ISO 8601.
+_USE_SERVER_SIDE_JSON = engine.dialect.name == "postgresql"
+_SQL_ALL_SCHEDULES_JSON = text("""
+    SELECT COALESCE(json_agg(json_build_object(
+        'id', ns.id,
+        'type', lower(ns.type::text),
+        'enabled', ns.enabled,
+        'schedule_time', ns.schedule_time,
+        'schedule_day', ns.schedule_day,
+        'recipients', COALESCE(ns.recipients, '[]'::json),
+        'settings', COALESCE(ns.settings, '{}'::json),
+        'created_at', ns.created_at,
+        'updated_at', ns.updated_at,
+        'last_run_at', ns.last_run_at
+    ) ORDER BY ns.id), '[]'::json)::text
+    FROM notification_schedules ns
+""")
+
+# The scheduler is a process-wide singleton, so resolve it once per module
+_scheduler: Optional[SchedulerService] = None
+
+
+def _get_scheduler() -> SchedulerService:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = get_scheduler_service()
+    return _scheduler
+
 
 # ==========================================
 # PYDANTIC MODELS
@@ -69,7 +104,11 @@ async def get_notification_schedules(
 ):
     """Get all notification schedules"""
     try:
-        result = await db.execute(select(NotificationSchedule))
+        if _USE_SERVER_SIDE_JSON:
+            raw = await db.scalar(_SQL_ALL_SCHEDULES_JSON)
+            return Response(content=raw, media_type="application/json")
+
+        result = await db.execute(_STMT_ALL_SCHEDULES)
         schedules = result.scalars().all()
 
         return [
@@ -79,7 +118,7 @@ async def get_notification_schedules(
         ]
 
     except Exception as e:
-        logger.error(f"Error getting notification schedules: {str(e)}", exc_info=True)
+        logger.error("Error getting notification schedules: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get notification schedules: {str(e)}"
@@ -93,10 +132,7 @@ async def get_notification_schedule(
 ):
     """Get single notification schedule by ID"""
     try:
-        result = await db.execute(
-            select(NotificationSchedule).where(NotificationSchedule.id == schedule_id)
-        )
-        schedule = result.scalar_one_or_none()
+        schedule = await db.get(NotificationSchedule, schedule_id)
 
         if not schedule:
             raise HTTPException(
@@ -109,7 +145,7 @@ async def get_notification_schedule(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting notification schedule: {str(e)}", exc_info=True)
+        logger.error("Error getting notification schedule: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get notification schedule: {str(e)}"
@@ -153,10 +189,10 @@ async def create_notification_schedule(
         await db.refresh(schedule)
 
         # Reload scheduler to pick up new schedule
-        scheduler = get_scheduler_service()
+        scheduler = _get_scheduler()
         await scheduler.reload_schedules()
 
-        logger.info(f"Created notification schedule: {schedule.type.value}")
+        logger.info("Created notification schedule: %s", schedule.type.value)
 
         return NotificationScheduleResponse(**schedule.to_dict())
 
@@ -164,7 +200,7 @@ async def create_notification_schedule(
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error creating notification schedule: {str(e)}", exc_info=True)
+        logger.error("Error creating notification schedule: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create notification schedule: {str(e)}"
@@ -179,10 +215,7 @@ async def update_notification_schedule(
 ):
     """Update notification schedule"""
     try:
-        result = await db.execute(
-            select(NotificationSchedule).where(NotificationSchedule.id == schedule_id)
-        )
-        schedule = result.scalar_one_or_none()
+        schedule = await db.get(NotificationSchedule, schedule_id)
 
         if not schedule:
             raise HTTPException(
@@ -210,10 +243,10 @@ async def update_notification_schedule(
         await db.refresh(schedule)
 
         # Reload scheduler to pick up changes
-        scheduler = get_scheduler_service()
+        scheduler = _get_scheduler()
         await scheduler.reload_schedules()
 
-        logger.info(f"Updated notification schedule {schedule_id}")
+        logger.info("Updated notification schedule %s", schedule_id)
 
         return NotificationScheduleResponse(**schedule.to_dict())
 
@@ -221,24 +254,21 @@ async def update_notification_schedule(
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error updating notification schedule: {str(e)}", exc_info=True)
+        logger.error("Error updating notification schedule: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update notification schedule: {str(e)}"
         )
 
 
-@router.delete("/{schedule_id}")
+@router.delete("/{schedule_id}", response_class=ORJSONResponse)
 async def delete_notification_schedule(
     schedule_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Delete notification schedule"""
     try:
-        result = await db.execute(
-            select(NotificationSchedule).where(NotificationSchedule.id == schedule_id)
-        )
-        schedule = result.scalar_one_or_none()
+        schedule = await db.get(NotificationSchedule, schedule_id)
 
         if not schedule:
             raise HTTPException(
@@ -250,18 +280,18 @@ async def delete_notification_schedule(
         await db.commit()
 
         # Reload scheduler to remove deleted schedule
-        scheduler = get_scheduler_service()
+        scheduler = _get_scheduler()
         await scheduler.reload_schedules()
 
-        logger.info(f"Deleted notification schedule {schedule_id}")
+        logger.info("Deleted notification schedule %s", schedule_id)
 
-        return {"message": "Schedule deleted successfully"}
+        return ORJSONResponse(_DELETE_OK)
 
     except HTTPException:
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error deleting notification schedule: {str(e)}", exc_info=True)
+        logger.error("Error deleting notification schedule: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete notification schedule: {str(e)}"
@@ -275,10 +305,7 @@ async def test_notification_schedule(
 ):
     """Manually trigger a notification schedule for testing"""
     try:
-        result = await db.execute(
-            select(NotificationSchedule).where(NotificationSchedule.id == schedule_id)
-        )
-        schedule = result.scalar_one_or_none()
+        schedule = await db.get(NotificationSchedule, schedule_id)
 
         if not schedule:
             raise HTTPException(
@@ -287,10 +314,10 @@ async def test_notification_schedule(
             )
 
         # Trigger the job manually
-        scheduler = get_scheduler_service()
+        scheduler = _get_scheduler()
         await scheduler.trigger_job_manually(schedule.type)
 
-        logger.info(f"Manually triggered notification schedule {schedule_id}")
+        logger.info("Manually triggered notification schedule %s", schedule_id)
 
         return {
             "message": f"Test notification sent for {schedule.type.value}",
@@ -300,7 +327,7 @@ async def test_notification_schedule(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error testing notification schedule: {str(e)}", exc_info=True)
+        logger.error("Error testing notification schedule: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to test notification schedule: {str(e)}"
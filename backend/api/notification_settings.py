@@ -5,19 +5,34 @@ Manages email and alert configuration.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from backend.api.auth import get_current_admin
 from backend.database.connection import get_db
 from backend.database.models import NotificationSettings
 from backend.services.email_service import EmailConfig, configure_email_service, get_email_service
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/notification-settings", tags=["notification-settings"])
 
+# Static acknowledgement payloads, serialized directly without response-model processing
+_ENABLE_OK = {"status": "success", "message": "Email notifications enabled"}
+_DISABLE_OK = {"status": "success", "message": "Email notifications disabled"}
+
+# Settings is a single-row table; the statement is built once and reused by every endpoint
+_STMT_SETTINGS = select(NotificationSettings).limit(1)
+
+# Changing any of these requires the email service to be reconfigured
+_SMTP_FIELDS = frozenset({
+    "smtp_host", "smtp_port", "smtp_user", "smtp_password", "from_email", "from_name", "use_tls",
+})
+
 
 # Pydantic Models
 class NotificationSettingsCreate(BaseModel):
@@ -87,7 +102,7 @@ async def get_notification_settings(db: AsyncSession = Depends(get_db)):
     Get current notification settings.
     Creates default settings if none exist.
     """
-    result = await db.execute(select(NotificationSettings))
+    result = await db.execute(_STMT_SETTINGS)
     settings = result.scalars().first()
 
     if not settings:
@@ -109,20 +124,30 @@ async def update_notification_settings(
     Update notification settings.
     Reconfigures the email service with new settings.
     """
-    result = await db.execute(select(NotificationSettings))
+    result = await db.execute(_STMT_SETTINGS)
     settings = result.scalars().first()
 
-    if not settings:
+    is_new = settings is None
+    if is_new:
         settings = NotificationSettings()
         db.add(settings)
 
-    # Update fields
-    for key, value in settings_update.dict().items():
+    # Only write fields the client sent that actually differ from what is stored
+    payload = settings_update.model_dump(exclude_unset=True)
+    dirty = {key: value for key, value in payload.items() if getattr(settings, key) != value}
+
+    if not dirty and not is_new:
+        return settings
+
+    for key, value in dirty.items():
         setattr(settings, key, value)
 
     await db.commit()
     await db.refresh(settings)
 
+    if _SMTP_FIELDS.isdisjoint(dirty):
+        return settings
+
     # Reconfigure email service
     try:
         # Only configure if SMTP credentials are provided (strip whitespace and check)
@@ -130,7 +155,10 @@ async def update_notification_settings(
             smtp_user = settings.smtp_user.strip()
             smtp_password = settings.smtp_password.strip()
             
-            logger.info(f"Updating email settings: smtp_user='{smtp_user}' (len={len(smtp_user)}), smtp_password={'SET' if smtp_password else 'EMPTY'} (len={len(smtp_password)})")
+            logger.info(
+                "Updating email settings: smtp_user='%s' (len=%d), smtp_password=%s (len=%d)",
+                smtp_user, len(smtp_user), "SET" if smtp_password else "EMPTY", len(smtp_password),
+            )
             
             if smtp_user and smtp_password:
                 email_config = EmailConfig(
@@ -142,12 +170,15 @@ async def update_notification_settings(
                     from_name=settings.from_name or "PPE Safety System",
                     use_tls=settings.use_tls if settings.use_tls is not None else True,
                 )
-                configure_email_service(email_config)
-                logger.info(f"Email service reconfigured successfully: enabled={get_email_service().enabled}")
+                email_service = configure_email_service(email_config)
+                logger.info("Email service reconfigured successfully: enabled=%s", email_service.enabled)
             else:
-                logger.warning(f"SMTP credentials not provided or empty - email service not configured. smtp_user='{smtp_user}', smtp_password={'SET' if smtp_password else 'EMPTY'}")
+                logger.warning(
+                    "SMTP credentials not provided or empty - email service not configured. smtp_user='%s', smtp_password=%s",
+                    smtp_user, "SET" if smtp_password else "EMPTY",
+                )
     except Exception as e:
-        logger.error(f"Failed to reconfigure email service: {str(e)}", exc_info=True)
+        logger.error("Failed to reconfigure email service: %s", e, exc_info=True)
 
     return settings
 
@@ -160,7 +191,7 @@ async def send_test_email(
     """
     Send a test email to verify configuration.
     """
-    result = await db.execute(select(NotificationSettings))
+    result = await db.execute(_STMT_SETTINGS)
     settings = result.scalars().first()
 
     if not settings:
@@ -187,7 +218,10 @@ async def send_test_email(
         )
 
     # Temporarily configure email service with current settings for testing
-    logger.info(f"Configuring email service for test: smtp_host={settings.smtp_host}, smtp_port={settings.smtp_port}, smtp_user={smtp_user}, use_tls={settings.use_tls}")
+    logger.info(
+        "Configuring email service for test: smtp_host=%s, smtp_port=%s, smtp_user=%s, use_tls=%s",
+        settings.smtp_host, settings.smtp_port, smtp_user, settings.use_tls,
+    )
     
     email_config = EmailConfig(
         smtp_host=settings.smtp_host or "smtp.gmail.com",
@@ -198,20 +232,28 @@ async def send_test_email(
         from_name=settings.from_name or "PPE Safety System",
         use_tls=settings.use_tls if settings.use_tls is not None else True,
     )
-    configure_email_service(email_config)
-
-    email_service = get_email_service()
-    logger.info(f"Email service status after configuration: enabled={email_service.enabled}, smtp_user='{email_service.config.smtp_user}' (len={len(email_service.config.smtp_user) if email_service.config.smtp_user else 0}), smtp_password={'SET' if email_service.config.smtp_password else 'NOT SET'} (len={len(email_service.config.smtp_password) if email_service.config.smtp_password else 0})")
+    email_service = configure_email_service(email_config)
+    logger.info(
+        "Email service status after configuration: enabled=%s, smtp_user='%s' (len=%d), smtp_password=%s (len=%d)",
+        email_service.enabled,
+        email_service.config.smtp_user,
+        len(email_service.config.smtp_user or ""),
+        "SET" if email_service.config.smtp_password else "NOT SET",
+        len(email_service.config.smtp_password or ""),
+    )
     
     # Double-check: if still not enabled, there's a problem
     if not email_service.enabled:
-        error_msg = (
-            f"Email service configuration failed. "
-            f"Configured smtp_user='{smtp_user}' (len={len(smtp_user)}), "
-            f"but email service has smtp_user='{email_service.config.smtp_user}' (len={len(email_service.config.smtp_user) if email_service.config.smtp_user else 0}). "
-            f"This indicates a configuration issue."
+        logger.error(
+            "Email service configuration failed. "
+            "Configured smtp_user='%s' (len=%d), "
+            "but email service has smtp_user='%s' (len=%d). "
+            "This indicates a configuration issue.",
+            smtp_user,
+            len(smtp_user),
+            email_service.config.smtp_user,
+            len(email_service.config.smtp_user or ""),
         )
-        logger.error(error_msg)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Email service configuration failed. Please check backend logs for details."
@@ -248,13 +290,17 @@ async def send_test_email(
     try:
         # Check if email service is enabled before attempting to send
         if not email_service.enabled:
-            logger.error(f"Email service is not enabled. smtp_user='{email_service.config.smtp_user}', smtp_password={'SET' if email_service.config.smtp_password else 'NOT SET'}")
+            logger.error(
+                "Email service is not enabled. smtp_user='%s', smtp_password=%s",
+                email_service.config.smtp_user,
+                "SET" if email_service.config.smtp_password else "NOT SET",
+            )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email service is not configured. Please check your SMTP settings and ensure credentials are valid."
             )
         
-        logger.info(f"Attempting to send test email to {test_request.to_email}")
+        logger.info("Attempting to send test email to %s", test_request.to_email)
         success = email_service.send_email(
             to_emails=[test_request.to_email],
             subject=subject,
@@ -263,7 +309,7 @@ async def send_test_email(
         )
 
         if success:
-            logger.info(f"Test email sent successfully to {test_request.to_email}")
+            logger.info("Test email sent successfully to %s", test_request.to_email)
             return {"status": "success", "message": f"Test email sent to {test_request.to_email}"}
         else:
             logger.error("Email service returned False - email not sent")
@@ -281,7 +327,7 @@ async def send_test_email(
         error_details = f"{error_type}: {error_message}"
         
         # Log full exception with traceback
-        logger.error(f"Test email failed: {error_details}", exc_info=True)
+        logger.error("Test email failed: %s", error_details, exc_info=True)
         
         # Provide more helpful error message
         if "SMTP Authentication" in error_message or "535" in error_message:
@@ -299,10 +345,10 @@ async def send_test_email(
         )
 
 
-@router.post("/enable")
+@router.post("/enable", response_class=ORJSONResponse)
 async def enable_notifications(db: AsyncSession = Depends(get_db)):
     """Enable email notifications"""
-    result = await db.execute(select(NotificationSettings))
+    result = await db.execute(_STMT_SETTINGS)
     settings = result.scalars().first()
 
     if not settings:
@@ -320,13 +366,13 @@ async def enable_notifications(db: AsyncSession = Depends(get_db)):
     settings.enabled = True
     await db.commit()
 
-    return {"status": "success", "message": "Email notifications enabled"}
+    return ORJSONResponse(_ENABLE_OK)
 
 
-@router.post("/disable")
+@router.post("/disable", response_class=ORJSONResponse)
 async def disable_notifications(db: AsyncSession = Depends(get_db)):
     """Disable email notifications"""
-    result = await db.execute(select(NotificationSettings))
+    result = await db.execute(_STMT_SETTINGS)
     settings = result.scalars().first()
 
     if not settings:
@@ -338,27 +384,30 @@ async def disable_notifications(db: AsyncSession = Depends(get_db)):
     settings.enabled = False
     await db.commit()
 
-    return {"status": "success", "message": "Email notifications disabled"}
+    return ORJSONResponse(_DISABLE_OK)
 
 
-@router.get("/debug")
-async def debug_email_service(db: AsyncSession = Depends(get_db)):
-    """
-    Debug endpoint to check email service status.
-    Returns detailed information about email configuration.
-    """
-    result = await db.execute(select(NotificationSettings))
-    settings = result.scalars().first()
-    
-    email_service = get_email_service()
-    
-    debug_info = {
+def _build_debug_info(settings: Optional[NotificationSettings], email_service) -> dict:
+    """Build the email diagnostics payload, stripping each credential only once."""
+    config = email_service.config
+
+    db_user = settings.smtp_user if settings else None
+    db_password = settings.smtp_password if settings else None
+    db_user_stripped = db_user.strip() if db_user else ""
+    db_password_stripped = db_password.strip() if db_password else ""
+
+    svc_user = config.smtp_user
+    svc_password = config.smtp_password
+    svc_user_stripped = svc_user.strip() if svc_user else ""
+    svc_password_stripped = svc_password.strip() if svc_password else ""
+
+    return {
         "database_settings": {
             "exists": settings is not None,
-            "smtp_user": settings.smtp_user if settings else None,
-            "smtp_user_length": len(settings.smtp_user) if settings and settings.smtp_user else 0,
-            "smtp_password_set": bool(settings.smtp_password) if settings else False,
-            "smtp_password_length": len(settings.smtp_password) if settings and settings.smtp_password else 0,
+            "smtp_user": db_user,
+            "smtp_user_length": len(db_user or ""),
+            "smtp_password_set": bool(db_password),
+            "smtp_password_length": len(db_password or ""),
             "smtp_host": settings.smtp_host if settings else None,
             "smtp_port": settings.smtp_port if settings else None,
             "use_tls": settings.use_tls if settings else None,
@@ -366,34 +415,56 @@ async def debug_email_service(db: AsyncSession = Depends(get_db)):
         },
         "email_service": {
             "enabled": email_service.enabled,
-            "smtp_user": email_service.config.smtp_user,
-            "smtp_user_length": len(email_service.config.smtp_user) if email_service.config.smtp_user else 0,
-            "smtp_password_set": bool(email_service.config.smtp_password),
-            "smtp_password_length": len(email_service.config.smtp_password) if email_service.config.smtp_password else 0,
-            "smtp_host": email_service.config.smtp_host,
-            "smtp_port": email_service.config.smtp_port,
-            "use_tls": email_service.config.use_tls,
-            "from_email": email_service.config.from_email,
+            "smtp_user": svc_user,
+            "smtp_user_length": len(svc_user or ""),
+            "smtp_password_set": bool(svc_password),
+            "smtp_password_length": len(svc_password or ""),
+            "smtp_host": config.smtp_host,
+            "smtp_port": config.smtp_port,
+            "use_tls": config.use_tls,
+            "from_email": config.from_email,
         },
         "validation": {
-            "database_has_credentials": bool(
-                settings and 
-                settings.smtp_user and 
-                settings.smtp_password and
-                settings.smtp_user.strip() and
-                settings.smtp_password.strip()
-            ) if settings else False,
-            "email_service_has_credentials": bool(
-                email_service.config.smtp_user and
-                email_service.config.smtp_password and
-                email_service.config.smtp_user.strip() and
-                email_service.config.smtp_password.strip()
-            ),
-            "credentials_match": (
-                settings and
-                email_service.config.smtp_user == settings.smtp_user.strip() if settings and settings.smtp_user else False
-            ),
-        }
+            "database_has_credentials": bool(db_user_stripped and db_password_stripped),
+            "email_service_has_credentials": bool(svc_user_stripped and svc_password_stripped),
+            "credentials_match": bool(db_user) and svc_user == db_user_stripped,
+        },
     }
-    
+
+
+# Diagnostics are cached briefly so a polling monitor cannot hammer the DB
+_DEBUG_INFO_TTL_SECONDS = 5.0
+_debug_info_cache: Optional[Tuple[float, dict]] = None
+
+
+@router.get("/debug")
+async def debug_email_service(
+    force: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_admin),
+):
+    """
+    Debug endpoint to check email service status.
+    Returns detailed information about email configuration.
+
+    Only available when DEBUG logging is enabled, unless ``force=true`` is passed.
+    """
+    global _debug_info_cache
+
+    if not force and not logger.isEnabledFor(logging.DEBUG):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Email debug info is disabled. Enable DEBUG logging or pass force=true."
+        )
+
+    now = time.monotonic()
+    if _debug_info_cache is not None and now - _debug_info_cache[0] < _DEBUG_INFO_TTL_SECONDS:
+        return _debug_info_cache[1]
+
+    result = await db.execute(_STMT_SETTINGS)
+    settings = result.scalars().first()
+
+    debug_info = _build_debug_info(settings, get_email_service())
+    _debug_info_cache = (now, debug_info)
+
     return debug_info
@@ -3,34 +3,49 @@ PPE Type API endpoints
 Manage PPE types (helmet, vest, gloves, etc.)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
 from backend.database.connection import get_db
 from backend.database import crud, schemas
 from backend.services.ppe_type_service import PPETypeService
+from backend.utils.cache import domain_rules_cache, ppe_types_cache
 from backend.utils.logger import logger
+from backend.utils.serialization import dump_json_list
 
 
 router = APIRouter(prefix="/ppe-types", tags=["PPE Types"])
 
+# Validates ORM rows and serializes the list to JSON bytes in one pass
+_PPE_TYPE_LIST_ADAPTER = TypeAdapter(List[schemas.PPETypeResponse])
+
 
 @router.get("", response_model=List[schemas.PPETypeResponse])
 async def get_ppe_types(
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get all PPE types with pagination
     
-    - **skip**: Number of records to skip (default: 0)
+    - **skip**: Number of records to skip (default: 0, deprecated: use after_id)
     - **limit**: Maximum number of records to return (default: 100)
+    - **after_id**: Return PPE types with id greater than this - pass the last id of the previous page
     """
-    service = PPETypeService(db)
-    ppe_types = await service.get_all(skip=skip, limit=limit)
-    return ppe_types
+    # Cached as serialized JSON, so hits skip validation and encoding entirely
+    cache_key = ("list", skip, limit, after_id)
+    body = ppe_types_cache.get(cache_key)
+    if body is None:
+        service = PPETypeService(db)
+        body = await dump_json_list(
+            _PPE_TYPE_LIST_ADAPTER, await service.get_all(skip=skip, limit=limit, after_id=after_id)
+        )
+        ppe_types_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{ppe_type_id}", response_model=schemas.PPETypeResponse)
@@ -41,13 +56,18 @@ async def get_ppe_type(
     """
     Get a specific PPE type by ID
     """
-    service = PPETypeService(db)
-    ppe_type = await service.get_by_id(ppe_type_id)
-    if not ppe_type:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"PPE type with id {ppe_type_id} not found"
-        )
+    cache_key = ("id", ppe_type_id)
+    ppe_type = ppe_types_cache.get(cache_key)
+    if ppe_type is None:
+        service = PPETypeService(db)
+        db_ppe_type = await service.get_by_id(ppe_type_id)
+        if not db_ppe_type:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"PPE type with id {ppe_type_id} not found"
+            )
+        ppe_type = schemas.PPETypeResponse.model_validate(db_ppe_type)
+        ppe_types_cache.set(cache_key, ppe_type)
     return ppe_type
 
 
@@ -66,7 +86,9 @@ async def create_ppe_type(
     - **status**: active or planned
     """
     service = PPETypeService(db)
-    return await service.create(ppe_type)
+    created_ppe_type = await service.create(ppe_type)
+    ppe_types_cache.clear()
+    return created_ppe_type
 
 
 @router.put("/{ppe_type_id}", response_model=schemas.PPETypeResponse)
@@ -82,6 +104,8 @@ async def update_ppe_type(
     """
     service = PPETypeService(db)
     updated_ppe_type = await service.update(ppe_type_id, ppe_type)
+    ppe_types_cache.clear()
+    domain_rules_cache.clear()  # cached rules carry their PPE type
     if not updated_ppe_type:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
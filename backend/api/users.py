@@ -2,40 +2,214 @@
 User management endpoints with permission-based access control
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form, Response
+import asyncio
+import base64
+import binascii
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File, Form, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Dict
-from backend.database.models import User, Domain
+from typing import BinaryIO, Callable, Dict, List, Optional
+from backend.database.models import Domain, User, UserRole
 
+from backend.config import settings
 from backend.database.connection import get_db
-from backend.database import schemas
-from backend.services.user_service import UserService
+from backend.database import crud, schemas
+from backend.services.user_service import UserService, purge_deleted_user
 from backend.utils.auth_decorators import require_permission, require_role
 from backend.utils.permissions import Permission
-from backend.database.models import UserRole
 from backend.api.auth import get_current_user
+from backend.utils.logger import logger
+from backend.utils.serialization import cached_json_response, dump_json_list, run_cpu_bound
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Serialize list responses straight to JSON bytes (no second validation pass in FastAPI)
+_DOMAIN_LIST_ADAPTER = TypeAdapter(List[schemas.DomainResponse])
+_USER_PAGE_ADAPTER = TypeAdapter(schemas.PaginatedResponse[schemas.UserResponse])
+_PHOTO_LIST_ADAPTER = TypeAdapter(List[schemas.UserPhotoResponse])
+
+# Browser cache lifetime for /me/domains (photos are always revalidated via ETag)
+_MY_DOMAINS_MAX_AGE = 60
+
+# Chunk size used when writing uploaded photos to disk
+_UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=1)
+def _get_photo_encoder() -> Optional[Callable]:
+    """
+    Resolve the optional face encoding background task once
+    
+    Imported on first upload rather than at module load, so the app doesn't pull
+    in DeepFace/TensorFlow on every boot. Returns None (warning logged once) if
+    face recognition is not available.
+    """
+    try:
+        from backend.services.face_recognition_service import encode_user_photo
+    except Exception as e:
+        logger.warning(f"Face recognition service not available: {e}. Photo upload will continue without face encoding.")
+        return None
+    return encode_user_photo
+
+
+def _is_system_admin(user) -> bool:
+    """System Admin (user_id=1 or email=admin@safevision.io) is listed with its organization's domains"""
+    return user.id == 1 or user.email == "admin@safevision.io"
+
+
+_USER_NOT_FOUND = "Kullanıcı bulunamadı"
+
+
+def _scope_organization_id(current_user: User) -> Optional[int]:
+    """
+    Organization filter for looking up another user
+    
+    SUPER_ADMIN sees every user (None = no filter); everyone else only users
+    of their own organization. The filter is part of the query, so missing
+    and out-of-organization users both get the same 404.
+    """
+    if current_user.role == UserRole.SUPER_ADMIN:
+        return None
+    if not current_user.organization_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_USER_NOT_FOUND)
+    return current_user.organization_id
+
+
+async def get_scoped_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Dependency: load a user (with domains and organization) the current user may manage"""
+    user = await crud.get_user(db, user_id, organization_id=_scope_organization_id(current_user))
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_USER_NOT_FOUND)
+    return user
+
+
+async def get_target_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Row:
+    """
+    Dependency: access check for endpoints that act on /users/{user_id}
+    
+    Same scoping as get_scoped_user, but only selects id, organization_id
+    and role, so endpoints that just need the check skip loading the user.
+    """
+    target = await crud.get_user_scope(db, user_id, organization_id=_scope_organization_id(current_user))
+    if target is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=_USER_NOT_FOUND)
+    return target
+
+
+def _save_upload(source: BinaryIO, destination: Path) -> None:
+    """Copy an uploaded file to disk in 1 MiB chunks (blocking)"""
+    with open(destination, 'wb') as buffer:
+        shutil.copyfileobj(source, buffer, _UPLOAD_CHUNK_SIZE)
+
+
+def _encode_cursor(user_id: int) -> str:
+    return base64.urlsafe_b64encode(str(user_id).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Geçersiz sayfa imleci")
+
+
+def _build_user_page(
+    users: List[Row],
+    domains_by_user: Dict[int, List[Domain]],
+    domains_by_org: Dict[int, List[Domain]],
+    total: int,
+    skip: int,
+    limit: int
+) -> bytes:
+    """
+    Serialize a list_users page to JSON (sync, safe to run in the threadpool)
+    
+    users are crud.USER_LIST_COLUMNS rows; their domains come from the two
+    maps list_users loaded, so nothing here touches the DB.
+    """
+    # Rows come straight from the DB, so build the models with model_construct
+    # (no per-field validation) - JSON encoding still goes through the schema
+    response_users = []
+    for user in users:
+        if _is_system_admin(user) and user.organization_id:
+            # System Admin should always show organization domains, not user_domains table entries
+            domains = domains_by_org.get(user.organization_id, [])
+        else:
+            # For other users, use user's actual domains (from user_domains table)
+            domains = domains_by_user.get(user.id, [])
+
+        user_domains = [
+            schemas.DomainResponse.model_construct(
+                id=domain.id,
+                name=domain.name,
+                type=domain.type,
+                description=domain.description,
+                status=domain.status,
+                created_at=domain.created_at,
+                model_status=domain.model_status,
+                model_last_updated=domain.model_last_updated
+            )
+            for domain in domains
+        ]
+
+        response_users.append(schemas.UserResponse.model_construct(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            organization_id=user.organization_id,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            last_login=user.last_login,
+            domains=user_domains
+        ))
+
+    page = schemas.PaginatedResponse[schemas.UserResponse].model_construct(
+        items=response_users,
+        total=total,
+        skip=skip,
+        limit=limit,
+        next_cursor=_encode_cursor(users[-1].id) if len(users) == limit else None
+    )
+    return _USER_PAGE_ADAPTER.dump_json(page)
+
 
 @router.get("/me/domains", response_model=List[schemas.DomainResponse])
 async def get_my_domains(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(get_current_user)
 ):
     """
     Get current user's accessible domains
+    
+    get_current_user already resolves these (organization domains, or all
+    domains for SUPER_ADMIN), so no further queries are needed here.
+    Responses carry an ETag; unchanged lists come back as 304.
     """
-    service = UserService(db)
-    domains = await service.get_user_domains(current_user.id)
-    return domains
+    body = await dump_json_list(_DOMAIN_LIST_ADAPTER, current_user.domains)
+    return cached_json_response(request, body, max_age=_MY_DOMAINS_MAX_AGE)
 
 
 @router.get("", response_model=schemas.PaginatedResponse[schemas.UserResponse])
 async def list_users(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Deprecated: use cursor"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     organization_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission(Permission.USERS_VIEW))
@@ -43,12 +217,15 @@ async def list_users(
     """
     List users with organization-based filtering
     
+    Pages are ordered by user id. Pass the returned next_cursor to fetch the
+    next page (keyset pagination); skip is still accepted for compatibility.
+    
     **Permissions:**
     - SUPER_ADMIN: Can view all users (optional: filter by organization_id query param)
     - ADMIN: Can only view users in their own organization
     - Other roles: Cannot access this endpoint
     """
-    from backend.utils.logger import logger
+    after_id = _decode_cursor(cursor) if cursor else None
     
     try:
         service = UserService(db)
@@ -69,114 +246,29 @@ async def list_users(
                 filter_organization_id = current_user.organization_id
                 logger.info(f"ADMIN: filter_organization_id = {filter_organization_id}")
             else:
-                # User has no organization, return empty list
+                # User has no organization, return an empty page without querying
                 logger.warning(f"User {current_user.id} has no organization_id, returning empty list")
-                return []
+                return schemas.PaginatedResponse(items=[], total=0, skip=skip, limit=limit)
         
-        users, total = await service.list_users(skip=skip, limit=limit, organization_id=filter_organization_id)
+        users, total = await service.list_users(
+            skip=skip,
+            limit=limit,
+            organization_id=filter_organization_id,
+            after_id=after_id
+        )
         logger.info(f"Found {len(users)} users (total: {total}) for organization_id={filter_organization_id}")
         
-        # Load domains for each user from their organization
-        # Group by organization_id to minimize queries
-        org_ids = list(set(user.organization_id for user in users if user.organization_id))
-        domains_by_org: Dict[int, List[Domain]] = {}
+        # One query per domain source, only for the rows that need it
+        admin_org_ids = list(dict.fromkeys(u.organization_id for u in users if _is_system_admin(u) and u.organization_id))
+        member_ids = [u.id for u in users if not (_is_system_admin(u) and u.organization_id)]
+        domains_by_org = await crud.get_domains_by_organization(db, admin_org_ids) if admin_org_ids else {}
+        domains_by_user = await crud.get_domains_by_user(db, member_ids) if member_ids else {}
         
-        if org_ids:
-            # Load all organization domains in batch using direct SQL query
-            # This avoids async context issues
-            from backend.database.models import organization_domains
-            from sqlalchemy import select
-            
-            # First, get all organization-domain mappings
-            org_domain_mappings_query = select(
-                organization_domains.c.organization_id,
-                organization_domains.c.domain_id
-            ).where(organization_domains.c.organization_id.in_(org_ids))
-            
-            mappings_result = await db.execute(org_domain_mappings_query)
-            mappings = mappings_result.all()
-            
-            # Get unique domain IDs
-            domain_ids = list(set(mapping.domain_id for mapping in mappings))
-            
-            if domain_ids:
-                # Load all domains in one query
-                domains_query = select(Domain).where(Domain.id.in_(domain_ids))
-                
-                domains_result = await db.execute(domains_query)
-                all_domains = domains_result.scalars().all()
-                
-                # Create domain lookup by ID
-                domain_by_id = {domain.id: domain for domain in all_domains}
-                
-                # Map domains to organizations
-                for org_id in org_ids:
-                    domains_by_org[org_id] = []
-                
-                for mapping in mappings:
-                    org_id = mapping.organization_id
-                    domain_id = mapping.domain_id
-                    if domain_id in domain_by_id:
-                        domain = domain_by_id[domain_id]
-                        if domain not in domains_by_org[org_id]:
-                            domains_by_org[org_id].append(domain)
-        
-        # Build response manually to avoid async context issues with relationships
-        from backend.database import schemas as db_schemas
-        response_users = []
-        for idx, user in enumerate(users):
-            user_domains = []
-            # Special handling for System Admin (user_id=1 or email=admin@safevision.io)
-            # System Admin should always show organization domains, not user_domains table entries
-            is_system_admin = user.id == 1 or user.email == "admin@safevision.io"
-
-            if is_system_admin and user.organization_id:
-                # For System Admin, use organization domains instead of user_domains table
-                org_domains = domains_by_org.get(user.organization_id, [])
-                for domain in org_domains:
-                    user_domains.append(db_schemas.DomainResponse(
-                        id=domain.id,
-                        name=domain.name,
-                        type=domain.type,
-                        description=domain.description,
-                        status=domain.status,
-                        created_at=domain.created_at,
-                        model_status=getattr(domain, 'model_status', 'not_loaded'),
-                        model_last_updated=getattr(domain, 'model_last_updated', None)
-                    ))
-            elif user.domains:
-                # For other users, use user's actual domains (from user_domains table)
-                for domain in user.domains:
-                    user_domains.append(db_schemas.DomainResponse(
-                        id=domain.id,
-                        name=domain.name,
-                        type=domain.type,
-                        description=domain.description,
-                        status=domain.status,
-                        created_at=domain.created_at,
-                        model_status=getattr(domain, 'model_status', 'not_loaded'),
-                        model_last_updated=getattr(domain, 'model_last_updated', None)
-                    ))
-            
-            user_response = db_schemas.UserResponse(
-                id=user.id,
-                email=user.email,
-                full_name=user.full_name,
-                role=user.role,
-                organization_id=user.organization_id,
-                is_active=user.is_active,
-                created_at=user.created_at,
-                last_login=user.last_login,
-                domains=user_domains
-            )
-            response_users.append(user_response)
-        
-        return schemas.PaginatedResponse(
-            items=response_users,
-            total=total,
-            skip=skip,
-            limit=limit
+        # Building and encoding the page is pure CPU work: large pages go to the threadpool
+        body = await run_cpu_bound(
+            _build_user_page, users, domains_by_user, domains_by_org, total, skip, limit, size=len(users)
         )
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         logger.error(f"Error in list_users endpoint: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -203,12 +295,6 @@ async def create_user(
     - ADMIN cannot create other ADMIN users (only first user is admin)
     """
     service = UserService(db)
-    existing = await service.get_by_email(user_in.email)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Bu e-posta zaten kayıtlı"
-        )
     
     # Organization assignment logic
     if current_user.role == UserRole.SUPER_ADMIN:
@@ -220,10 +306,9 @@ async def create_user(
         if current_user.organization_id:
             # Set organization_name to current user's organization name
             # This will be used by UserService to assign the new user to the same organization
-            from backend.database import crud
-            org = await crud.get_organization_by_id(db, current_user.organization_id)
-            if org:
-                user_in.organization_name = org.name
+            # (organization is eager-loaded with current_user, so no extra query)
+            if current_user.organization:
+                user_in.organization_name = current_user.organization.name
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -245,30 +330,23 @@ async def create_user(
                 detail="ADMIN rolü oluşturulamaz. Sadece organization'ın ilk kullanıcısı ADMIN olabilir."
             )
     
-    return await service.create_user(user_in)
+    # Duplicate emails are rejected by the INSERT itself
+    user = await service.create_user(user_in)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu e-posta zaten kayıtlı"
+        )
+    return user
 
 
 @router.get("/{user_id}", response_model=schemas.UserResponse)
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission(Permission.USERS_VIEW))
+    current_user: User = Depends(require_permission(Permission.USERS_VIEW)),
+    user: User = Depends(get_scoped_user)
 ):
     """Get user by ID"""
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
-    
-    # Organization-based access control
-    if current_user.role != UserRole.SUPER_ADMIN:
-        # ADMIN can only view users in their own organization
-        if current_user.organization_id != user.organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Bu kullanıcıya erişim yetkiniz yok"
-            )
-    
     return user
 
 
@@ -277,22 +355,13 @@ async def update_user(
     user_id: int,
     user_in: schemas.UserUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission(Permission.USERS_UPDATE))
+    current_user: User = Depends(require_permission(Permission.USERS_UPDATE)),
+    target: Row = Depends(get_target_user)
 ):
     """Update user"""
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
     
-    # Organization-based access control
+    # Role restrictions
     if current_user.role != UserRole.SUPER_ADMIN:
-        # ADMIN can only update users in their own organization
-        if current_user.organization_id != user.organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Bu kullanıcıyı güncelleme yetkiniz yok"
-            )
         # ADMIN cannot change role to SUPER_ADMIN
         if user_in.role == UserRole.SUPER_ADMIN:
             raise HTTPException(
@@ -300,41 +369,49 @@ async def update_user(
                 detail="SUPER_ADMIN rolü atanamaz"
             )
         # ADMIN cannot change role to ADMIN (only first user in organization is admin)
-        if user_in.role == UserRole.ADMIN and user.role != UserRole.ADMIN:
+        if user_in.role == UserRole.ADMIN and target.role != UserRole.ADMIN:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="ADMIN rolü atanamaz. Sadece organization'ın ilk kullanıcısı ADMIN olabilir."
             )
     
-    return await service.update_user(user_id, user_in)
+    try:
+        return await UserService(db).update_user(user_id, user_in)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: int,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_permission(Permission.USERS_DELETE))
 ):
-    """Delete user (only SUPER_ADMIN)"""
+    """
+    Delete user (only SUPER_ADMIN)
+    
+    The user is soft-deleted (hidden from all lookups, can no longer log in)
+    before responding; the row and its related data are purged in the background.
+    """
     if current_user.role != UserRole.SUPER_ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Kullanıcı silme yetkisi sadece SUPER_ADMIN'e aittir"
         )
     
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
-    
     # Prevent self-deletion
-    if user.id == current_user.id:
+    if user_id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Kendi hesabınızı silemezsiniz"
         )
     
-    await service.delete_user(user_id)
+    service = UserService(db)
+    if not await service.soft_delete_user(user_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
+    
+    background_tasks.add_task(purge_deleted_user, user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -342,55 +419,26 @@ async def delete_user(
 # USER PHOTO ENDPOINTS
 # ==========================================
 
-@router.post("/{user_id}/photos", response_model=schemas.UserPhotoResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/{user_id}/photos", response_model=schemas.UserPhotoResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_user_photo(
     user_id: int,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     is_primary: bool = Form(False),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission(Permission.USERS_UPDATE))
+    current_user: User = Depends(require_permission(Permission.USERS_UPDATE)),
+    target: Row = Depends(get_target_user)
 ):
     """
     Upload a photo for a user and extract face encoding
     
+    The photo record is returned as soon as the file is stored (202);
+    face_encoding is filled in by a background task once extraction finishes.
+    
     **Permissions:**
     - ADMIN: Can upload photos for users in their organization
     - SUPER_ADMIN: Can upload photos for any user
     """
-    from pathlib import Path
-    from backend.database import crud
-    from backend.config import settings
-    from backend.utils.logger import logger
-    import shutil
-    import uuid
-    
-    # Try to import FaceRecognitionService - make it optional
-    try:
-        from backend.services.face_recognition_service import FaceRecognitionService
-        FACE_RECOGNITION_AVAILABLE = True
-    except ImportError as e:
-        logger.warning(f"Face recognition service not available: {e}. Photo upload will continue without face encoding.")
-        FACE_RECOGNITION_AVAILABLE = False
-        FaceRecognitionService = None
-    except Exception as e:
-        logger.warning(f"Face recognition service not available: {e}. Photo upload will continue without face encoding.")
-        FACE_RECOGNITION_AVAILABLE = False
-        FaceRecognitionService = None
-    
-    # Verify user exists and access control
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
-    
-    # Organization-based access control
-    if current_user.role != UserRole.SUPER_ADMIN:
-        if current_user.organization_id != user.organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Bu kullanıcı için fotoğraf yükleme yetkiniz yok"
-            )
-    
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(
@@ -407,10 +455,9 @@ async def upload_user_photo(
     unique_filename = f"{uuid.uuid4()}{file_ext}"
     photo_path = user_photos_dir / unique_filename
     
-    # Save file
+    # Save file (copied in a worker thread so large uploads don't block the event loop)
     try:
-        with open(photo_path, 'wb') as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await asyncio.to_thread(_save_upload, file.file, photo_path)
     except Exception as e:
         logger.error(f"Error saving photo file: {str(e)}")
         raise HTTPException(
@@ -418,21 +465,6 @@ async def upload_user_photo(
             detail="Fotoğraf kaydedilemedi"
         )
     
-    # Extract face encoding (optional - only if face recognition is available)
-    face_encoding = None
-    
-    if FACE_RECOGNITION_AVAILABLE:
-        try:
-            face_service = FaceRecognitionService()
-            face_encoding = face_service.extract_face_encoding(str(photo_path))
-            if face_encoding is None:
-                logger.warning(f"No face detected in uploaded photo for user {user_id}")
-        except Exception as e:
-            logger.error(f"Error extracting face encoding: {str(e)}")
-            # Continue without encoding - admin can retry later
-    else:
-        logger.info("Face recognition not available - photo uploaded without face encoding")
-    
     # Save relative path (from data directory)
     relative_path = f"user_photos/{user_id}/{unique_filename}"
     
@@ -442,11 +474,10 @@ async def upload_user_photo(
             db=db,
             user_id=user_id,
             photo_path=relative_path,
-            face_encoding=face_encoding,
+            face_encoding=None,
             is_primary=is_primary,
             uploaded_by=current_user.id
         )
-        return photo
     except Exception as e:
         # Clean up file if database save fails
         if photo_path.exists():
@@ -456,13 +487,24 @@ async def upload_user_photo(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Fotoğraf kaydı oluşturulamadı"
         )
+    
+    # Extract face encoding after responding (optional - only if face recognition is available)
+    encode_user_photo = _get_photo_encoder()
+    if encode_user_photo is not None:
+        background_tasks.add_task(encode_user_photo, photo.id, str(photo_path))
+    else:
+        logger.info("Face recognition not available - photo uploaded without face encoding")
+    
+    return photo
 
 
 @router.get("/{user_id}/photos", response_model=List[schemas.UserPhotoResponse])
 async def list_user_photos(
     user_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission(Permission.USERS_VIEW))
+    current_user: User = Depends(require_permission(Permission.USERS_VIEW)),
+    target: Row = Depends(get_target_user)
 ):
     """
     List all photos for a user
@@ -471,23 +513,9 @@ async def list_user_photos(
     - ADMIN: Can view photos for users in their organization
     - SUPER_ADMIN: Can view photos for any user
     """
-    from backend.database import crud
-    
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
-    
-    # Organization-based access control
-    if current_user.role != UserRole.SUPER_ADMIN:
-        if current_user.organization_id != user.organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Bu kullanıcının fotoğraflarını görüntüleme yetkiniz yok"
-            )
-    
     photos = await crud.get_user_photos(db, user_id)
-    return photos
+    body = await dump_json_list(_PHOTO_LIST_ADAPTER, photos)
+    return cached_json_response(request, body)
 
 
 @router.delete("/{user_id}/photos/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -495,7 +523,8 @@ async def delete_user_photo_endpoint(
     user_id: int,
     photo_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission(Permission.USERS_UPDATE))
+    current_user: User = Depends(require_permission(Permission.USERS_UPDATE)),
+    target: Row = Depends(get_target_user)
 ):
     """
     Delete a user photo
@@ -504,39 +533,19 @@ async def delete_user_photo_endpoint(
     - ADMIN: Can delete photos for users in their organization
     - SUPER_ADMIN: Can delete photos for any user
     """
-    from pathlib import Path
-    from backend.database import crud
-    from backend.config import settings
-    from backend.utils.logger import logger
-    
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
-    
-    # Organization-based access control
-    if current_user.role != UserRole.SUPER_ADMIN:
-        if current_user.organization_id != user.organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Bu kullanıcının fotoğraflarını silme yetkiniz yok"
-            )
-    
-    # Get photo to get file path
-    photo = await crud.get_user_photo_by_id(db, photo_id)
-    if not photo or photo.user_id != user_id:
+    # Delete database record (one DELETE ... RETURNING gives the file path)
+    photo_path = await crud.delete_user_photo(db, photo_id, user_id=user_id)
+    if photo_path is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fotoğraf bulunamadı")
     
     # Delete file
-    photo_file_path = settings.data_dir / photo.photo_path
+    photo_file_path = settings.data_dir / photo_path
     if photo_file_path.exists():
         try:
             photo_file_path.unlink()
         except Exception as e:
             logger.warning(f"Error deleting photo file: {str(e)}")
     
-    # Delete database record
-    await crud.delete_user_photo(db, photo_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -545,7 +554,8 @@ async def set_primary_photo(
     user_id: int,
     photo_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission(Permission.USERS_UPDATE))
+    current_user: User = Depends(require_permission(Permission.USERS_UPDATE)),
+    target: Row = Depends(get_target_user)
 ):
     """
     Set a photo as primary for a user
@@ -554,23 +564,8 @@ async def set_primary_photo(
     - ADMIN: Can set primary photo for users in their organization
     - SUPER_ADMIN: Can set primary photo for any user
     """
-    from backend.database import crud
-    
-    service = UserService(db)
-    user = await service.get_by_id(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı")
-    
-    # Organization-based access control
-    if current_user.role != UserRole.SUPER_ADMIN:
-        if current_user.organization_id != user.organization_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Bu kullanıcı için fotoğraf ayarlama yetkiniz yok"
-            )
-    
-    photo = await crud.update_user_photo(db, photo_id, is_primary=True)
-    if not photo or photo.user_id != user_id:
+    photo = await crud.set_primary_user_photo(db, user_id, photo_id)
+    if not photo:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Fotoğraf bulunamadı")
     
     return photo
@@ -3,19 +3,28 @@ Violation API endpoints
 Manage PPE violations with filtering and statistics
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import FileResponse
-from pathlib import Path
+import asyncio
+import base64
+import binascii
+import csv
+import io
+import os
+import stat
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime
 
-from backend.database.connection import get_db
+from backend.database.connection import AsyncSessionLocal, get_db
 from backend.database import crud, schemas
 from backend.database.models import ViolationSeverity, ViolationStatus
 from backend.services.violation_service import ViolationService
 from backend.utils.logger import logger
 from backend.utils.permissions import has_permission, Permission
+from backend.utils.serialization import etag_matches, run_cpu_bound
 from backend.config import settings
 from backend.api.auth import get_current_user
 
@@ -23,7 +32,98 @@ from backend.api.auth import get_current_user
 router = APIRouter(prefix="/violations", tags=["Violations"])
 
 
-@router.get("", response_model=schemas.PaginatedResponse)
+# Snapshots never change once written; browsers may reuse them without asking
+_SNAPSHOT_MAX_AGE = 3600
+# Resolved once at startup; relative snapshot_path values are joined onto it
+_SNAPSHOTS_DIR = os.fspath(settings.snapshots_dir.resolve())
+
+# Serialize list responses straight to JSON bytes (no second validation pass in FastAPI)
+_VIOLATION_PAGE_ADAPTER = TypeAdapter(schemas.PaginatedResponse[schemas.ViolationResponse])
+
+
+def _build_violation_page(
+    violations: List[Row],
+    total: Optional[int],
+    skip: int,
+    limit: int,
+    next_cursor: Optional[str]
+) -> bytes:
+    """Validate and encode a violations page (sync, safe to run in the threadpool)"""
+    fields = violations[0]._fields if violations else ()
+    page = {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        # Validate from plain dicts - about three times faster than reading
+        # the row attributes with from_attributes
+        "items": [dict(zip(fields, row)) for row in violations],
+        "next_cursor": next_cursor,
+    }
+    return _VIOLATION_PAGE_ADAPTER.dump_json(
+        _VIOLATION_PAGE_ADAPTER.validate_python(page, from_attributes=True)
+    )
+
+
+_EXPORT_COLUMNS = (
+    "id", "timestamp", "camera_id", "domain_id", "severity", "status", "missing_ppe",
+    "confidence", "track_id", "detected_user_id", "acknowledged", "acknowledged_by",
+    "acknowledged_at", "duration_seconds", "notes",
+)
+_EXPORT_CHUNK_ROWS = 500
+
+
+def _export_cell(row: Row, column: str):
+    value = getattr(row, column)
+    if column == "missing_ppe":
+        return ";".join(
+            str(item.get("type", "")) if isinstance(item, dict) else str(item)
+            for item in value or []
+        )
+    if isinstance(value, (ViolationSeverity, ViolationStatus)):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return "" if value is None else value
+
+
+async def _export_violations_csv(
+    filters: schemas.ViolationFilterParams,
+    organization_id: Optional[int]
+) -> AsyncIterator[str]:
+    """
+    Yield the export as CSV text, _EXPORT_CHUNK_ROWS rows per chunk
+    
+    Opens its own session: the response body is produced after the endpoint
+    has returned, and a long export shouldn't hold the request's session.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_EXPORT_COLUMNS)
+    rows = 0
+    async with AsyncSessionLocal() as db:
+        async for row in ViolationService(db).stream_violations(filters, organization_id=organization_id):
+            writer.writerow([_export_cell(row, column) for column in _EXPORT_COLUMNS])
+            rows += 1
+            if rows % _EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _encode_cursor(timestamp: datetime, violation_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{violation_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, violation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(violation_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+
+
+@router.get("", response_model=schemas.PaginatedResponse[schemas.ViolationResponse])
 async def get_violations(
     domain_id: Optional[int] = Query(None, description="Filter by domain"),
     camera_id: Optional[int] = Query(None, description="Filter by camera"),
@@ -32,8 +132,10 @@ async def get_violations(
     missing_ppe_type: Optional[str] = Query(None, description="Filter by missing PPE type (e.g., 'hard_hat', 'safety_vest')"),
     start_date: Optional[datetime] = Query(None, description="Filter by start date (ISO format)"),
     end_date: Optional[datetime] = Query(None, description="Filter by end date (ISO format)"),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (deprecated: use cursor)"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of records"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Include total count (skip it when paging with cursor)"),
     current_user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -50,12 +152,15 @@ async def get_violations(
     - **end_date**: Violations before this date
     
     **Pagination:**
-    - **skip**: Number of records to skip
+    - **cursor**: next_cursor of the previous page (newest first, keyset - fast at any depth)
+    - **skip**: Number of records to skip (deprecated, slow on deep pages)
     - **limit**: Maximum number of records (max 100)
+    - **include_total**: Set to false to skip the COUNT query (total is then null)
     
     **Returns:**
-    Paginated response with total count and items
+    Paginated response with total count, items and next_cursor
     """
+    before_timestamp, before_id = _decode_cursor(cursor) if cursor else (None, None)
     filters = schemas.ViolationFilterParams(
         domain_id=domain_id,
         camera_id=camera_id,
@@ -65,7 +170,10 @@ async def get_violations(
         start_date=start_date,
         end_date=end_date,
         skip=skip,
-        limit=limit
+        limit=limit,
+        before_timestamp=before_timestamp,
+        before_id=before_id,
+        include_total=include_total
     )
     
     # Use service layer instead of direct CRUD
@@ -73,12 +181,15 @@ async def get_violations(
     service = ViolationService(db)
     violations, total = await service.get_violations(filters, organization_id=current_user.organization_id)
     
-    return schemas.PaginatedResponse(
-        total=total,
-        skip=skip,
-        limit=limit,
-        items=[schemas.ViolationResponse.model_validate(v) for v in violations]
+    next_cursor = (
+        _encode_cursor(violations[-1].timestamp, violations[-1].id)
+        if len(violations) == limit else None
+    )
+    # Validating and encoding the page is pure CPU work: large pages go to the threadpool
+    body = await run_cpu_bound(
+        _build_violation_page, violations, total, skip, limit, next_cursor, size=len(violations)
     )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/stats", response_model=dict)
@@ -105,6 +216,74 @@ async def get_violation_statistics(
     return stats
 
 
+@router.get("/stats/by-domain", response_model=dict)
+async def get_violation_statistics_by_domain(
+    domain_ids: List[int] = Query(..., description="Domains to compute statistics for"),
+    start_date: Optional[datetime] = Query(None, description="Start date"),
+    end_date: Optional[datetime] = Query(None, description="End date"),
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get violation statistics for several domains in one request
+    
+    Returns a mapping of domain ID to the same statistics as GET /violations/stats.
+    The domains are queried concurrently, so multi-domain dashboards wait for
+    the slowest domain instead of the sum of all of them.
+    
+    **Note:** Only statistics from the current user's organization are returned.
+    """
+    # One pooled connection per domain; keep a single request well inside the pool
+    if len(domain_ids) > 20:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At most 20 domain_ids are allowed"
+        )
+    service = ViolationService(db)
+    # CRITICAL: Filter by organization_id for multi-tenant isolation
+    return await service.get_statistics_by_domain(
+        domain_ids, start_date, end_date, organization_id=current_user.organization_id
+    )
+
+
+@router.get("/export")
+async def export_violations(
+    domain_id: Optional[int] = Query(None, description="Filter by domain"),
+    camera_id: Optional[int] = Query(None, description="Filter by camera"),
+    status: Optional[ViolationStatus] = Query(None, description="Filter by workflow status"),
+    severity: Optional[ViolationSeverity] = Query(None, description="Filter by severity"),
+    missing_ppe_type: Optional[str] = Query(None, description="Filter by missing PPE type (e.g., 'hard_hat', 'safety_vest')"),
+    start_date: Optional[datetime] = Query(None, description="Filter by start date (ISO format)"),
+    end_date: Optional[datetime] = Query(None, description="Filter by end date (ISO format)"),
+    current_user=Depends(get_current_user)
+):
+    """
+    Export all violations matching the filters as CSV (newest first)
+    
+    Takes the same filters as GET /violations, without pagination. Rows are
+    streamed from a server-side cursor, so large exports use constant memory
+    and the download starts right away.
+    
+    **Note:** Only violations from the current user's organization are exported.
+    """
+    filters = schemas.ViolationFilterParams(
+        domain_id=domain_id,
+        camera_id=camera_id,
+        status=status,
+        severity=severity,
+        missing_ppe_type=missing_ppe_type,
+        start_date=start_date,
+        end_date=end_date,
+        include_total=False
+    )
+    # CRITICAL: Filter by organization_id for multi-tenant isolation
+    return StreamingResponse(
+        _export_violations_csv(filters, current_user.organization_id),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="violations.csv"'}
+    )
+
+
 @router.get("/{violation_id}", response_model=schemas.ViolationResponse)
 async def get_violation(
     violation_id: int,
@@ -157,6 +336,45 @@ async def create_violation(
         )
 
 
+# Upper bound for one bulk request (keeps a single INSERT/transaction reasonably small)
+MAX_BULK_VIOLATIONS = 500
+
+
+@router.post("/bulk", response_model=schemas.ViolationBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_violations_bulk(
+    violations: List[schemas.ViolationCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many violations in one request
+    
+    **Note:** Intended for the ML engine: buffer detections briefly and flush them
+    here instead of calling POST /violations once per detection. All violations are
+    inserted in a single statement and transaction; if any camera or domain is
+    unknown, nothing is created.
+    
+    Body: list of the same objects POST /violations accepts (max 500)
+    """
+    if not violations:
+        return schemas.ViolationBulkCreateResponse(ids=[])
+    if len(violations) > MAX_BULK_VIOLATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_VIOLATIONS} violations per request"
+        )
+    
+    service = ViolationService(db)
+    try:
+        created = await service.create_violations_bulk(violations)
+    except ValueError as e:
+        # Service layer validation errors
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    return schemas.ViolationBulkCreateResponse(ids=[v.id for v in created])
+
+
 @router.put("/{violation_id}", response_model=schemas.ViolationResponse)
 async def update_violation(
     violation_id: int,
@@ -220,10 +438,12 @@ async def update_violation(
 @router.get("/{violation_id}/snapshot")
 async def get_violation_snapshot(
     violation_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Return stored snapshot image for a violation.
+    Answers 304 when the client's If-None-Match already has the file's ETag.
     """
     violation = await crud.get_violation_by_id(db, violation_id)
     if not violation or not violation.snapshot_path:
@@ -232,17 +452,35 @@ async def get_violation_snapshot(
             detail="Snapshot not found for this violation"
         )
 
-    file_path = Path(violation.snapshot_path)
-    if not file_path.is_absolute():
-        file_path = settings.snapshots_dir / file_path
+    file_path = violation.snapshot_path
+    if not os.path.isabs(file_path):
+        file_path = os.path.join(_SNAPSHOTS_DIR, file_path)
 
-    if not file_path.exists():
+    # One stat serves the existence check and the response headers
+    # (FileResponse would otherwise stat the file again)
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Snapshot file is missing on the server"
         )
 
-    return FileResponse(file_path, media_type="image/jpeg")
+    headers = {
+        "ETag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        "Cache-Control": f"private, max-age={_SNAPSHOT_MAX_AGE}",
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(
+        file_path,
+        media_type="image/jpeg",
+        headers=headers,
+        stat_result=stat_result
+    )
 
 
 @router.post("/{violation_id}/acknowledge", response_model=schemas.ViolationResponse)
@@ -3,9 +3,9 @@ WebSocket endpoints for real-time notifications
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from typing import List, Dict, Set
-import json
+from typing import List, Dict, FrozenSet, Optional, Set
 import asyncio
+import orjson
 from datetime import datetime
 
 from backend.utils.logger import logger
@@ -14,6 +14,10 @@ from backend.database import schemas
 
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
 
+# Violations arriving within this window of each other go out as one batch
+VIOLATION_BATCH_WINDOW = 0.03  # seconds
+MAX_VIOLATION_BATCH = 100
+
 
 class ConnectionManager:
     """
@@ -22,8 +26,16 @@ class ConnectionManager:
     
     def __init__(self):
         # Store active connections: {websocket: {domain_ids: Set[int], user_id: Optional[int]}}
+        # Copy-on-write: connect/disconnect swap in a new dict (no await in between, so
+        # no lock is needed on the event loop) and broadcasts iterate a stable snapshot
         self.active_connections: Dict[WebSocket, Dict] = {}
-        self.lock = asyncio.Lock()
+        # Recipient index for domain broadcasts (also copy-on-write):
+        # domain_id -> clients filtering on it, plus clients without a filter
+        self.domain_subscribers: Dict[int, FrozenSet[WebSocket]] = {}
+        self.all_domain_subscribers: FrozenSet[WebSocket] = frozenset()
+        # Violations waiting for the current batch window, and the task flushing them
+        self._pending_violations: List[dict] = []
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def connect(self, websocket: WebSocket, domain_ids: Set[int] = None, user_id: int = None):
         """
@@ -35,19 +47,42 @@ class ConnectionManager:
             user_id: Optional user ID for user-specific notifications
         """
         await websocket.accept()
-        async with self.lock:
-            self.active_connections[websocket] = {
-                "domain_ids": domain_ids or set(),  # Empty set = all domains
+        domain_ids = domain_ids or set()  # Empty set = all domains
+        self.active_connections = {
+            **self.active_connections,
+            websocket: {
+                "domain_ids": domain_ids,
                 "user_id": user_id,
                 "connected_at": datetime.utcnow()
             }
+        }
+        if domain_ids:
+            subscribers = dict(self.domain_subscribers)
+            for domain_id in domain_ids:
+                subscribers[domain_id] = subscribers.get(domain_id, frozenset()) | {websocket}
+            self.domain_subscribers = subscribers
+        else:
+            self.all_domain_subscribers = self.all_domain_subscribers | {websocket}
         logger.info(f"WebSocket client connected. Total connections: {len(self.active_connections)}")
     
     async def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection"""
-        async with self.lock:
-            if websocket in self.active_connections:
-                del self.active_connections[websocket]
+        info = self.active_connections.get(websocket)
+        if info is not None:
+            self.active_connections = {
+                ws: ws_info for ws, ws_info in self.active_connections.items() if ws is not websocket
+            }
+            if info["domain_ids"]:
+                subscribers = dict(self.domain_subscribers)
+                for domain_id in info["domain_ids"]:
+                    remaining = subscribers.get(domain_id, frozenset()) - {websocket}
+                    if remaining:
+                        subscribers[domain_id] = remaining
+                    else:
+                        subscribers.pop(domain_id, None)
+                self.domain_subscribers = subscribers
+            else:
+                self.all_domain_subscribers = self.all_domain_subscribers - {websocket}
         logger.info(f"WebSocket client disconnected. Total connections: {len(self.active_connections)}")
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
@@ -66,24 +101,29 @@ class ConnectionManager:
             message: Message dict to broadcast
             domain_id: Optional domain ID to filter recipients (None = all domains)
         """
-        disconnected = []
+        if domain_id is None:
+            targets = list(self.active_connections)
+        else:
+            # Clients filtering on this domain plus clients without a filter -
+            # looked up directly instead of checking every connection
+            targets = list(self.domain_subscribers.get(domain_id, frozenset()) | self.all_domain_subscribers)
         
-        async with self.lock:
-            connections = list(self.active_connections.items())
+        if not targets:
+            return
         
-        for websocket, info in connections:
-            try:
-                # Filter by domain_id if specified
-                if domain_id is not None:
-                    client_domains = info.get("domain_ids", set())
-                    # If client has no domain filter (empty set), send to all
-                    # Otherwise, only send if domain_id matches
-                    if client_domains and domain_id not in client_domains:
-                        continue
-                
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
+        # Encode once and send the same text frame to every client
+        # (send_json would re-serialize the message per socket)
+        payload = orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        # Send to all targets concurrently - one slow client doesn't delay the others
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for websocket in targets),
+            return_exceptions=True
+        )
+        disconnected = []
+        for websocket, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error broadcasting to client: {result}")
                 disconnected.append(websocket)
         
         # Clean up disconnected clients
@@ -97,22 +137,82 @@ class ConnectionManager:
         """
         Broadcast a violation notification to all relevant clients
         
+        The first violation after a quiet period is sent at once. Violations
+        arriving during the following VIOLATION_BATCH_WINDOW are collected and
+        sent as one "violation_batch" message per domain, so detection bursts
+        cost one frame per client per window instead of one per violation.
+        
         Args:
             violation: Violation dict with domain_id
         """
-        domain_id = violation.get("domain_id")
-        message = {
-            "type": "violation",
-            "data": violation,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        if self._flush_task is not None:
+            self._pending_violations.append(violation)
+            return
+        
+        self._flush_task = asyncio.create_task(self._flush_violations())
+        await self._send_violations(violation.get("domain_id"), [violation])
+    
+    async def _flush_violations(self):
+        """Send pending violations once per batch window until none arrive"""
+        try:
+            while True:
+                await asyncio.sleep(VIOLATION_BATCH_WINDOW)
+                pending, self._pending_violations = self._pending_violations, []
+                if not pending:
+                    return
+                
+                by_domain: Dict[Optional[int], List[dict]] = {}
+                for violation in pending:
+                    by_domain.setdefault(violation.get("domain_id"), []).append(violation)
+                for domain_id, violations in by_domain.items():
+                    for start in range(0, len(violations), MAX_VIOLATION_BATCH):
+                        await self._send_violations(domain_id, violations[start:start + MAX_VIOLATION_BATCH])
+        except Exception as e:
+            logger.error(f"Error flushing violation notifications: {e}", exc_info=True)
+        finally:
+            self._flush_task = None
+    
+    async def _send_violations(self, domain_id: Optional[int], violations: List[dict]):
+        """Broadcast one violation, or several as a single violation_batch message"""
+        if len(violations) == 1:
+            message = {"type": "violation", "data": violations[0]}
+        else:
+            message = {"type": "violation_batch", "data": violations}
+        message["timestamp"] = datetime.utcnow().isoformat()
         await self.broadcast(message, domain_id=domain_id)
-        logger.debug(f"Broadcasted violation notification for domain {domain_id}")
+        logger.debug(f"Broadcasted {len(violations)} violation notification(s) for domain {domain_id}")
 
 
 # Global connection manager instance
 manager = ConnectionManager()
 
+# Upper bound on domain filters per subscriber
+MAX_DOMAIN_FILTERS = 64
+_MAX_DOMAIN_ID_DIGITS = 10
+
+
+def _parse_domain_ids(raw: str) -> Optional[Set[int]]:
+    """
+    Parse a comma-separated domain_ids filter ("1,2,3")
+    
+    Returns None if the value is malformed or lists more than
+    MAX_DOMAIN_FILTERS ids. Oversized input is rejected before splitting,
+    and every part is checked before int(), so bad input raises nothing.
+    """
+    if len(raw) > MAX_DOMAIN_FILTERS * (_MAX_DOMAIN_ID_DIGITS + 2):
+        return None
+    domain_ids = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not (part.isascii() and part.isdigit()) or len(part) > _MAX_DOMAIN_ID_DIGITS:
+            return None
+        domain_ids.add(int(part))
+        if len(domain_ids) > MAX_DOMAIN_FILTERS:
+            return None
+    return domain_ids
+
 
 @router.websocket("/notifications")
 async def websocket_notifications(
@@ -140,14 +240,16 @@ async def websocket_notifications(
         },
         "timestamp": "2026-01-06T12:00:00Z"
     }
+    
+    Violations arriving in a burst are sent together, per domain, as
+    {"type": "violation_batch", "data": [{...}, {...}], "timestamp": ...}
     """
     # Parse domain_ids from query parameter
     domain_id_set = None
     if domain_ids:
-        try:
-            domain_id_set = {int(did.strip()) for did in domain_ids.split(",") if did.strip()}
-        except ValueError:
-            logger.warning(f"Invalid domain_ids parameter: {domain_ids}")
+        domain_id_set = _parse_domain_ids(domain_ids)
+        if domain_id_set is None:
+            logger.warning(f"Invalid domain_ids parameter: {domain_ids[:100]}")
     
     await manager.connect(websocket, domain_ids=domain_id_set)
     
@@ -2,21 +2,56 @@
 Database connection and session management
 """
 
+import asyncio
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from backend.config import settings
 from backend.database.models import Base
 from backend.utils.logger import logger
 
 
 # Create async engine
+# SQLite: no pooling. Others: default async pool (AsyncAdaptedQueuePool) -
+# never pass the sync QueuePool here, it blocks the event loop under load.
+_database_url = make_url(settings.database_url)
+if _database_url.get_backend_name() == "sqlite":
+    _pool_kwargs = {"poolclass": NullPool}
+else:
+    _pool_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        # LIFO reuses the most recently returned connections, so idle extras can time out
+        "pool_use_lifo": True,
+    }
+
+# asyncpg: keep the prepared statements of every distinct query a connection runs
+# (the list/filter combinations add up), so Postgres doesn't re-parse and re-plan them
+_connect_args = {}
+if _database_url.get_driver_name() == "asyncpg":
+    _connect_args["prepared_statement_cache_size"] = settings.db_prepared_statement_cache_size
+
 engine = create_async_engine(
     settings.database_url,
-    echo=settings.debug,  # Log SQL queries in debug mode
-    poolclass=NullPool if "sqlite" in settings.database_url else None,
-    future=True
+    echo=settings.db_echo,  # Opt-in SQL logging (DB_ECHO=true)
+    future=True,
+    # Shared across sessions: repeated statements (e.g. user lookups by id)
+    # reuse their compiled SQL instead of being recompiled once the LRU fills up
+    query_cache_size=settings.db_query_cache_size,
+    connect_args=_connect_args,
+    **_pool_kwargs
 )
 
+if not isinstance(engine.pool, (NullPool, AsyncAdaptedQueuePool)):
+    raise RuntimeError(
+        f"Async engine must use AsyncAdaptedQueuePool, got {type(engine.pool).__name__}"
+    )
+
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -34,9 +69,19 @@ async def init_db():
     """
     logger.info("Initializing database...")
     async with engine.begin() as conn:
+        had_rollups = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).has_table("violation_hourly_rollups")
+        )
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created successfully")
     
+    # Stats read whole hours from the rollups - backfill them once for existing violations
+    if not had_rollups:
+        from backend.database.crud import rebuild_violation_rollups
+        async with AsyncSessionLocal() as db:
+            buckets = await rebuild_violation_rollups(db)
+        logger.info(f"Violation stats rollups built ({buckets} hour buckets)")
+    
     # Seed initial data
     try:
         from backend.database.seed import seed_all
@@ -46,11 +91,34 @@ async def init_db():
         logger.warning(f"Failed to seed database: {e}. This is OK if data already exists.")
 
 
+async def warm_up_pool():
+    """
+    Open pool_size connections concurrently so the first requests
+    don't pay connect/auth latency. Call this on application startup.
+    No-op for SQLite (NullPool).
+    """
+    pool = engine.pool
+    if isinstance(pool, NullPool):
+        return
+
+    async def _open_and_close():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # All connections are checked out at once, then returned to the pool together
+    await asyncio.gather(*(_open_and_close() for _ in range(pool.size())))
+    logger.info(f"Database pool warmed up ({pool.size()} connections)")
+
+
 async def get_db() -> AsyncSession:
     """
     Dependency for FastAPI endpoints
     Provides database session
     
+    FastAPI caches dependencies per request, so the endpoint and all of its
+    sub-dependencies (e.g. get_current_user) share this one session. The
+    session only checks out a pool connection when it first runs a query.
+    
     Usage:
         @app.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
@@ -2,15 +2,21 @@
 CRUD (Create, Read, Update, Delete) operations for database models
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, update, delete, cast, String
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, and_, or_, case, true, update, delete, insert, bindparam, cast, String, Integer, DateTime, literal, literal_column, text, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from datetime import datetime, timedelta
+import asyncio
 import json
+import secrets
 
 from backend.database.models import (
-    Domain, PPEType, DomainPPERule, Camera, Violation, DetectionLog, User, user_domains, Organization, organization_domains
+    Domain, PPEType, DomainPPERule, Camera, Violation, ViolationHourlyRollup, ViolationSeverity, ViolationStatus, DetectionLog, User, UserPhoto, user_domains, Organization, organization_domains
 )
 from backend.database.schemas import (
     DomainCreate, DomainUpdate,
@@ -21,6 +27,7 @@ from backend.database.schemas import (
     ViolationFilterParams,
     UserCreate, UserUpdate
 )
+from backend.utils.cache import email_domain_org_cache
 from backend.utils.logger import logger
 import re
 
@@ -29,57 +36,105 @@ import re
 # HELPER FUNCTIONS
 # ==========================================
 
+# Turkish character mapping (one translate pass instead of a replace per character)
+_TURKISH_CHARS = str.maketrans({
+    'ç': 'c', 'Ç': 'C',
+    'ğ': 'g', 'Ğ': 'G',
+    'ı': 'i', 'İ': 'I',
+    'ö': 'o', 'Ö': 'O',
+    'ş': 's', 'Ş': 'S',
+    'ü': 'u', 'Ü': 'U'
+})
+_SLUG_SPECIAL_CHARS = re.compile(r'[^\w\s-]')
+_SLUG_SEPARATORS = re.compile(r'[-\s]+')
+
+
 def generate_slug(name: str) -> str:
     """
     Generate URL-friendly slug from organization name.
     Converts "ABC İnşaat Ltd." -> "abc-insaat-ltd"
     """
-    # Turkish character mapping
-    turkish_chars = {
-        'ç': 'c', 'Ç': 'C',
-        'ğ': 'g', 'Ğ': 'G',
-        'ı': 'i', 'İ': 'I',
-        'ö': 'o', 'Ö': 'O',
-        'ş': 's', 'Ş': 'S',
-        'ü': 'u', 'Ü': 'U'
-    }
-    
-    # Replace Turkish characters
-    text = name
-    for turkish, english in turkish_chars.items():
-        text = text.replace(turkish, english)
-    
-    # Convert to lowercase
-    text = text.lower()
+    # Replace Turkish characters, then convert to lowercase
+    text = name.translate(_TURKISH_CHARS).lower()
     
     # Replace spaces and special characters with hyphens
-    text = re.sub(r'[^\w\s-]', '', text)  # Remove special chars except hyphens
-    text = re.sub(r'[-\s]+', '-', text)  # Replace spaces and multiple hyphens with single hyphen
+    text = _SLUG_SPECIAL_CHARS.sub('', text)  # Remove special chars except hyphens
+    text = _SLUG_SEPARATORS.sub('-', text)  # Replace spaces and multiple hyphens with single hyphen
     text = text.strip('-')  # Remove leading/trailing hyphens
     
     # Ensure slug is not empty
-    if not text:
-        text = 'organization'
+    return text or 'organization'
+
+
+def _insert(db: AsyncSession, table):
+    """
+    Dialect-specific INSERT construct (PostgreSQL or SQLite)
+    Both support ON CONFLICT ... DO NOTHING and RETURNING
+    """
+    if db.bind.dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
+
+
+async def _update_returning(db: AsyncSession, model, object_id: int, values: dict, commit: bool = True):
+    """
+    UPDATE model SET values WHERE id = object_id RETURNING *, then commit
+    One round-trip instead of SELECT + UPDATE + refresh
+    
+    Args:
+        commit: False leaves the transaction open for follow-up writes
     
-    return text
+    Returns:
+        The updated object (the session's copy is refreshed too), or None if no such row
+    """
+    if not values:
+        # Empty PATCH: no UPDATE and no commit (db.get may not even query)
+        return await db.get(model, object_id)
+    result = await db.execute(
+        update(model)
+        .where(model.id == object_id)
+        .values(**values)
+        .returning(model)
+        .execution_options(populate_existing=True)
+    )
+    db_object = result.scalar_one_or_none()
+    if commit:
+        await db.commit()
+    return db_object
 
 
 # ==========================================
 # DOMAIN CRUD
 # ==========================================
 
-async def get_domains(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Domain]:
-    """Get all domains with pagination"""
-    result = await db.execute(
-        select(Domain).offset(skip).limit(limit).order_by(Domain.id)
-    )
+async def get_domains(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[Domain]:
+    """
+    Get all domains with pagination
+    With after_id, returns domains with id > after_id (keyset, skip is ignored)
+    """
+    query = select(Domain).order_by(Domain.id)
+    if after_id is not None:
+        query = query.where(Domain.id > after_id)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
     return result.scalars().all()
 
 
 async def get_domain_by_id(db: AsyncSession, domain_id: int) -> Optional[Domain]:
-    """Get a domain by ID"""
-    result = await db.execute(select(Domain).where(Domain.id == domain_id))
-    return result.scalar_one_or_none()
+    """Get a domain by ID (no SQL if the session already holds it)"""
+    return await db.get(Domain, domain_id)
+
+
+async def get_existing_domain_ids(db: AsyncSession, domain_ids: Iterable[int]) -> set[int]:
+    """Return which of the given domain ids exist (one query)"""
+    result = await db.execute(select(Domain.id).where(Domain.id.in_(list(domain_ids))))
+    return set(result.scalars().all())
 
 
 async def get_domain_by_type(db: AsyncSession, domain_type: str) -> Optional[Domain]:
@@ -90,26 +145,16 @@ async def get_domain_by_type(db: AsyncSession, domain_type: str) -> Optional[Dom
 
 async def create_domain(db: AsyncSession, domain: DomainCreate) -> Domain:
     """Create a new domain"""
-    db_domain = Domain(**domain.model_dump())
-    db.add(db_domain)
+    # INSERT ... RETURNING: one round-trip, no refresh
+    result = await db.execute(insert(Domain).values(**domain.model_dump()).returning(Domain))
+    db_domain = result.scalar_one()
     await db.commit()
-    await db.refresh(db_domain)
     return db_domain
 
 
 async def update_domain(db: AsyncSession, domain_id: int, domain: DomainUpdate) -> Optional[Domain]:
     """Update a domain"""
-    db_domain = await get_domain_by_id(db, domain_id)
-    if not db_domain:
-        return None
-    
-    update_data = domain.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_domain, key, value)
-    
-    await db.commit()
-    await db.refresh(db_domain)
-    return db_domain
+    return await _update_returning(db, Domain, domain_id, domain.model_dump(exclude_unset=True))
 
 
 async def delete_domain(db: AsyncSession, domain_id: int) -> bool:
@@ -127,42 +172,42 @@ async def delete_domain(db: AsyncSession, domain_id: int) -> bool:
 # PPE TYPE CRUD
 # ==========================================
 
-async def get_ppe_types(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[PPEType]:
-    """Get all PPE types with pagination"""
-    result = await db.execute(
-        select(PPEType).offset(skip).limit(limit).order_by(PPEType.id)
-    )
+async def get_ppe_types(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[PPEType]:
+    """
+    Get all PPE types with pagination
+    With after_id, returns PPE types with id > after_id (keyset, skip is ignored)
+    """
+    query = select(PPEType).order_by(PPEType.id)
+    if after_id is not None:
+        query = query.where(PPEType.id > after_id)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
     return result.scalars().all()
 
 
 async def get_ppe_type_by_id(db: AsyncSession, ppe_type_id: int) -> Optional[PPEType]:
-    """Get a PPE type by ID"""
-    result = await db.execute(select(PPEType).where(PPEType.id == ppe_type_id))
-    return result.scalar_one_or_none()
+    """Get a PPE type by ID (no SQL if the session already holds it)"""
+    return await db.get(PPEType, ppe_type_id)
 
 
 async def create_ppe_type(db: AsyncSession, ppe_type: PPETypeCreate) -> PPEType:
     """Create a new PPE type"""
-    db_ppe_type = PPEType(**ppe_type.model_dump())
-    db.add(db_ppe_type)
+    # INSERT ... RETURNING: one round-trip, no refresh
+    result = await db.execute(insert(PPEType).values(**ppe_type.model_dump()).returning(PPEType))
+    db_ppe_type = result.scalar_one()
     await db.commit()
-    await db.refresh(db_ppe_type)
     return db_ppe_type
 
 
 async def update_ppe_type(db: AsyncSession, ppe_type_id: int, ppe_type: PPETypeUpdate) -> Optional[PPEType]:
     """Update a PPE type"""
-    db_ppe_type = await get_ppe_type_by_id(db, ppe_type_id)
-    if not db_ppe_type:
-        return None
-    
-    update_data = ppe_type.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_ppe_type, key, value)
-    
-    await db.commit()
-    await db.refresh(db_ppe_type)
-    return db_ppe_type
+    return await _update_returning(db, PPEType, ppe_type_id, ppe_type.model_dump(exclude_unset=True))
 
 
 # ==========================================
@@ -182,42 +227,37 @@ async def get_domain_rules(db: AsyncSession, domain_id: int) -> List[DomainPPERu
 
 async def create_domain_rule(db: AsyncSession, rule: DomainPPERuleCreate) -> DomainPPERule:
     """Create a new domain PPE rule"""
-    db_rule = DomainPPERule(**rule.model_dump())
-    db.add(db_rule)
+    # INSERT ... RETURNING: one round-trip, no refresh
+    result = await db.execute(insert(DomainPPERule).values(**rule.model_dump()).returning(DomainPPERule))
+    db_rule = result.scalar_one()
     await db.commit()
-    await db.refresh(db_rule)
     return db_rule
 
 
 async def update_domain_rule(db: AsyncSession, rule_id: int, rule: DomainPPERuleUpdate) -> Optional[DomainPPERule]:
     """Update a domain PPE rule"""
-    result = await db.execute(select(DomainPPERule).where(DomainPPERule.id == rule_id))
-    db_rule = result.scalar_one_or_none()
-    
-    if not db_rule:
-        return None
-    
-    update_data = rule.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_rule, key, value)
-    
-    await db.commit()
-    await db.refresh(db_rule)
-    return db_rule
+    return await _update_returning(db, DomainPPERule, rule_id, rule.model_dump(exclude_unset=True))
 
 
 # ==========================================
 # CAMERA CRUD
 # ==========================================
 
-async def get_cameras(db: AsyncSession, skip: int = 0, limit: int = 100, organization_id: Optional[int] = None) -> List[Camera]:
+async def get_cameras(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    organization_id: Optional[int] = None,
+    after_id: Optional[int] = None
+) -> List[Camera]:
     """
     Get all active cameras with pagination
     Args:
         db: Database session
-        skip: Number of records to skip
+        skip: Number of records to skip (ignored if after_id is given)
         limit: Maximum number of records
         organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+        after_id: Keyset pagination - only cameras with id > after_id (optional)
     """
     query = select(Camera).where(Camera.is_active == True)
 
@@ -225,27 +265,65 @@ async def get_cameras(db: AsyncSession, skip: int = 0, limit: int = 100, organiz
     if organization_id is not None:
         query = query.where(Camera.organization_id == organization_id)
 
-    query = query.offset(skip).limit(limit).order_by(Camera.id)
+    if after_id is not None:
+        query = query.where(Camera.id > after_id)
+    else:
+        query = query.offset(skip)
+    query = query.limit(limit).order_by(Camera.id)
     result = await db.execute(query)
     return result.scalars().all()
 
 
 async def get_camera_by_id(db: AsyncSession, camera_id: int, organization_id: Optional[int] = None) -> Optional[Camera]:
     """
-    Get a camera by ID
+    Get a camera by ID (no SQL if the session already holds it)
     Args:
         db: Database session
         camera_id: Camera ID
         organization_id: Organization ID for multi-tenant filtering (optional, but recommended for security)
     """
-    query = select(Camera).where(Camera.id == camera_id)
+    camera = await db.get(Camera, camera_id)
     
     # Filter by organization_id if provided (security check)
-    if organization_id is not None:
-        query = query.where(Camera.organization_id == organization_id)
+    if camera is None or (organization_id is not None and camera.organization_id != organization_id):
+        return None
+    return camera
+
+
+# Built once: runs for every ingested violation, so skip rebuilding the statement
+_CAMERA_WITH_DOMAIN_QUERY = (
+    select(Camera, Domain.id)
+    .outerjoin(Domain, Domain.id == bindparam("domain_id"))
+    .where(Camera.id == bindparam("camera_id"))
+)
+
+
+async def get_camera_with_domain_check(
+    db: AsyncSession,
+    camera_id: int,
+    domain_id: int
+) -> Optional[tuple[Camera, bool]]:
+    """
+    Get a camera and whether a domain exists, in one query
+    Used to validate incoming violations (SQLite doesn't enforce foreign keys)
     
-    result = await db.execute(query)
-    return result.scalar_one_or_none()
+    Returns:
+        (camera, domain_exists), or None if the camera doesn't exist
+    """
+    result = await db.execute(
+        _CAMERA_WITH_DOMAIN_QUERY, {"camera_id": camera_id, "domain_id": domain_id}
+    )
+    row = result.first()
+    if row is None:
+        return None
+    camera, found_domain_id = row
+    return camera, found_domain_id is not None
+
+
+async def get_cameras_by_ids(db: AsyncSession, camera_ids: Iterable[int]) -> Dict[int, Camera]:
+    """Get several cameras in one query, keyed by id (missing ids are absent)"""
+    result = await db.execute(select(Camera).where(Camera.id.in_(list(camera_ids))))
+    return {camera.id: camera for camera in result.scalars().all()}
 
 
 async def get_cameras_by_domain(db: AsyncSession, domain_id: int, organization_id: Optional[int] = None) -> List[Camera]:
@@ -279,60 +357,70 @@ async def create_camera(db: AsyncSession, camera: CameraCreate, organization_id:
     if organization_id is not None:
         camera_data['organization_id'] = organization_id
     
-    db_camera = Camera(**camera_data)
-    db.add(db_camera)
+    # INSERT ... RETURNING: one round-trip, no refresh
+    result = await db.execute(insert(Camera).values(**camera_data).returning(Camera))
+    db_camera = result.scalar_one()
     await db.commit()
-    await db.refresh(db_camera)
     return db_camera
 
 
 async def update_camera(db: AsyncSession, camera_id: int, camera: CameraUpdate) -> Optional[Camera]:
     """Update a camera"""
-    db_camera = await get_camera_by_id(db, camera_id)
-    if not db_camera:
-        return None
-    
-    update_data = camera.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_camera, key, value)
-    
-    await db.commit()
-    await db.refresh(db_camera)
-    return db_camera
+    return await _update_returning(db, Camera, camera_id, camera.model_dump(exclude_unset=True))
 
 
 async def delete_camera(db: AsyncSession, camera_id: int) -> bool:
     """Soft delete a camera (set is_active to False)"""
-    db_camera = await get_camera_by_id(db, camera_id)
-    if not db_camera:
-        return False
-
     # Soft delete: set is_active to False instead of deleting
-    db_camera.is_active = False
-    await db.commit()
-    await db.refresh(db_camera)
-    return True
+    # (one UPDATE ... RETURNING and one commit, no lookup or refresh)
+    return await _update_returning(db, Camera, camera_id, {"is_active": False}) is not None
 
 
 # ==========================================
 # VIOLATION CRUD
 # ==========================================
 
-async def get_violations(
-    db: AsyncSession,
-    filters: ViolationFilterParams,
-    organization_id: Optional[int] = None
-) -> tuple[List[Violation], int]:
+# Columns read by the violation list (the ViolationResponse fields, no relationships)
+VIOLATION_LIST_COLUMNS = (
+    Violation.id, Violation.camera_id, Violation.domain_id, Violation.timestamp,
+    Violation.person_bbox, Violation.detected_ppe, Violation.missing_ppe, Violation.track_id,
+    Violation.confidence, Violation.severity, Violation.status, Violation.assigned_to,
+    Violation.notes, Violation.corrective_action, Violation.detected_user_id,
+    Violation.face_match_confidence, Violation.frame_snapshot, Violation.snapshot_path,
+    Violation.video_path, Violation.duration_seconds, Violation.acknowledged,
+    Violation.acknowledged_by, Violation.acknowledged_at, Violation.created_at
+)
+
+
+def _missing_ppe_type_condition(db: AsyncSession, ppe_type: str):
     """
-    Get violations with filtering and pagination
-    Returns: (violations, total_count)
+    WHERE clause: missing_ppe has an item of this type
+    (a {"type": ppe_type} object or the plain string, as counted by the stats)
     
-    Args:
-        db: Database session
-        filters: Filter parameters
-        organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+    PostgreSQL tests missing_ppe::jsonb @> ... (GIN index ix_violations_missing_ppe),
+    SQLite probes the row's own array with json_each.
     """
-    # Build query conditions
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        missing_ppe = cast(Violation.missing_ppe, JSONB)
+        return or_(missing_ppe.contains([{"type": ppe_type}]), missing_ppe.contains([ppe_type]))
+    if dialect == "sqlite":
+        items, item_type = _missing_ppe_items(dialect)
+        return select(literal(1)).select_from(items).where(item_type == ppe_type).exists()
+    # No JSON functions available - match the serialized text (with or without spaces)
+    missing_ppe = cast(Violation.missing_ppe, String)
+    return or_(
+        missing_ppe.like(f'%"type":"{ppe_type}"%'),
+        missing_ppe.like(f'%"type": "{ppe_type}"%')
+    )
+
+
+def _violation_filter_conditions(
+    db: AsyncSession,
+    filters: ViolationFilterParams,
+    organization_id: Optional[int] = None
+) -> list:
+    """WHERE conditions for the violation filters (pagination fields are not used)"""
     conditions = []
     
     # CRITICAL: Always filter by organization_id for data isolation
@@ -349,13 +437,7 @@ async def get_violations(
         conditions.append(Violation.severity == filters.severity)
     if filters.missing_ppe_type:
         # Filter by missing PPE type (search in JSON field)
-        # SQLite JSON search: Check if JSON array contains an object with matching type
-        # Use text search pattern that matches JSON structure: "type":"hard_hat"
-        # This is more reliable than contains() for SQLite JSON
-        search_pattern = f'"type":"{filters.missing_ppe_type}"'
-        conditions.append(
-            cast(Violation.missing_ppe, String).like(f'%{search_pattern}%')
-        )
+        conditions.append(_missing_ppe_type_condition(db, filters.missing_ppe_type))
     if filters.start_date:
         conditions.append(Violation.timestamp >= filters.start_date)
     if filters.end_date:
@@ -364,30 +446,131 @@ async def get_violations(
     if filters.acknowledged is not None:
         conditions.append(Violation.acknowledged == filters.acknowledged)
     
-    # Count query
-    count_query = select(func.count(Violation.id))
-    if conditions:
-        count_query = count_query.where(and_(*conditions))
+    return conditions
+
+
+async def get_violations(
+    db: AsyncSession,
+    filters: ViolationFilterParams,
+    organization_id: Optional[int] = None
+) -> tuple[List[Row], Optional[int]]:
+    """
+    Get violations with filtering and pagination
+    Returns: (rows, total_count) - total_count is None if filters.include_total is False
+    
+    Rows are plain rows of VIOLATION_LIST_COLUMNS (no ORM instances or
+    identity map), enough to build ViolationResponse items.
     
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
+    Newest first (timestamp DESC, id DESC). With filters.before_timestamp/before_id
+    the page starts right after that violation (keyset), otherwise at filters.skip.
     
-    # Data query
-    data_query = select(Violation).order_by(Violation.timestamp.desc())
+    Args:
+        db: Database session
+        filters: Filter parameters
+        organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+    """
+    conditions = _violation_filter_conditions(db, filters, organization_id)
+    
+    keyset = filters.before_timestamp is not None and filters.before_id is not None
+    # Offset pages get the total from COUNT(*) OVER () in the same query;
+    # keyset pages only see rows past the cursor, so they count separately
+    window_total = filters.include_total and not keyset
+    
+    # Data query (id breaks ties between equal timestamps so pages never overlap)
+    if window_total:
+        data_query = select(*VIOLATION_LIST_COLUMNS, func.count().over().label("total_count"))
+    else:
+        data_query = select(*VIOLATION_LIST_COLUMNS)
+    data_query = data_query.order_by(Violation.timestamp.desc(), Violation.id.desc())
     if conditions:
         data_query = data_query.where(and_(*conditions))
     
-    data_query = data_query.offset(filters.skip).limit(filters.limit)
+    # Pagination: keyset (index range scan) if a cursor is given, else offset
+    if keyset:
+        data_query = data_query.where(
+            tuple_(Violation.timestamp, Violation.id) < (filters.before_timestamp, filters.before_id)
+        )
+    else:
+        data_query = data_query.offset(filters.skip)
+    data_query = data_query.limit(filters.limit)
     result = await db.execute(data_query)
-    violations = result.scalars().all()
+    
+    violations = list(result.all())
+    
+    total = None
+    if window_total:
+        if violations:
+            total = violations[0].total_count
+        elif not filters.skip:
+            total = 0
+    
+    # Count query (keyset pages, or an offset past the last row)
+    if filters.include_total and total is None:
+        count_query = select(func.count(Violation.id))
+        if conditions:
+            count_query = count_query.where(and_(*conditions))
+        
+        count_result = await db.execute(count_query)
+        total = count_result.scalar()
     
     return violations, total
 
 
-async def get_violation_by_id(db: AsyncSession, violation_id: int) -> Optional[Violation]:
-    """Get a violation by ID"""
-    result = await db.execute(select(Violation).where(Violation.id == violation_id))
-    return result.scalar_one_or_none()
+async def stream_violations(
+    db: AsyncSession,
+    filters: ViolationFilterParams,
+    organization_id: Optional[int] = None,
+    batch_size: int = 500
+) -> AsyncIterator[Row]:
+    """
+    Stream every violation matching the filters, newest first
+    
+    Rows (VIOLATION_LIST_COLUMNS) are fetched batch_size at a time from a
+    server-side cursor, so exports run in constant memory and the first
+    rows are available before the query has finished. Pagination fields
+    (skip, limit, cursor, include_total) are ignored.
+    
+    Args:
+        db: Database session (kept busy until the iterator is exhausted)
+        filters: Filter parameters
+        organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+        batch_size: Rows fetched per round-trip
+    """
+    conditions = _violation_filter_conditions(db, filters, organization_id)
+    query = (
+        select(*VIOLATION_LIST_COLUMNS)
+        .order_by(Violation.timestamp.desc(), Violation.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
+    if conditions:
+        query = query.where(and_(*conditions))
+    
+    result = await db.stream(query)
+    try:
+        async for row in result:
+            yield row
+    finally:
+        await result.close()
+
+
+async def get_violation_by_id(
+    db: AsyncSession,
+    violation_id: int,
+    organization_id: Optional[int] = None
+) -> Optional[Violation]:
+    """
+    Get a violation by ID (no SQL if the session already holds it)
+    Args:
+        db: Database session
+        violation_id: Violation ID
+        organization_id: Organization ID for multi-tenant filtering (optional)
+    """
+    violation = await db.get(Violation, violation_id)
+    
+    # Out-of-organization violations come back as None, same as missing ones
+    if violation is None or (organization_id is not None and violation.organization_id != organization_id):
+        return None
+    return violation
 
 
 async def create_violation(db: AsyncSession, violation: ViolationCreate, organization_id: Optional[int] = None) -> Violation:
@@ -396,33 +579,98 @@ async def create_violation(db: AsyncSession, violation: ViolationCreate, organiz
     # Set organization_id if provided (from camera)
     if organization_id is not None:
         violation_dict["organization_id"] = organization_id
-    db_violation = Violation(**violation_dict)
-    db.add(db_violation)
+    # INSERT ... RETURNING: one round-trip, no flush/refresh
+    result = await db.execute(
+        _insert(db, Violation).values(**violation_dict).returning(Violation)
+    )
+    db_violation = result.scalar_one()
+    await add_violation_rollups(db, [db_violation])
     await db.commit()
-    await db.refresh(db_violation)
     return db_violation
 
 
+async def create_violations(
+    db: AsyncSession,
+    violations: List[ViolationCreate],
+    organization_ids: List[int]
+) -> List[Violation]:
+    """
+    Create many violations in one INSERT ... RETURNING and one commit
+    
+    Args:
+        db: Database session
+        violations: Violation creation data
+        organization_ids: organization_id for each violation (same order)
+        
+    Returns:
+        Created violations, in input order
+    """
+    rows = [
+        {**violation.model_dump(), "organization_id": organization_id}
+        for violation, organization_id in zip(violations, organization_ids)
+    ]
+    result = await db.scalars(
+        insert(Violation).returning(Violation, sort_by_parameter_order=True),
+        rows
+    )
+    db_violations = list(result.all())
+    await add_violation_rollups(db, db_violations)
+    await db.commit()
+    return db_violations
+
+
+def _db_utcnow(db: AsyncSession):
+    """
+    The database's current UTC time as a naive timestamp (like datetime.utcnow())
+    
+    Lets the database be the clock for write timestamps instead of each app worker.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return func.timezone("UTC", func.now())
+    # SQLite's CURRENT_TIMESTAMP is already UTC (whole seconds)
+    return func.current_timestamp()
+
+
 async def update_violation(db: AsyncSession, violation_id: int, violation: ViolationUpdate) -> Optional[Violation]:
     """Update a violation (workflow management)"""
-    db_violation = await get_violation_by_id(db, violation_id)
-    if not db_violation:
-        return None
-    
     update_data = violation.model_dump(exclude_unset=True)
-    
-    # Legacy: If acknowledging, set timestamp (deprecated, use status instead)
-    if update_data.get("acknowledged") and not db_violation.acknowledged:
-        update_data["acknowledged_at"] = datetime.utcnow()
+    if not update_data:
+        # Empty PATCH: nothing to write, rollup or commit
+        return await db.get(Violation, violation_id)
+    
+    # Legacy: If acknowledging, set timestamp (deprecated, use status instead).
+    # Decided in SQL against the row's current value, so no SELECT beforehand
+    if update_data.get("acknowledged"):
+        already_acknowledged = Violation.acknowledged == True
+        update_data["acknowledged_at"] = case(
+            (already_acknowledged, Violation.acknowledged_at), else_=_db_utcnow(db)
+        )
         # Auto-set status to closed if acknowledging
         if "status" not in update_data:
-            update_data["status"] = "closed"
+            update_data["status"] = case(
+                (already_acknowledged, Violation.status),
+                else_=literal(ViolationStatus.CLOSED, Violation.status.type)
+            )
     
-    for key, value in update_data.items():
-        setattr(db_violation, key, value)
+    # Only acknowledged feeds the stats rollups (timestamp/domain/severity can't change here);
+    # lock the row and read the old flag so only a real transition moves acknowledged_count
+    was_acknowledged = None
+    if "acknowledged" in update_data and _rollups_supported(db):
+        was_acknowledged = await db.scalar(
+            select(Violation.acknowledged).where(Violation.id == violation_id).with_for_update()
+        )
     
+    db_violation = await _update_returning(db, Violation, violation_id, update_data, commit=False)
+    if db_violation is not None and "acknowledged" in update_data and db_violation.timestamp is not None:
+        acknowledged_delta = int(bool(db_violation.acknowledged)) - int(bool(was_acknowledged))
+        if acknowledged_delta:
+            await _apply_rollup_deltas(db, {
+                (
+                    db_violation.organization_id, db_violation.domain_id,
+                    _hour_bucket(db_violation.timestamp), db_violation.severity, ""
+                ): [0, acknowledged_delta]
+            })
     await db.commit()
-    await db.refresh(db_violation)
     return db_violation
 
 
@@ -430,6 +678,257 @@ async def update_violation(db: AsyncSession, violation_id: int, violation: Viola
 # STATISTICS
 # ==========================================
 
+def _missing_ppe_items(dialect: str):
+    """
+    Unnest Violation.missing_ppe (SQLite / PostgreSQL only)
+    
+    Returns:
+        (table-valued function of the array items, expression giving each item's type)
+    """
+    if dialect == "sqlite":
+        items = func.json_each(Violation.missing_ppe).table_valued("value", "type")
+        item_type = case(
+            (items.c.type == "object", func.json_extract(items.c.value, "$.type")),
+            else_=items.c.value
+        )
+    else:
+        items = func.json_array_elements(Violation.missing_ppe).table_valued("value")
+        item_type = case(
+            (func.json_typeof(items.c.value) == "object", items.c.value.op("->>", return_type=String)("type")),
+            else_=items.c.value.op("#>>", return_type=String)(literal_column("'{}'"))
+        )
+    return items, item_type
+
+
+async def _count_missing_ppe_types(db: AsyncSession, conditions: list) -> Dict[str, int]:
+    """
+    Count missing PPE items by type over the violations matching conditions
+    
+    missing_ppe is a JSON array of {"type": ...} objects (or plain strings);
+    SQLite and PostgreSQL unnest and GROUP BY it in the database.
+    """
+    dialect = db.bind.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        items, ppe_type = _missing_ppe_items(dialect)
+    else:
+        # No JSON unnesting available - count in Python over the one column
+        query = select(Violation.missing_ppe)
+        if conditions:
+            query = query.where(and_(*conditions))
+        by_ppe_type: Dict[str, int] = {}
+        for missing_ppe in (await db.execute(query)).scalars():
+            for ppe_item in missing_ppe or []:
+                item_type = ppe_item.get('type', '') if isinstance(ppe_item, dict) else str(ppe_item)
+                if item_type:
+                    by_ppe_type[item_type] = by_ppe_type.get(item_type, 0) + 1
+        return by_ppe_type
+    
+    query = (
+        select(ppe_type.label("ppe_type"), func.count())
+        .select_from(Violation)
+        .join(items, true())
+        .group_by("ppe_type")
+    )
+    if conditions:
+        query = query.where(and_(*conditions))
+    result = await db.execute(query)
+    return {item_type: count for item_type, count in result.all() if item_type}
+
+
+def _count_if(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END), 0 over no rows"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _hour_bucket(timestamp: datetime) -> datetime:
+    """Truncate a timestamp to the start of its hour"""
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def _rollups_supported(db: AsyncSession) -> bool:
+    """Rollups unnest missing_ppe in SQL, so they need SQLite or PostgreSQL"""
+    return db.bind.dialect.name in ("sqlite", "postgresql")
+
+
+def _violation_ppe_types(missing_ppe) -> List[str]:
+    """Types of a violation's missing PPE items ({"type": ...} objects or plain strings)"""
+    item_types = []
+    for ppe_item in missing_ppe or []:
+        item_type = ppe_item.get('type', '') if isinstance(ppe_item, dict) else str(ppe_item)
+        if item_type:
+            item_types.append(item_type)
+    return item_types
+
+
+async def add_violation_rollups(db: AsyncSession, violations: Iterable[Violation]) -> None:
+    """
+    Count newly created violations into violation_hourly_rollups
+    
+    Adds +1 per violation (and per missing PPE item) to its bucket rows with
+    INSERT ... ON CONFLICT DO UPDATE SET count = count + excluded.count, so
+    concurrent writers to the same hour only add to the rows and never rescan
+    the bucket. Runs in the caller's transaction (no commit).
+    """
+    deltas: Dict[tuple, List[int]] = {}
+    for violation in violations:
+        if violation.timestamp is None:
+            continue
+        bucket = (
+            violation.organization_id, violation.domain_id,
+            _hour_bucket(violation.timestamp), violation.severity
+        )
+        counters = deltas.setdefault(bucket + ("",), [0, 0])
+        counters[0] += 1
+        if violation.acknowledged:
+            counters[1] += 1
+        for item_type in _violation_ppe_types(violation.missing_ppe):
+            deltas.setdefault(bucket + (item_type,), [0, 0])[0] += 1
+    await _apply_rollup_deltas(db, deltas)
+
+
+async def _apply_rollup_deltas(db: AsyncSession, deltas: Dict[tuple, List[int]]) -> None:
+    """Upsert {(organization_id, domain_id, bucket_hour, severity, ppe_type): [count, acknowledged_count]} deltas"""
+    if not deltas or not _rollups_supported(db):
+        return
+    stmt = _insert(db, ViolationHourlyRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["organization_id", "domain_id", "bucket_hour", "severity", "ppe_type"],
+        set_={
+            "count": ViolationHourlyRollup.count + stmt.excluded["count"],
+            "acknowledged_count": ViolationHourlyRollup.acknowledged_count + stmt.excluded["acknowledged_count"],
+        }
+    )
+    # Sorted, so concurrent batches lock shared rows in the same order (no deadlocks)
+    await db.execute(stmt, [
+        {
+            "organization_id": organization_id, "domain_id": domain_id, "bucket_hour": bucket_hour,
+            "severity": severity, "ppe_type": ppe_type,
+            "count": count, "acknowledged_count": acknowledged_count,
+        }
+        for (organization_id, domain_id, bucket_hour, severity, ppe_type), (count, acknowledged_count)
+        in sorted(deltas.items(), key=lambda item: (item[0][0], item[0][1], item[0][2], item[0][3].value, item[0][4]))
+    ])
+
+
+async def rebuild_violation_rollups(db: AsyncSession) -> int:
+    """
+    Recompute every rollup bucket from the violations table and commit
+    Used to backfill existing databases; returns the number of buckets
+    """
+    if not _rollups_supported(db):
+        return 0
+    await db.execute(delete(ViolationHourlyRollup))
+    
+    if db.bind.dialect.name == "postgresql":
+        bucket = func.date_trunc("hour", Violation.timestamp)
+    else:
+        # Same text format SQLAlchemy stores SQLite DateTime values in
+        bucket = func.strftime("%Y-%m-%d %H:00:00.000000", Violation.timestamp)
+    bucket = bucket.label("bucket_hour")
+    items, item_type = _missing_ppe_items(db.bind.dialect.name)
+    columns = [
+        ViolationHourlyRollup.organization_id, ViolationHourlyRollup.domain_id,
+        ViolationHourlyRollup.bucket_hour, ViolationHourlyRollup.severity,
+        ViolationHourlyRollup.ppe_type, ViolationHourlyRollup.count,
+        ViolationHourlyRollup.acknowledged_count
+    ]
+    has_timestamp = Violation.timestamp.is_not(None)
+    
+    # Violations per severity
+    await db.execute(insert(ViolationHourlyRollup).from_select(
+        columns,
+        select(
+            Violation.organization_id, Violation.domain_id, bucket,
+            Violation.severity, literal(""), func.count(), _count_if(Violation.acknowledged == True)
+        )
+        .where(has_timestamp)
+        .group_by(Violation.organization_id, Violation.domain_id, "bucket_hour", Violation.severity)
+    ))
+    # Missing PPE items per severity and type
+    await db.execute(insert(ViolationHourlyRollup).from_select(
+        columns,
+        select(
+            Violation.organization_id, Violation.domain_id, bucket,
+            Violation.severity, item_type.label("ppe_type"), func.count(), literal(0)
+        )
+        .select_from(Violation)
+        .join(items, true())
+        .where(has_timestamp, item_type != "")
+        .group_by(Violation.organization_id, Violation.domain_id, "bucket_hour", Violation.severity, "ppe_type")
+    ))
+    
+    result = await db.execute(
+        select(func.count()).select_from(
+            select(ViolationHourlyRollup.organization_id, ViolationHourlyRollup.domain_id, ViolationHourlyRollup.bucket_hour)
+            .distinct()
+            .subquery()
+        )
+    )
+    await db.commit()
+    return result.scalar_one()
+
+
+_STAT_COUNTERS = ("total", "critical", "high", "medium", "low", "acknowledged")
+
+
+async def _violation_counts(db: AsyncSession, conditions: list) -> tuple[Dict[str, int], Dict[str, int]]:
+    """Counters and by_ppe_type straight from the violations matching conditions"""
+    # All counters in one aggregate query (no rows leave the database)
+    counts_query = select(
+        func.count().label("total"),
+        _count_if(Violation.severity == ViolationSeverity.CRITICAL).label("critical"),
+        _count_if(Violation.severity == ViolationSeverity.HIGH).label("high"),
+        _count_if(Violation.severity == ViolationSeverity.MEDIUM).label("medium"),
+        _count_if(Violation.severity == ViolationSeverity.LOW).label("low"),
+        _count_if(Violation.acknowledged == True).label("acknowledged"),
+    ).select_from(Violation)
+    if conditions:
+        counts_query = counts_query.where(and_(*conditions))
+    counts = (await db.execute(counts_query)).one()
+    
+    # Count by PPE type
+    by_ppe_type = await _count_missing_ppe_types(db, conditions)
+    return dict(counts._mapping), by_ppe_type
+
+
+async def _rollup_counts(
+    db: AsyncSession,
+    organization_id: Optional[int],
+    domain_id: Optional[int],
+    start_bucket: Optional[datetime],
+    end_bucket: Optional[datetime]
+) -> tuple[Dict[str, int], Dict[str, int]]:
+    """Counters and by_ppe_type from the rollup buckets in [start_bucket, end_bucket)"""
+    query = (
+        select(
+            ViolationHourlyRollup.severity,
+            ViolationHourlyRollup.ppe_type,
+            func.sum(ViolationHourlyRollup.count),
+            func.sum(ViolationHourlyRollup.acknowledged_count)
+        )
+        .group_by(ViolationHourlyRollup.severity, ViolationHourlyRollup.ppe_type)
+    )
+    if organization_id is not None:
+        query = query.where(ViolationHourlyRollup.organization_id == organization_id)
+    if domain_id:
+        query = query.where(ViolationHourlyRollup.domain_id == domain_id)
+    if start_bucket is not None:
+        query = query.where(ViolationHourlyRollup.bucket_hour >= start_bucket)
+    if end_bucket is not None:
+        query = query.where(ViolationHourlyRollup.bucket_hour < end_bucket)
+    
+    counts = dict.fromkeys(_STAT_COUNTERS, 0)
+    by_ppe_type: Dict[str, int] = {}
+    for severity, ppe_type, count, acknowledged in (await db.execute(query)).all():
+        if ppe_type:
+            by_ppe_type[ppe_type] = by_ppe_type.get(ppe_type, 0) + count
+        else:
+            counts["total"] += count
+            counts[ViolationSeverity(severity).value] += count
+            counts["acknowledged"] += acknowledged
+    return counts, by_ppe_type
+
+
 async def get_violation_stats(
     db: AsyncSession,
     domain_id: Optional[int] = None,
@@ -440,6 +939,9 @@ async def get_violation_stats(
     """
     Get comprehensive violation statistics
     
+    Whole hours come from violation_hourly_rollups; only the partial hours
+    at the edges of [start_date, end_date] are counted from the violations table.
+    
     Args:
         db: Database session
         domain_id: Optional domain filter
@@ -447,9 +949,6 @@ async def get_violation_stats(
         end_date: Optional end date filter
         organization_id: Organization ID for multi-tenant filtering (required for data isolation)
     """
-    from backend.database.models import ViolationSeverity
-    import json
-    
     conditions = []
     
     # CRITICAL: Always filter by organization_id for data isolation
@@ -458,45 +957,40 @@ async def get_violation_stats(
     
     if domain_id:
         conditions.append(Violation.domain_id == domain_id)
-    if start_date:
-        conditions.append(Violation.timestamp >= start_date)
-    if end_date:
-        conditions.append(Violation.timestamp <= end_date)
     
-    # Base query
-    base_query = select(Violation)
-    if conditions:
-        base_query = base_query.where(and_(*conditions))
-    
-    # Get all violations for detailed stats
-    result = await db.execute(base_query)
-    violations = result.scalars().all()
-    
-    # Calculate statistics
-    total = len(violations)
-    critical = sum(1 for v in violations if v.severity == ViolationSeverity.CRITICAL)
-    high = sum(1 for v in violations if v.severity == ViolationSeverity.HIGH)
-    medium = sum(1 for v in violations if v.severity == ViolationSeverity.MEDIUM)
-    low = sum(1 for v in violations if v.severity == ViolationSeverity.LOW)
+    # Rollup range: the hours lying entirely inside [start_date, end_date]
+    rollup_start = None
+    if start_date:
+        rollup_start = _hour_bucket(start_date)
+        if rollup_start < start_date:
+            rollup_start += timedelta(hours=1)
+    rollup_end = _hour_bucket(end_date) if end_date else None
+    use_rollups = _rollups_supported(db) and not (
+        rollup_start is not None and rollup_end is not None and rollup_start >= rollup_end
+    )
     
-    # Count by PPE type
-    by_ppe_type = {}
-    for violation in violations:
-        # Parse missing_ppe (stored as JSON string in SQLite)
-        missing_ppe = []
-        if violation.missing_ppe:
-            try:
-                if isinstance(violation.missing_ppe, str):
-                    missing_ppe = json.loads(violation.missing_ppe)
-                else:
-                    missing_ppe = violation.missing_ppe
-            except:
-                missing_ppe = []
-        
-        for ppe_item in missing_ppe:
-            ppe_type = ppe_item.get('type', '') if isinstance(ppe_item, dict) else str(ppe_item)
-            if ppe_type:
-                by_ppe_type[ppe_type] = by_ppe_type.get(ppe_type, 0) + 1
+    if not use_rollups:
+        if start_date:
+            conditions.append(Violation.timestamp >= start_date)
+        if end_date:
+            conditions.append(Violation.timestamp <= end_date)
+        counts, by_ppe_type = await _violation_counts(db, conditions)
+    else:
+        counts, by_ppe_type = await _rollup_counts(db, organization_id, domain_id, rollup_start, rollup_end)
+        # Partial hours at either end come from the violations table
+        edges = []
+        if start_date and start_date < rollup_start:
+            edges.append([Violation.timestamp >= start_date, Violation.timestamp < rollup_start])
+        if end_date:
+            edges.append([Violation.timestamp >= rollup_end, Violation.timestamp <= end_date])
+        for edge in edges:
+            edge_counts, edge_by_ppe_type = await _violation_counts(db, conditions + edge)
+            for key in _STAT_COUNTERS:
+                counts[key] += edge_counts[key]
+            for item_type, count in edge_by_ppe_type.items():
+                by_ppe_type[item_type] = by_ppe_type.get(item_type, 0) + count
+    
+    total = counts["total"]
     
     # Calculate compliance rate (simplified: based on violations vs estimated total detections)
     # In real scenario, we'd need total detections count
@@ -504,15 +998,14 @@ async def get_violation_stats(
     estimated_total_detections = max(total * 10, 100) if total > 0 else 100
     compliance_rate = max(0, min(100, ((estimated_total_detections - total) / estimated_total_detections * 100))) if estimated_total_detections > 0 else 100
     
-    # Acknowledged count
-    acknowledged = sum(1 for v in violations if v.acknowledged)
+    acknowledged = counts["acknowledged"]
     
     return {
         "total": total,
-        "critical": critical,
-        "high": high,
-        "medium": medium,
-        "low": low,
+        "critical": counts["critical"],
+        "high": counts["high"],
+        "medium": counts["medium"],
+        "low": counts["low"],
         "by_ppe_type": by_ppe_type,
         "compliance_rate": round(compliance_rate, 2),
         "acknowledged": acknowledged,
@@ -520,57 +1013,119 @@ async def get_violation_stats(
     }
 
 
+async def get_violation_stats_multi(
+    session_factory: async_sessionmaker,
+    domain_ids: List[int],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    organization_id: Optional[int] = None
+) -> Dict[int, dict]:
+    """
+    Get violation statistics for several domains concurrently
+    
+    A session can only run one statement at a time, so each domain gets its
+    own short session from session_factory and the queries run side by side
+    on the connection pool (latency is the slowest domain, not the sum).
+    
+    Args:
+        session_factory: Session factory (e.g. AsyncSessionLocal)
+        domain_ids: Domains to compute statistics for
+        start_date: Optional start date filter
+        end_date: Optional end date filter
+        organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+    
+    Returns:
+        Dictionary of domain_id -> get_violation_stats() result
+    """
+    async def domain_stats(domain_id: int) -> dict:
+        async with session_factory() as session:
+            return await get_violation_stats(
+                session, domain_id, start_date, end_date, organization_id=organization_id
+            )
+    
+    domain_ids = list(dict.fromkeys(domain_ids))
+    results = await asyncio.gather(*(domain_stats(domain_id) for domain_id in domain_ids))
+    return dict(zip(domain_ids, results))
+
+
 # ==========================================
 # ORGANIZATION CRUD
 # ==========================================
 
+def normalize_organization_name(name: str) -> str:
+    """Key for case-insensitive organization name matching (stored in Organization.name_normalized)"""
+    return name.strip().lower()
+
+
 async def create_organization(db: AsyncSession, name: str) -> Organization:
     """Create a new organization with auto-generated slug"""
     # Generate slug from name
     base_slug = generate_slug(name)
-    slug = base_slug
     
-    # Ensure slug is unique (append number if needed)
-    counter = 1
-    while True:
-        result = await db.execute(select(Organization).where(Organization.slug == slug))
-        existing = result.scalar_one_or_none()
-        if not existing:
+    # Ensure slug is unique (append number if needed): read every "base" / "base-N"
+    # slug in one query instead of probing base-1, base-2, ... one by one
+    result = await db.execute(
+        select(Organization.slug).where(
+            or_(
+                Organization.slug == base_slug,
+                Organization.slug.startswith(f"{base_slug}-", autoescape=True)
+            )
+        )
+    )
+    taken = set(result.scalars().all())
+    slug = base_slug
+    if slug in taken:
+        suffixes = [
+            int(existing[len(base_slug) + 1:]) for existing in taken
+            if existing[len(base_slug) + 1:].isdigit()
+        ]
+        slug = f"{base_slug}-{max(suffixes, default=0) + 1}"
+    
+    # INSERT ... RETURNING: one round-trip, no refresh. If a concurrent signup
+    # took the slug in the meantime, retry once with a random suffix
+    values = {"name": name, "name_normalized": normalize_organization_name(name), "is_active": True}
+    for candidate in (slug, f"{base_slug}-{secrets.token_hex(3)}"):
+        result = await db.execute(
+            _insert(db, Organization)
+            .values(slug=candidate, **values)
+            .on_conflict_do_nothing(index_elements=[Organization.slug])
+            .returning(Organization)
+        )
+        org = result.scalar_one_or_none()
+        if org is not None:
             break
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-    
-    org = Organization(name=name, slug=slug, is_active=True)
-    db.add(org)
+    else:
+        raise ValueError(f"Could not generate a unique slug for organization {name!r}")
     await db.commit()
-    await db.refresh(org)
     return org
 
 
 async def get_organization_by_id(db: AsyncSession, org_id: int) -> Optional[Organization]:
-    """Get organization by ID"""
-    result = await db.execute(select(Organization).where(Organization.id == org_id))
-    return result.scalar_one_or_none()
+    """Get organization by ID (identity map first, then primary key lookup)"""
+    return await db.get(Organization, org_id)
 
 
 async def get_organization_by_name(db: AsyncSession, name: str) -> Optional[Organization]:
     """
     Get organization by name (case-insensitive, trimmed)
     Handles variations like "Acme Corp" vs "acme corp" vs "Acme Corp "
-    """
-    # Normalize input name
-    normalized_input = name.strip().lower()
-    
-    # Get all organizations and compare normalized names (SQLite doesn't have reliable trim function)
-    result = await db.execute(select(Organization))
-    all_orgs = result.scalars().all()
     
-    for org in all_orgs:
-        normalized_org_name = org.name.strip().lower() if org.name else ""
-        if normalized_org_name == normalized_input:
-            return org
-    
-    return None
+    One index lookup on Organization.name_normalized instead of loading
+    every organization and comparing in Python.
+    """
+    result = await db.execute(
+        select(Organization)
+        .where(Organization.name_normalized == normalize_organization_name(name))
+        .order_by(Organization.id)
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+def get_email_domain(email: str) -> Optional[str]:
+    """Lowercase part after "@" (stored in User.email_domain), or None if there is no "@" """
+    _, at, domain = email.rpartition('@')
+    return domain.lower() if at else None
 
 
 async def get_organization_by_email_domain(db: AsyncSession, email: str) -> Optional[Organization]:
@@ -581,31 +1136,35 @@ async def get_organization_by_email_domain(db: AsyncSession, email: str) -> Opti
     
     Strategy: Find any user with the same email domain, return their organization
     This is more reliable than name matching and handles organization name variations
+    
+    Domain -> organization ID matches are cached in email_domain_org_cache
+    (UserService clears it when an email changes or a user row is removed).
     """
     # Extract domain from email
-    if '@' not in email:
+    email_domain = get_email_domain(email)
+    if email_domain is None:
         return None
     
-    email_domain = email.split('@')[1].lower()
-    
-    # Find any user with the same email domain
-    # Get their organization - this is the most reliable way
-    # This handles cases where organization name is misspelled but email domain matches
-    result = await db.execute(
-        select(User).where(
-            func.lower(User.email).like(f'%@{email_domain}')
-        ).limit(1)
-    )
-    user = result.scalar_one_or_none()
-    
-    if user:
-        # Return the organization of the first user found with this email domain
-        org = await get_organization_by_id(db, user.organization_id)
-        if org:
-            logger.debug(f"Found organization {org.name} (ID: {org.id}) for email domain {email_domain}")
-        return org
-    
-    return None
+    organization_id = email_domain_org_cache.get(email_domain)
+    if organization_id is None:
+        # Find any user with the same email domain
+        # Get their organization - this is the most reliable way
+        # This handles cases where organization name is misspelled but email domain matches
+        # (equality on the indexed email_domain column, not a LIKE '%@...' scan)
+        result = await db.execute(
+            select(User.organization_id).where(User.email_domain == email_domain).limit(1)
+        )
+        organization_id = result.scalar_one_or_none()
+        if organization_id is None:
+            return None
+        # Only matches are cached: a new domain must find its first user right away
+        email_domain_org_cache.set(email_domain, organization_id)
+    
+    # Return the organization of the first user found with this email domain
+    org = await get_organization_by_id(db, organization_id)
+    if org:
+        logger.debug(f"Found organization {org.name} (ID: {org.id}) for email domain {email_domain}")
+    return org
 
 
 async def get_or_create_organization_by_name(db: AsyncSession, name: str) -> Organization:
@@ -628,84 +1187,239 @@ async def get_or_create_organization_by_name(db: AsyncSession, name: str) -> Org
 async def get_organization_user_count(db: AsyncSession, organization_id: int) -> int:
     """
     Get the number of users in an organization
-    Used to determine if a user is the first user (organization owner)
+    Use organization_has_users when only "is this the first user" matters
     """
     result = await db.execute(
-        select(func.count(User.id)).where(User.organization_id == organization_id)
+        select(func.count(User.id)).where(
+            User.organization_id == organization_id,
+            User.is_deleted == False
+        )
     )
     count = result.scalar_one()
     return count
 
 
+async def organization_has_users(db: AsyncSession, organization_id: int) -> bool:
+    """
+    Check whether an organization has any (non-deleted) user
+    Used on every signup to detect the first user (organization owner);
+    EXISTS stops at the first matching index entry instead of counting them all
+    """
+    result = await db.execute(
+        select(
+            select(User.id).where(
+                User.organization_id == organization_id,
+                User.is_deleted == False
+            ).exists()
+        )
+    )
+    return result.scalar_one()
+
+
 # ==========================================
 # USER CRUD
 # ==========================================
 
 
+# Built once: used by every login and registration check
+# (lower(email) matches the ix_users_email_lower expression index)
+_USER_BY_EMAIL_QUERY = (
+    select(User)
+    .where(func.lower(User.email) == bindparam("email"), User.is_deleted == False)
+    .options(selectinload(User.domains), raiseload("*"))
+)
+
+
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
-    """Get user by email with domains loaded"""
-    result = await db.execute(
-        select(User)
-        .where(User.email == email)
-        .options(selectinload(User.domains))
-    )
+    """Get user by email (case-insensitive) with domains loaded"""
+    result = await db.execute(_USER_BY_EMAIL_QUERY, {"email": email.lower()})
     return result.scalar_one_or_none()
 
 
-async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
-    """Get user by ID with domains and organization loaded"""
-    result = await db.execute(
+async def get_user(db: AsyncSession, user_id: int, organization_id: Optional[int] = None) -> Optional[User]:
+    """
+    Get user by ID with domains and organization loaded
+    Args:
+        db: Database session
+        user_id: User ID
+        organization_id: Organization ID for multi-tenant filtering (optional)
+    """
+    query = (
         select(User)
-        .where(User.id == user_id)
-        .options(selectinload(User.domains), selectinload(User.organization))
+        .where(User.id == user_id, User.is_deleted == False)
+        .options(selectinload(User.domains), selectinload(User.organization), raiseload("*"))
     )
+    
+    # Out-of-organization users come back as None, same as missing ones
+    if organization_id is not None:
+        query = query.where(User.organization_id == organization_id)
+    
+    result = await db.execute(query)
     return result.scalar_one_or_none()
 
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, organization_id: Optional[int] = None) -> tuple[List[User], int]:
+async def get_user_scope(db: AsyncSession, user_id: int, organization_id: Optional[int] = None) -> Optional[Row]:
     """
-    List users with optional organization filtering
-    
+    Get only the id, organization_id and role of a user (no relationships)
+    Used for access checks that don't need the full user
     Args:
         db: Database session
-        skip: Number of records to skip
-        limit: Maximum number of records to return
+        user_id: User ID
         organization_id: Organization ID for multi-tenant filtering (optional)
-        
-    Returns:
-        Tuple of (List of users, total count), filtered by organization if provided
     """
-    # Eager load organization and domains relationships to avoid async issues
-    query = select(User).options(
-        selectinload(User.organization),
-        selectinload(User.domains)
+    query = (
+        select(User.id, User.organization_id, User.role)
+        .where(User.id == user_id, User.is_deleted == False)
     )
-    
-    # Filter by organization_id if provided (multi-tenant isolation)
     if organization_id is not None:
         query = query.where(User.organization_id == organization_id)
     
-    # Get total count
-    count_query = select(func.count()).select_from(User)
+    result = await db.execute(query)
+    return result.first()
+
+
+async def _paginate_users(
+    db: AsyncSession,
+    query,
+    skip: int,
+    limit: int,
+    organization_id: Optional[int],
+    after_id: Optional[int]
+) -> tuple[List[Row], int]:
+    """
+    Apply the shared list_users filters/pagination to a select over users
+    
+    Returns:
+        Tuple of (rows of the page query, total count)
+    """
+    conditions = [User.is_deleted == False]
+    
+    # Filter by organization_id if provided (multi-tenant isolation)
     if organization_id is not None:
-        count_query = count_query.where(User.organization_id == organization_id)
+        conditions.append(User.organization_id == organization_id)
+    
+    query = query.where(*conditions)
     
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
+    # Apply pagination: keyset (index range scan) if a cursor is given, else offset.
+    # Offset pages get the total from COUNT(*) OVER () in the same query;
+    # keyset pages only see rows past the cursor, so they count separately
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    else:
+        query = query.add_columns(func.count().over().label("total_count")).offset(skip)
+    query = query.limit(limit).order_by(User.id)
     
-    # Apply pagination
-    query = query.offset(skip).limit(limit).order_by(User.id)
+    rows = list((await db.execute(query)).all())
     
-    result = await db.execute(query)
-    users = result.scalars().all()
+    total = None
+    if after_id is None:
+        if rows:
+            total = rows[0].total_count
+        elif not skip:
+            total = 0
+    
+    # Count query (keyset pages, or an offset past the last row)
+    if total is None:
+        count_result = await db.execute(select(func.count()).select_from(User).where(*conditions))
+        total = count_result.scalar() or 0
+    
+    return rows, total
+
+
+async def get_users(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    organization_id: Optional[int] = None,
+    after_id: Optional[int] = None
+) -> tuple[List[User], int]:
+    """
+    List users with optional organization filtering
+    
+    Args:
+        db: Database session
+        skip: Number of records to skip (ignored when after_id is given)
+        limit: Maximum number of records to return
+        organization_id: Organization ID for multi-tenant filtering (optional)
+        after_id: Keyset pagination - only users with id > after_id (optional)
+        
+    Returns:
+        Tuple of (List of users, total count), filtered by organization if provided
+    """
+    # Eager load organization and domains relationships to avoid async issues;
+    # any other relationship access raises instead of lazy loading (one query per user)
+    query = select(User).options(selectinload(User.organization), selectinload(User.domains), raiseload("*"))
+    rows, total = await _paginate_users(db, query, skip, limit, organization_id, after_id)
+    return [row[0] for row in rows], total
+
+
+# Columns read by the user list (no relationships, no password hash)
+USER_LIST_COLUMNS = (
+    User.id, User.email, User.full_name, User.role, User.organization_id,
+    User.is_active, User.created_at, User.last_login
+)
+
+
+async def get_user_rows(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    organization_id: Optional[int] = None,
+    after_id: Optional[int] = None
+) -> tuple[List[Row], int]:
+    """
+    List users as plain rows of USER_LIST_COLUMNS (same filtering as get_users)
+    
+    Rows skip the ORM identity map and relationship loading; use
+    get_domains_by_user / get_domains_by_organization for their domains.
+    
+    Returns:
+        Tuple of (List of rows, total count)
+    """
+    return await _paginate_users(
+        db, select(*USER_LIST_COLUMNS), skip, limit, organization_id, after_id
+    )
+
+
+async def get_domains_by_user(db: AsyncSession, user_ids: Iterable[int]) -> Dict[int, List[Domain]]:
+    """
+    Get the user_domains entries of several users in one JOIN
     
-    # Do NOT set user.domains = [] here - it triggers lazy loading which causes MissingGreenlet error
-    # Domains will be loaded separately in the endpoint from organization_domains table
+    Returns:
+        Dict of user_id -> domains (users without domains are missing)
+    """
+    result = await db.execute(
+        select(user_domains.c.user_id, Domain)
+        .join(Domain, Domain.id == user_domains.c.domain_id)
+        .where(user_domains.c.user_id.in_(list(user_ids)))
+        .order_by(user_domains.c.user_id, Domain.id)
+    )
+    domains_by_user: Dict[int, List[Domain]] = {}
+    for user_id, domain in result.all():
+        domains_by_user.setdefault(user_id, []).append(domain)
+    return domains_by_user
+
+
+async def get_domains_by_organization(db: AsyncSession, organization_ids: Iterable[int]) -> Dict[int, List[Domain]]:
+    """
+    Get the domains of several organizations in one JOIN
     
-    return users, total
+    Returns:
+        Dict of organization_id -> domains (organizations without domains are missing)
+    """
+    result = await db.execute(
+        select(organization_domains.c.organization_id, Domain)
+        .join(Domain, Domain.id == organization_domains.c.domain_id)
+        .where(organization_domains.c.organization_id.in_(list(organization_ids)))
+        .order_by(organization_domains.c.organization_id, Domain.id)
+    )
+    domains_by_org: Dict[int, List[Domain]] = {}
+    for organization_id, domain in result.all():
+        domains_by_org.setdefault(organization_id, []).append(domain)
+    return domains_by_org
 
 
-async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str, organization_id: Optional[int] = None) -> User:
+async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str, organization_id: Optional[int] = None) -> Optional[User]:
     """
     Create new user with optional domain associations and organization assignment
     
@@ -714,6 +1428,9 @@ async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str,
         user: User creation data
         hashed_password: Hashed password
         organization_id: Organization ID (if None, will be determined from user data)
+        
+    Returns:
+        Created user, or None if the email is already registered
     """
     # Determine organization_id
     if organization_id is None:
@@ -730,23 +1447,32 @@ async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str,
                 # Default to organization 1 (should exist from seed)
                 organization_id = 1
     
-    db_user = User(
-        email=user.email.lower(),
-        full_name=user.full_name,
-        hashed_password=hashed_password,
-        role=user.role,
-        organization_id=organization_id,
-        domain_id=user.domain_id,
-        permissions=user.permissions or [],
-        is_active=user.is_active,
+    # Unique email is enforced by the INSERT itself (no SELECT pre-check, no race).
+    # No conflict target: the plain email index and the lower(email) index both count
+    stmt = (
+        _insert(db, User)
+        .values(
+            email=user.email.lower(),
+            email_domain=get_email_domain(user.email),
+            full_name=user.full_name,
+            hashed_password=hashed_password,
+            role=user.role,
+            organization_id=organization_id,
+            domain_id=user.domain_id,
+            permissions=user.permissions or [],
+            is_active=user.is_active,
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
     )
-    db.add(db_user)
-    await db.flush()  # Flush to get user.id
+    db_user = (await db.execute(stmt)).scalar_one_or_none()
+    if db_user is None:
+        return None
     
     # Add domain associations if provided
     # Note: domain_ids is optional - can be set during registration or later via /auth/select-domains
+    domains = []
     if hasattr(user, 'domain_ids') and user.domain_ids:
-        from sqlalchemy import insert
         try:
             await db.execute(
                 insert(user_domains).values([
@@ -754,22 +1480,17 @@ async def create_user(db: AsyncSession, user: UserCreate, hashed_password: str,
                     for domain_id in user.domain_ids
                 ])
             )
+            result = await db.execute(select(Domain).where(Domain.id.in_(user.domain_ids)))
+            domains = list(result.scalars().all())
         except Exception as e:
             # If user_domains table doesn't exist, log warning but don't fail
             # User can select domains later via /auth/select-domains endpoint
             logger.warning(f"Could not add domain associations (table may not exist): {e}")
     
+    # A brand-new user's domains are exactly the ones inserted above - set the
+    # relationship directly instead of selecting the user again to load it
+    set_committed_value(db_user, "domains", domains)
     await db.commit()
-    await db.refresh(db_user)
-    
-    # Eagerly load domains relationship to avoid lazy-loading issues
-    # Since this is a new user, domains will be empty, but we need to load the relationship
-    result = await db.execute(
-        select(User)
-        .where(User.id == db_user.id)
-        .options(selectinload(User.domains))
-    )
-    db_user = result.scalar_one()
     return db_user
 
 
@@ -788,6 +1509,15 @@ async def update_user(db: AsyncSession, user_id: int, user: UserUpdate, hashed_p
     else:
         update_data = user.model_dump(exclude_unset=True, exclude={"password", "domain_ids"})
     
+    # Emails are stored lowercase (see create_user) so the unique index catches case variants
+    if update_data.get("email"):
+        update_data["email"] = update_data["email"].lower()
+        update_data["email_domain"] = get_email_domain(update_data["email"])
+    
+    # Empty PATCH: the user is already loaded with its relationships, skip commit and reload
+    if not update_data and not hashed_password and domain_ids is None:
+        return db_user
+    
     for key, value in update_data.items():
         setattr(db_user, key, value)
     if hashed_password:
@@ -796,66 +1526,37 @@ async def update_user(db: AsyncSession, user_id: int, user: UserUpdate, hashed_p
     # Update domain associations if domain_ids provided
     # IMPORTANT: Domain changes are organization-wide - update all users in the same organization
     if domain_ids is not None:
-        from sqlalchemy import delete, insert, select as sql_select
         # Get the user's organization_id
         user_org_id = db_user.organization_id
         
-        # #region agent log
-        import json
-        with open(r'c:\Users\90545\Desktop\MASAUSTU\Projects\PPE\.cursor\debug.log', 'a', encoding='utf-8') as f:
-            f.write(json.dumps({
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'G',
-                'location': 'backend/database/crud.py:789',
-                'message': 'Updating domains organization-wide',
-                'data': {
-                    'userId': user_id,
-                    'userOrgId': user_org_id,
-                    'domainIds': domain_ids,
-                    'updatingAllUsersInOrg': True
-                },
-                'timestamp': int(__import__('time').time() * 1000)
-            }) + '\n')
-        # #endregion
+        logger.debug(
+            f"Updating domains organization-wide: user={user_id}, org={user_org_id}, domain_ids={domain_ids}"
+        )
         
         if user_org_id:
-            # Get all users in the same organization
-            org_users_result = await db.execute(
-                sql_select(User.id).where(User.organization_id == user_org_id)
-            )
-            org_user_ids = [row[0] for row in org_users_result.fetchall()]
-            
-            # #region agent log
-            with open(r'c:\Users\90545\Desktop\MASAUSTU\Projects\PPE\.cursor\debug.log', 'a', encoding='utf-8') as f:
-                f.write(json.dumps({
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'G',
-                    'location': 'backend/database/crud.py:810',
-                    'message': 'Found users in organization',
-                    'data': {
-                        'orgId': user_org_id,
-                        'userIds': org_user_ids,
-                        'count': len(org_user_ids)
-                    },
-                    'timestamp': int(__import__('time').time() * 1000)
-                }) + '\n')
-            # #endregion
+            # All users in the same organization (subquery - their ids never leave the DB)
+            org_user_ids = select(User.id).where(User.organization_id == user_org_id)
             
             # Remove existing associations for all users in the organization
             await db.execute(
                 delete(user_domains).where(user_domains.c.user_id.in_(org_user_ids))
             )
             
-            # Add new associations for all users in the organization
+            # Add new associations for all users in the organization: the DB builds
+            # the users x domains product itself (INSERT ... SELECT), so the statement
+            # stays the same size however many users the organization has
             if domain_ids:
                 await db.execute(
-                    insert(user_domains).values([
-                        {"user_id": org_user_id, "domain_id": domain_id}
-                        for org_user_id in org_user_ids
-                        for domain_id in domain_ids
-                    ])
+                    insert(user_domains).from_select(
+                        ["user_id", "domain_id"],
+                        select(User.id, Domain.id)
+                        .select_from(User)
+                        .join(Domain, true())
+                        .where(
+                            User.organization_id == user_org_id,
+                            Domain.id.in_(domain_ids)
+                        )
+                    )
                 )
         else:
             # If user has no organization, only update that user
@@ -871,64 +1572,56 @@ async def update_user(db: AsyncSession, user_id: int, user: UserUpdate, hashed_p
                 )
 
     await db.commit()
-    await db.refresh(db_user)
-    
-    # #region agent log
-    import json
-    with open(r'c:\Users\90545\Desktop\MASAUSTU\Projects\PPE\.cursor\debug.log', 'a', encoding='utf-8') as f:
-        f.write(json.dumps({
-            'sessionId': 'debug-session',
-            'runId': 'run1',
-            'hypothesisId': 'A',
-            'location': 'backend/database/crud.py:805',
-            'message': 'After update_user commit',
-            'data': {
-                'userId': db_user.id,
-                'domainIdsProvided': domain_ids is not None,
-                'domainIds': domain_ids if domain_ids is not None else None
-            },
-            'timestamp': int(__import__('time').time() * 1000)
-        }) + '\n')
-    # #endregion
-    
-    # Eagerly load domains relationship to avoid lazy-loading issues
-    result = await db.execute(
-        select(User)
-        .where(User.id == db_user.id)
-        .options(selectinload(User.domains))
-    )
-    db_user = result.scalar_one()
-    
-    # #region agent log
-    with open(r'c:\Users\90545\Desktop\MASAUSTU\Projects\PPE\.cursor\debug.log', 'a', encoding='utf-8') as f:
-        f.write(json.dumps({
-            'sessionId': 'debug-session',
-            'runId': 'run1',
-            'hypothesisId': 'A',
-            'location': 'backend/database/crud.py:814',
-            'message': 'After eager load domains',
-            'data': {
-                'userId': db_user.id,
-                'domainsCount': len(db_user.domains) if db_user.domains else 0,
-                'domainsIds': [d.id for d in db_user.domains] if db_user.domains else []
-            },
-            'timestamp': int(__import__('time').time() * 1000)
-        }) + '\n')
-    # #endregion
+    
+    logger.debug(f"After update_user commit: user={db_user.id}, domain_ids={domain_ids}")
+    
+    # Columns were set on the loaded object and expire_on_commit is off, so it is
+    # already current; only the domain links were written behind its back
+    if domain_ids is not None:
+        await db.refresh(db_user, attribute_names=["domains"])
+        logger.debug(f"After reloading domains: user={db_user.id}, domains={[d.id for d in db_user.domains]}")
     
     return db_user
 
 
+async def soft_delete_user(db: AsyncSession, user_id: int) -> bool:
+    """
+    Mark a user as deleted (and inactive) without touching related rows
+    
+    Returns:
+        True if the user existed and was not already deleted
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id, User.is_deleted == False)
+        .values(is_deleted=True, is_active=False)
+        .returning(User.id)
+    )
+    deleted = result.first() is not None
+    if deleted:
+        await db.commit()
+    return deleted
+
+
 async def delete_user(db: AsyncSession, user_id: int) -> bool:
-    """Delete a user"""
-    from sqlalchemy import delete
-    db_user = await get_user(db, user_id)
-    if not db_user:
-        return False
+    """
+    Delete a user and clean up rows referencing it
     
-    await db.execute(delete(User).where(User.id == user_id))
+    Link rows and photos are deleted, audit references are set to NULL.
+    Done explicitly since SQLite does not enforce ON DELETE actions by default.
+    """
+    await db.execute(delete(user_domains).where(user_domains.c.user_id == user_id))
+    await db.execute(delete(UserPhoto).where(UserPhoto.user_id == user_id))
+    await db.execute(update(UserPhoto).where(UserPhoto.uploaded_by == user_id).values(uploaded_by=None))
+    await db.execute(
+        update(organization_domains)
+        .where(organization_domains.c.created_by == user_id)
+        .values(created_by=None)
+    )
+    await db.execute(update(Violation).where(Violation.detected_user_id == user_id).values(detected_user_id=None))
+    result = await db.execute(delete(User).where(User.id == user_id))
     await db.commit()
-    return True
+    return result.rowcount > 0
 
 
 # ==========================================
@@ -1146,6 +1839,7 @@ async def get_organization_domains(db: AsyncSession, organization_id: int) -> Li
         .join(organization_domains)
         .where(organization_domains.c.organization_id == organization_id)
         .order_by(Domain.id)
+        .options(raiseload("*"))
     )
     return list(result.scalars().all())
 
@@ -1177,6 +1871,9 @@ async def add_domain_to_organization(
     """
     Add a domain to an organization
     
+    Single INSERT ... SELECT guarded by EXISTS checks on the organization and
+    domain; an existing link is skipped via ON CONFLICT DO NOTHING.
+    
     Args:
         db: Database session
         organization_id: Organization ID
@@ -1184,69 +1881,161 @@ async def add_domain_to_organization(
         created_by: User ID who added it (optional)
         
     Returns:
-        True if added, False if already exists
+        True if added, False if already exists or organization/domain is missing
+        (use get_organization_domain_status to tell these apart)
     """
-    # Check if already exists
-    result = await db.execute(
-        select(organization_domains)
-        .where(
-            and_(
-                organization_domains.c.organization_id == organization_id,
-                organization_domains.c.domain_id == domain_id
+    stmt = (
+        _insert(db, organization_domains)
+        .from_select(
+            ["organization_id", "domain_id", "created_by", "created_at"],
+            select(
+                literal(organization_id, Integer),
+                literal(domain_id, Integer),
+                literal(created_by, Integer),
+                literal(datetime.utcnow(), DateTime),
+            ).where(
+                select(Organization.id).where(Organization.id == organization_id).exists(),
+                select(Domain.id).where(Domain.id == domain_id).exists(),
             )
         )
+        .on_conflict_do_nothing(index_elements=["organization_id", "domain_id"])
+        .returning(organization_domains.c.domain_id)
     )
-    existing = result.first()
-    if existing:
-        logger.debug(f"Domain {domain_id} already exists in organization {organization_id}")
-        return False
+    result = await db.execute(stmt)
+    added = result.first() is not None
+    if added:
+        # Nothing to commit otherwise; the caller's follow-up reads reuse this transaction
+        await db.commit()
+        logger.info(f"Domain {domain_id} added to organization {organization_id}")
+    else:
+        logger.debug(f"Domain {domain_id} not added to organization {organization_id}")
+    return added
+
+
+async def get_organization_domain_status(
+    db: AsyncSession,
+    organization_id: int,
+    domain_id: int
+) -> tuple[bool, bool, bool]:
+    """
+    Check organization, domain and organization-domain link existence in one query
     
-    # Insert new association
-    await db.execute(
-        organization_domains.insert().values(
-            organization_id=organization_id,
-            domain_id=domain_id,
-            created_by=created_by,
-            created_at=datetime.utcnow()
+    Used to explain why add/remove of an organization domain did nothing.
+    
+    Returns:
+        Tuple of (organization exists, domain exists, link exists)
+    """
+    result = await db.execute(
+        select(
+            select(Organization.id).where(Organization.id == organization_id).exists(),
+            select(Domain.id).where(Domain.id == domain_id).exists(),
+            select(organization_domains.c.domain_id).where(
+                and_(
+                    organization_domains.c.organization_id == organization_id,
+                    organization_domains.c.domain_id == domain_id
+                )
+            ).exists(),
         )
     )
-    await db.commit()
-    logger.info(f"Domain {domain_id} added to organization {organization_id}")
-    return True
+    org_exists, domain_exists, link_exists = result.one()
+    return bool(org_exists), bool(domain_exists), bool(link_exists)
+
+
+async def add_user_domains_to_organization(
+    db: AsyncSession,
+    organization_id: int,
+    created_by: Optional[int] = None
+) -> List[int]:
+    """
+    Copy domains selected by an organization's users (user_domains) into organization_domains
+    
+    Runs as a single INSERT ... SELECT: the distinct user domain IDs are joined
+    against existing domains, and links that already exist are skipped via
+    ON CONFLICT DO NOTHING.
+    
+    Args:
+        db: Database session
+        organization_id: Organization ID
+        created_by: User ID who ran the migration (optional)
+        
+    Returns:
+        IDs of the domains that were newly added
+    """
+    user_domain_ids = (
+        select(user_domains.c.domain_id)
+        .join(User, User.id == user_domains.c.user_id)
+        .where(User.organization_id == organization_id)
+        .distinct()
+    )
+    stmt = (
+        _insert(db, organization_domains)
+        .from_select(
+            ["organization_id", "domain_id", "created_by", "created_at"],
+            select(
+                literal(organization_id, Integer),
+                Domain.id,
+                literal(created_by, Integer),
+                literal(datetime.utcnow(), DateTime),
+            ).where(Domain.id.in_(user_domain_ids))
+        )
+        .on_conflict_do_nothing(index_elements=["organization_id", "domain_id"])
+        .returning(organization_domains.c.domain_id)
+    )
+    if db.bind.dialect.name == "postgresql":
+        # Re-runnable bulk copy: don't wait for the WAL flush (this transaction only)
+        await db.execute(text("SET LOCAL synchronous_commit = off"))
+    result = await db.execute(stmt)
+    added_domain_ids = list(result.scalars().all())
+    if added_domain_ids:
+        await db.commit()
+    return added_domain_ids
 
 
 async def remove_domain_from_organization(
     db: AsyncSession, 
     organization_id: int, 
     domain_id: int
-) -> bool:
+) -> Optional[int]:
     """
     Remove a domain from an organization
     
+    The DELETE also returns how many active cameras in the organization still
+    use the domain, so callers can warn without a separate query.
+    
     Args:
         db: Database session
         organization_id: Organization ID
         domain_id: Domain ID to remove
         
     Returns:
-        True if removed, False if not found
+        Number of active cameras still assigned to the domain if removed, None if not found
     """
+    active_camera_count = (
+        select(func.count(Camera.id))
+        .where(
+            Camera.domain_id == domain_id,
+            Camera.organization_id == organization_id,
+            Camera.is_active == True
+        )
+        .scalar_subquery()
+    )
     result = await db.execute(
-        organization_domains.delete().where(
+        organization_domains.delete()
+        .where(
             and_(
                 organization_domains.c.organization_id == organization_id,
                 organization_domains.c.domain_id == domain_id
             )
         )
+        .returning(active_camera_count)
     )
-    await db.commit()
-    
-    if result.rowcount > 0:
+    camera_count = result.scalar_one_or_none()
+    if camera_count is not None:
+        await db.commit()
         logger.info(f"Domain {domain_id} removed from organization {organization_id}")
-        return True
     else:
         logger.debug(f"Domain {domain_id} not found in organization {organization_id}")
-        return False
+    return camera_count
 
 
 async def has_organization_domain(
@@ -1265,17 +2054,19 @@ async def has_organization_domain(
     Returns:
         True if organization has the domain, False otherwise
     """
+    # Primary key probe: stops at the first match instead of counting
     result = await db.execute(
-        select(func.count(organization_domains.c.domain_id))
+        select(literal(1))
+        .select_from(organization_domains)
         .where(
             and_(
                 organization_domains.c.organization_id == organization_id,
                 organization_domains.c.domain_id == domain_id
             )
         )
+        .limit(1)
     )
-    count = result.scalar_one()
-    return count > 0
+    return result.scalar() is not None
 
 
 # ==========================================
@@ -1314,17 +2105,20 @@ async def create_user_photo(
             .values(is_primary=False)
         )
     
-    db_photo = UserPhoto(
-        user_id=user_id,
-        photo_path=photo_path,
-        face_encoding=face_encoding,
-        is_primary=is_primary,
-        uploaded_by=uploaded_by
+    # INSERT ... RETURNING: one round-trip, no refresh
+    result = await db.execute(
+        insert(UserPhoto)
+        .values(
+            user_id=user_id,
+            photo_path=photo_path,
+            face_encoding=face_encoding,
+            is_primary=is_primary,
+            uploaded_by=uploaded_by
+        )
+        .returning(UserPhoto)
     )
-    
-    db.add(db_photo)
+    db_photo = result.scalar_one()
     await db.commit()
-    await db.refresh(db_photo)
     return db_photo
 
 
@@ -1348,6 +2142,7 @@ async def get_user_photos(
         select(UserPhoto)
         .where(UserPhoto.user_id == user_id)
         .order_by(UserPhoto.is_primary.desc(), UserPhoto.uploaded_at.desc())
+        .options(raiseload("*"))
     )
     return list(result.scalars().all())
 
@@ -1373,6 +2168,7 @@ async def get_user_photos_by_organization(
         .join(User, UserPhoto.user_id == User.id)
         .where(User.organization_id == organization_id)
         .where(UserPhoto.face_encoding.isnot(None))  # Only photos with encoding
+        .options(raiseload("*"))
     )
     return list(result.scalars().all())
 
@@ -1396,6 +2192,7 @@ async def get_user_photo_by_id(
     result = await db.execute(
         select(UserPhoto)
         .where(UserPhoto.id == photo_id)
+        .options(raiseload("*"))
     )
     return result.scalar_one_or_none()
 
@@ -1438,31 +2235,72 @@ async def update_user_photo(
     if is_primary is not None:
         photo.is_primary = is_primary
     
+    # Everything written is already on the object; no refresh after commit
     await db.commit()
-    await db.refresh(photo)
     return photo
 
 
-async def delete_user_photo(
+async def set_primary_user_photo(
     db: AsyncSession,
+    user_id: int,
     photo_id: int
-) -> bool:
+) -> Optional["UserPhoto"]:
     """
-    Delete user photo
+    Make a photo the user's only primary photo in a single UPDATE
+    
+    Every photo of the user gets is_primary = (id == photo_id), so there is
+    never a moment with zero or two primaries. Nothing changes if the photo
+    doesn't belong to the user.
     
     Args:
         db: Database session
+        user_id: User ID
         photo_id: Photo ID
         
     Returns:
-        True if deleted, False if not found
+        Updated UserPhoto object or None if not found for this user
     """
-    from backend.database.models import UserPhoto
-    
+    photo_exists = (
+        select(UserPhoto.id)
+        .where(UserPhoto.id == photo_id, UserPhoto.user_id == user_id)
+        .exists()
+    )
     result = await db.execute(
-        delete(UserPhoto)
-        .where(UserPhoto.id == photo_id)
+        update(UserPhoto)
+        .where(UserPhoto.user_id == user_id, photo_exists)
+        .values(is_primary=(UserPhoto.id == photo_id))
+        .returning(UserPhoto)
+        .execution_options(populate_existing=True)
     )
+    photo = next((p for p in result.scalars() if p.id == photo_id), None)
     await db.commit()
-    return result.rowcount > 0
+    return photo
+
+
+async def delete_user_photo(
+    db: AsyncSession,
+    photo_id: int,
+    user_id: Optional[int] = None
+) -> Optional[str]:
+    """
+    Delete user photo in a single DELETE ... RETURNING (no lookup first)
+    
+    Args:
+        db: Database session
+        photo_id: Photo ID
+        user_id: Only delete the photo if it belongs to this user (optional)
+        
+    Returns:
+        The deleted photo's photo_path (so the caller can remove the file), None if not found
+    """
+    from backend.database.models import UserPhoto
+    
+    query = delete(UserPhoto).where(UserPhoto.id == photo_id)
+    if user_id is not None:
+        query = query.where(UserPhoto.user_id == user_id)
+    result = await db.execute(query.returning(UserPhoto.photo_path))
+    photo_path = result.scalar_one_or_none()
+    if photo_path is not None:
+        await db.commit()
+    return photo_path
 
@@ -6,7 +6,6 @@ Database Migration: Add face recognition support
 
 import asyncio
 import sys
-import json
 from pathlib import Path
 from sqlalchemy import text, inspect
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
@@ -21,55 +20,25 @@ from backend.utils.logger import logger
 
 async def _run_migration():
     """Internal function to run the migration."""
-    # #region agent log
-    import json
-    log_path = Path(__file__).parent.parent.parent.parent / ".cursor" / "debug.log"
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(json.dumps({"sessionId":"debug-session","runId":"migration-check","hypothesisId":"A","location":"add_face_recognition_tables.py:21","message":"Starting migration","data":{"database_url":str(settings.database_url)},"timestamp":int(__import__("time").time()*1000)})+"\n")
-    # #endregion
-    
     engine = create_async_engine(settings.database_url, echo=False)
     AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
     async with AsyncSessionLocal() as session:
-        # #region agent log
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps({"sessionId":"debug-session","runId":"migration-check","hypothesisId":"B","location":"add_face_recognition_tables.py:27","message":"Session created, checking existing tables","data":{},"timestamp":int(__import__("time").time()*1000)})+"\n")
-        # #endregion
-        
         changes_made = False
         
         # Check if violations table exists
-        # #region agent log
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps({"sessionId":"debug-session","runId":"migration-check","hypothesisId":"C","location":"add_face_recognition_tables.py:32","message":"Checking violations table existence","data":{},"timestamp":int(__import__("time").time()*1000)})+"\n")
-        # #endregion
-        
         try:
             result = await session.execute(
                 text("SELECT name FROM sqlite_master WHERE type='table' AND name='violations'")
             )
             violations_exists = result.fetchone() is not None
             
-            # #region agent log
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId":"debug-session","runId":"migration-check","hypothesisId":"C","location":"add_face_recognition_tables.py:40","message":"Violations table check result","data":{"violations_exists":violations_exists},"timestamp":int(__import__("time").time()*1000)})+"\n")
-            # #endregion
-            
             if not violations_exists:
                 logger.warning("WARNING: violations table does not exist. Please run database initialization first:")
                 logger.warning("   python scripts/init_database.py")
                 logger.warning("   OR start the backend server (it will auto-initialize)")
-                # #region agent log
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps({"sessionId":"debug-session","runId":"migration-check","hypothesisId":"C","location":"add_face_recognition_tables.py:47","message":"Violations table missing - migration cannot proceed","data":{},"timestamp":int(__import__("time").time()*1000)})+"\n")
-                # #endregion
                 return False
         except Exception as e:
-            # #region agent log
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps({"sessionId":"debug-session","runId":"migration-check","hypothesisId":"D","location":"add_face_recognition_tables.py:52","message":"Error checking violations table","data":{"error":str(e)},"timestamp":int(__import__("time").time()*1000)})+"\n")
-            # #endregion
             logger.error(f"Error checking violations table: {e}")
             return False
 
@@ -0,0 +1,51 @@
+"""
+Migration script: Add organization_domains indexes
+
+The composite primary key (organization_id, domain_id) already covers
+existence checks and lookups by organization. This adds the missing
+index on domain_id, used by lookups by domain and by the ON DELETE
+CASCADE from domains. Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from sqlalchemy import text
+from backend.utils.logger import logger
+
+
+async def add_organization_domains_indexes():
+    """Create missing indexes on organization_domains"""
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add organization_domains indexes")
+            
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_organization_domains_domain_id "
+                "ON organization_domains (domain_id)"
+            ))
+            await db.commit()
+            
+            logger.info("Migration completed. ix_organization_domains_domain_id is present.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await add_organization_domains_indexes()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
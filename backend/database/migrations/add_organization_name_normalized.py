@@ -0,0 +1,77 @@
+"""
+Migration script: Add organizations.name_normalized
+
+get_organization_by_name (used by signup to find or create the user's
+organization) now matches on this indexed column instead of loading every
+organization and comparing names in Python. Existing rows are backfilled
+with the same normalization create_organization applies.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, engine
+from backend.database.crud import normalize_organization_name
+from sqlalchemy import bindparam, inspect, text
+from backend.utils.logger import logger
+
+
+async def add_organization_name_normalized():
+    """Add, backfill and index organizations.name_normalized"""
+    async with engine.connect() as conn:
+        columns = await conn.run_sync(
+            lambda sync_conn: [col["name"] for col in inspect(sync_conn).get_columns("organizations")]
+        )
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add organizations.name_normalized")
+            
+            if "name_normalized" not in columns:
+                await db.execute(text(
+                    "ALTER TABLE organizations ADD COLUMN name_normalized VARCHAR(200)"
+                ))
+            
+            # Normalized in Python (str.lower folds non-ASCII letters, SQLite's lower() doesn't)
+            result = await db.execute(text(
+                "SELECT id, name FROM organizations WHERE name_normalized IS NULL"
+            ))
+            rows = [
+                {"org_id": org_id, "name_normalized": normalize_organization_name(name or "")}
+                for org_id, name in result.all()
+            ]
+            if rows:
+                await db.execute(
+                    text("UPDATE organizations SET name_normalized = :name_normalized WHERE id = :org_id")
+                    .bindparams(bindparam("org_id"), bindparam("name_normalized")),
+                    rows
+                )
+            
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_organizations_name_normalized "
+                "ON organizations (name_normalized)"
+            ))
+            await db.commit()
+            
+            logger.info(f"Migration completed. {len(rows)} organizations backfilled.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await add_organization_name_normalized()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Migration script: Add users.is_deleted (soft delete)
+
+DELETE /users/{id} now marks the user as deleted and purges the row in
+the background; all user lookups filter on this column.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, engine
+from sqlalchemy import inspect, text
+from backend.utils.logger import logger
+
+
+async def add_user_soft_delete():
+    """Add is_deleted column to users if missing"""
+    async with engine.connect() as conn:
+        columns = await conn.run_sync(
+            lambda sync_conn: [col["name"] for col in inspect(sync_conn).get_columns("users")]
+        )
+    
+    if "is_deleted" in columns:
+        logger.info("users.is_deleted already exists - no migration needed")
+        return
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add users.is_deleted")
+            await db.execute(text(
+                "ALTER TABLE users ADD COLUMN is_deleted BOOLEAN NOT NULL DEFAULT FALSE"
+            ))
+            await db.commit()
+            logger.info("Migration completed. users.is_deleted added.")
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await add_user_soft_delete()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Migration script: Add users.email_domain
+
+Signup matches a new user to an organization by email domain. That used
+a LIKE '%@domain' scan over every user; it is now an equality lookup on
+this indexed column. Existing rows are backfilled from their emails.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, engine
+from backend.database.crud import get_email_domain
+from sqlalchemy import bindparam, inspect, text
+from backend.utils.logger import logger
+
+
+async def add_users_email_domain():
+    """Add, backfill and index users.email_domain"""
+    async with engine.connect() as conn:
+        columns = await conn.run_sync(
+            lambda sync_conn: [col["name"] for col in inspect(sync_conn).get_columns("users")]
+        )
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add users.email_domain")
+            
+            if "email_domain" not in columns:
+                await db.execute(text(
+                    "ALTER TABLE users ADD COLUMN email_domain VARCHAR(100)"
+                ))
+            
+            # Split in Python with the same helper create_user uses (no portable SQL split)
+            result = await db.execute(text(
+                "SELECT id, email FROM users WHERE email_domain IS NULL"
+            ))
+            rows = [
+                {"user_id": user_id, "email_domain": get_email_domain(email)}
+                for user_id, email in result.all()
+            ]
+            if rows:
+                await db.execute(
+                    text("UPDATE users SET email_domain = :email_domain WHERE id = :user_id")
+                    .bindparams(bindparam("user_id"), bindparam("email_domain")),
+                    rows
+                )
+            
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_users_email_domain ON users (email_domain)"
+            ))
+            await db.commit()
+            
+            logger.info(f"Migration completed. {len(rows)} users backfilled.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await add_users_email_domain()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Migration script: Add unique lower(email) index on users
+
+get_user_by_email compares lower(email), so logins and registration
+checks match regardless of casing. This expression index serves that
+lookup and rejects a second account whose email differs only in case.
+Existing mixed-case emails are lowercased first (create_user/update_user
+already store them lowercase). If two accounts differ only in casing the
+migration stops and lists them - merge or rename one, then run it again.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from sqlalchemy import text
+from backend.utils.logger import logger
+
+
+async def add_users_email_lower_index():
+    """Lowercase stored emails and create ix_users_email_lower if missing"""
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add users lower(email) index")
+            
+            result = await db.execute(text(
+                "SELECT lower(email), count(*) FROM users "
+                "GROUP BY lower(email) HAVING count(*) > 1"
+            ))
+            duplicates = result.all()
+            if duplicates:
+                for email, count in duplicates:
+                    logger.error(f"{count} users share the email {email} (ignoring case)")
+                raise RuntimeError("Resolve the duplicate emails above, then run this migration again")
+            
+            result = await db.execute(text(
+                "UPDATE users SET email = lower(email) WHERE email != lower(email)"
+            ))
+            logger.info(f"Lowercased {result.rowcount} user emails")
+            
+            await db.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower "
+                "ON users (lower(email))"
+            ))
+            await db.commit()
+            
+            logger.info("Migration completed. ix_users_email_lower is present.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await add_users_email_lower_index()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
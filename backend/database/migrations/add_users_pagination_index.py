@@ -0,0 +1,50 @@
+"""
+Migration script: Add users (organization_id, id) index
+
+GET /users pages by id within an organization (keyset pagination:
+WHERE organization_id = ? AND id > ? ORDER BY id). This composite index
+serves that as a single range scan. Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from sqlalchemy import text
+from backend.utils.logger import logger
+
+
+async def add_users_pagination_index():
+    """Create the users (organization_id, id) index if missing"""
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add users pagination index")
+            
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_users_organization_id_id "
+                "ON users (organization_id, id)"
+            ))
+            await db.commit()
+            
+            logger.info("Migration completed. ix_users_organization_id_id is present.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await add_users_pagination_index()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""
+Migration script: Add composite indexes for filtered violation lists
+
+GET /violations is usually filtered by domain, status or camera within an
+organization and paged newest first (ORDER BY timestamp DESC, id DESC).
+These indexes serve each filter as a single backward range scan; open
+violations (the dashboard default) get a smaller partial index.
+On PostgreSQL the other filter columns are INCLUDEd in the filter indexes.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from sqlalchemy import text
+from backend.utils.logger import logger
+
+
+def _index_statements(dialect: str) -> list[str]:
+    """CREATE INDEX statements for the given dialect name"""
+    include = " INCLUDE (severity, camera_id)" if dialect == "postgresql" else ""
+    camera_include = " INCLUDE (severity, status)" if dialect == "postgresql" else ""
+    return [
+        "CREATE INDEX IF NOT EXISTS ix_violations_organization_id_domain_id_timestamp_id "
+        f"ON violations (organization_id, domain_id, timestamp, id){include}",
+        "CREATE INDEX IF NOT EXISTS ix_violations_organization_id_status_timestamp_id "
+        f"ON violations (organization_id, status, timestamp, id){include}",
+        "CREATE INDEX IF NOT EXISTS ix_violations_organization_id_camera_id_timestamp_id "
+        f"ON violations (organization_id, camera_id, timestamp, id){camera_include}",
+        "CREATE INDEX IF NOT EXISTS ix_violations_open_organization_id_timestamp_id "
+        "ON violations (organization_id, timestamp, id) WHERE status = 'OPEN'",
+    ]
+
+
+async def add_violations_filter_indexes():
+    """Create the violations filter indexes if missing"""
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add violations filter indexes")
+            
+            for statement in _index_statements(db.bind.dialect.name):
+                await db.execute(text(statement))
+            await db.commit()
+            
+            logger.info("Migration completed. Violations filter indexes are present.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await add_violations_filter_indexes()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""
+Migration script: Add GIN index for the missing_ppe_type violation filter
+
+GET /violations?missing_ppe_type=... tests missing_ppe::jsonb @> '[{"type": ...}]'
+on PostgreSQL. This expression index lets that probe the index instead of
+scanning every violation. SQLite has no index for JSON array contents, so
+nothing is created there.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from sqlalchemy import text
+from backend.utils.logger import logger
+
+
+async def add_violations_missing_ppe_index():
+    """Create the missing_ppe GIN index if missing (PostgreSQL only)"""
+    async with AsyncSessionLocal() as db:
+        if db.bind.dialect.name != "postgresql":
+            logger.info("Skipping missing_ppe index: only used on PostgreSQL")
+            return
+        try:
+            logger.info("Starting migration: Add violations missing_ppe index")
+
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_violations_missing_ppe "
+                "ON violations USING gin ((missing_ppe::jsonb) jsonb_path_ops)"
+            ))
+            await db.commit()
+
+            logger.info("Migration completed. Violations missing_ppe index is present.")
+
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await add_violations_missing_ppe_index()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""
+Migration script: Add violations (organization_id, timestamp, id) index
+
+GET /violations pages newest first within an organization (keyset pagination:
+WHERE organization_id = ? AND (timestamp, id) < (?, ?)
+ORDER BY timestamp DESC, id DESC). This composite index serves that as a
+single backward range scan. Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from sqlalchemy import text
+from backend.utils.logger import logger
+
+
+async def add_violations_pagination_index():
+    """Create the violations (organization_id, timestamp, id) index if missing"""
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Add violations pagination index")
+            
+            await db.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_violations_organization_id_timestamp_id "
+                "ON violations (organization_id, timestamp, id)"
+            ))
+            await db.commit()
+            
+            logger.info("Migration completed. ix_violations_organization_id_timestamp_id is present.")
+            
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await add_violations_pagination_index()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
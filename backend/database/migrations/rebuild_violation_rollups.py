@@ -0,0 +1,48 @@
+"""
+Migration script: Rebuild the violation_hourly_rollups table
+
+Violation stats read whole hours from these rollups. init_db builds them
+once when the table is first created, and every violation write through
+crud keeps its hour bucket current. Run this after editing violations by
+hand (or restoring a backup) to recompute all buckets from scratch.
+Safe to run multiple times.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.database.connection import AsyncSessionLocal, init_db
+from backend.database.crud import rebuild_violation_rollups as rebuild_rollups
+from backend.utils.logger import logger
+
+
+async def rebuild_violation_rollups():
+    """Recompute every violation rollup bucket"""
+    async with AsyncSessionLocal() as db:
+        try:
+            logger.info("Starting migration: Rebuild violation hourly rollups")
+
+            buckets = await rebuild_rollups(db)
+
+            logger.info(f"Migration completed. {buckets} hour buckets rebuilt.")
+
+        except Exception as e:
+            logger.error(f"Migration failed: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+
+
+async def main():
+    """Main entry point"""
+    await init_db()
+    await rebuild_violation_rollups()
+    logger.info("Migration script finished")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,7 +5,7 @@ Multi-domain architecture with flexible PPE rules
 
 from sqlalchemy import (
     Column, Integer, String, Boolean, Float, DateTime, Text,
-    ForeignKey, Enum as SQLEnum, JSON, Table
+    ForeignKey, Enum as SQLEnum, JSON, Table, Index, text
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -72,6 +72,9 @@ class Organization(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)  # "Acme Corporation"
+    # name.strip().lower(), kept by create_organization: indexed case-insensitive lookup
+    # (computed in Python so Turkish letters fold the same way on every database)
+    name_normalized = Column(String(200), nullable=True, index=True)  # "acme corporation"
     slug = Column(String(200), nullable=False, unique=True, index=True)  # "acme-corporation" (URL-friendly)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -102,7 +105,10 @@ organization_domains = Table(
     Column('organization_id', Integer, ForeignKey('organizations.id', ondelete='CASCADE'), primary_key=True),
     Column('domain_id', Integer, ForeignKey('domains.id', ondelete='CASCADE'), primary_key=True),
     Column('created_at', DateTime, default=datetime.utcnow),
-    Column('created_by', Integer, ForeignKey('users.id'), nullable=True)  # User ID who added it (admin)
+    Column('created_by', Integer, ForeignKey('users.id'), nullable=True),  # User ID who added it (admin)
+    # The primary key (organization_id, domain_id) serves lookups by organization;
+    # this one serves lookups by domain and the ON DELETE CASCADE from domains
+    Index('ix_organization_domains_domain_id', 'domain_id')
 )
 
 
@@ -214,6 +220,42 @@ class Violation(Base):
     Stores detected violations with timestamp and snapshot
     """
     __tablename__ = "violations"
+    __table_args__ = (
+        # Keyset pagination: WHERE organization_id = ? AND (timestamp, id) < (?, ?)
+        # ORDER BY timestamp DESC, id DESC
+        Index('ix_violations_organization_id_timestamp_id', 'organization_id', 'timestamp', 'id'),
+        # Same page order for the common list filters (domain_id / status / camera_id);
+        # on PostgreSQL the INCLUDE columns allow index-only filter checks
+        Index(
+            'ix_violations_organization_id_domain_id_timestamp_id',
+            'organization_id', 'domain_id', 'timestamp', 'id',
+            postgresql_include=['severity', 'camera_id'],
+        ),
+        Index(
+            'ix_violations_organization_id_status_timestamp_id',
+            'organization_id', 'status', 'timestamp', 'id',
+            postgresql_include=['severity', 'camera_id'],
+        ),
+        Index(
+            'ix_violations_organization_id_camera_id_timestamp_id',
+            'organization_id', 'camera_id', 'timestamp', 'id',
+            postgresql_include=['severity', 'status'],
+        ),
+        # Open violations are the dashboard default and a small share of the table
+        Index(
+            'ix_violations_open_organization_id_timestamp_id',
+            'organization_id', 'timestamp', 'id',
+            postgresql_where=text("status = 'OPEN'"),
+            sqlite_where=text("status = 'OPEN'"),
+        ),
+        # missing_ppe_type filter (missing_ppe::jsonb @> ...); PostgreSQL only,
+        # SQLite has no index type for JSON array contents
+        Index(
+            'ix_violations_missing_ppe',
+            text("(missing_ppe::jsonb) jsonb_path_ops"),
+            postgresql_using='gin',
+        ).ddl_if(dialect='postgresql'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     camera_id = Column(Integer, ForeignKey("cameras.id"), nullable=False)
@@ -267,6 +309,33 @@ class Violation(Base):
         return f"<Violation(id={self.id}, camera_id={self.camera_id}, timestamp='{self.timestamp}')>"
 
 
+class ViolationHourlyRollup(Base):
+    """
+    Violation counts per organization, domain, hour and severity (for dashboard stats)
+    
+    Rows with ppe_type '' count violations (and how many are acknowledged);
+    other rows count the missing PPE items of that type. crud adds each new
+    violation (and acknowledgement change) to its rows as it is written.
+    """
+    __tablename__ = "violation_hourly_rollups"
+    __table_args__ = (
+        # Organization-wide stats: WHERE organization_id = ? AND bucket_hour in range
+        Index('ix_violation_hourly_rollups_organization_id_bucket_hour', 'organization_id', 'bucket_hour'),
+    )
+    
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    domain_id = Column(Integer, ForeignKey("domains.id"), primary_key=True)
+    bucket_hour = Column(DateTime, primary_key=True)         # Violation timestamp truncated to the hour
+    severity = Column(SQLEnum(ViolationSeverity), primary_key=True)
+    ppe_type = Column(String(100), primary_key=True, default="")
+    
+    count = Column(Integer, nullable=False, default=0)
+    acknowledged_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ViolationHourlyRollup(organization_id={self.organization_id}, bucket_hour='{self.bucket_hour}')>"
+
+
 class DetectionLog(Base):
     """
     Aggregated detection statistics (for dashboard)
@@ -295,9 +364,18 @@ class User(Base):
     Supports role-based and domain-based access control
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination within an organization: WHERE organization_id = ? AND id > ? ORDER BY id
+        Index('ix_users_organization_id_id', 'organization_id', 'id'),
+        # Case-insensitive email lookups (get_user_by_email compares lower(email))
+        # and one account per address regardless of casing
+        Index('ix_users_email_lower', text('lower(email)'), unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(100), unique=True, nullable=False, index=True)
+    # Part after "@" (lowercase), kept by create_user/update_user: indexed organization match on signup
+    email_domain = Column(String(100), nullable=True, index=True)
     full_name = Column(String(100), nullable=False)
     hashed_password = Column(String(255), nullable=False)
     role = Column(SQLEnum(UserRole), default=UserRole.VIEWER, nullable=False)
@@ -314,6 +392,8 @@ class User(Base):
     permissions = Column(JSON, default=list, nullable=False)
     
     is_active = Column(Boolean, default=True)
+    # Soft delete: set by DELETE /users/{id}, row is purged in the background
+    is_deleted = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
     
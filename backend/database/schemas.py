@@ -176,6 +176,14 @@ class CameraResponse(CameraBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class DomainOverviewResponse(BaseModel):
+    """Everything a domain dashboard card needs, in one response"""
+    domain: DomainResponse
+    stats: dict = Field(..., description="Same as GET /violations/stats?domain_id=...")
+    cameras: List[CameraResponse] = Field(..., description="Active cameras of the domain in the user's organization")
+    rules: List[DomainPPERuleResponse] = Field(..., description="PPE rules of the domain")
+
+
 # ==========================================
 # VIOLATION SCHEMAS
 # ==========================================
@@ -215,6 +223,11 @@ class ViolationCreate(ViolationBase):
     pass
 
 
+class ViolationBulkCreateResponse(BaseModel):
+    """Response for bulk violation creation"""
+    ids: List[int] = Field(..., description="IDs of the created violations, in request order")
+
+
 class ViolationUpdate(BaseModel):
     """Schema for updating a violation (workflow management)"""
     status: Optional[ViolationStatus] = None
@@ -260,16 +273,21 @@ class ViolationFilterParams(BaseModel):
     end_date: Optional[datetime] = None
     skip: int = Field(default=0, ge=0)
     limit: int = Field(default=50, ge=1, le=100)
+    # Keyset pagination: only violations older than (before_timestamp, before_id)
+    before_timestamp: Optional[datetime] = None
+    before_id: Optional[int] = None
+    include_total: bool = Field(default=True, description="Run the COUNT query for total")
     # Legacy field (deprecated)
     acknowledged: Optional[bool] = None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response"""
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(..., description="Total number of items (null if not requested)")
     skip: int = Field(..., description="Number of items skipped")
     limit: int = Field(..., description="Number of items per page")
     items: List[T] = Field(..., description="List of items")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (keyset pagination), null on the last page")
     
     model_config = ConfigDict(from_attributes=True)
 
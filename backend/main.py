@@ -3,6 +3,7 @@ PPE Compliance System - FastAPI Application Entry Point
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.config import settings, initialize_directories
 from backend.utils.logger import logger
@@ -15,6 +16,7 @@ app = FastAPI(
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
     redirect_slashes=False,  # Disable automatic trailing slash redirects
+    default_response_class=ORJSONResponse,  # orjson is considerably faster than stdlib json
 )
 
 # CORS middleware (allow frontend to access API)
@@ -39,10 +41,15 @@ async def startup_event():
     logger.info("Directories initialized")
     
     # Initialize database
-    from backend.database.connection import init_db
+    from backend.database.connection import init_db, warm_up_pool
     await init_db()
     logger.info("Database initialized")
     
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {str(e)}")
+    
     # Load email configuration from database
     try:
         from backend.database.connection import AsyncSessionLocal
@@ -188,6 +195,17 @@ app.include_router(maintenance.router, prefix=settings.api_v1_prefix)
 app.include_router(websocket.router, prefix=settings.api_v1_prefix)  # ✅ WebSocket endpoint
 app.include_router(files.router, prefix=settings.api_v1_prefix)  # ✅ File serving endpoint
 
+# A route registered twice (e.g. a router included twice) is matched by linear
+# scan on every request and only the first copy is ever reached - fail fast
+_route_keys = [
+    (method, route.path)
+    for route in app.routes
+    for method in (getattr(route, "methods", None) or ["WEBSOCKET"])
+]
+if len(set(_route_keys)) != len(_route_keys):
+    _duplicates = sorted({key for key in _route_keys if _route_keys.count(key) > 1})
+    raise RuntimeError(f"Duplicate API routes registered: {_duplicates}")
+
 
 if __name__ == "__main__":
     import uvicorn
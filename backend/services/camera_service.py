@@ -36,7 +36,8 @@ class CameraService:
         skip: int = 0,
         limit: int = 100,
         domain_id: Optional[int] = None,
-        organization_id: Optional[int] = None
+        organization_id: Optional[int] = None,
+        after_id: Optional[int] = None
     ) -> List[Camera]:
         """
         Get all cameras with optional domain and organization filtering
@@ -46,6 +47,7 @@ class CameraService:
             limit: Maximum number of records
             domain_id: Optional domain filter
             organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+            after_id: Keyset pagination - only cameras with id > after_id (optional)
             
         Returns:
             List of cameras
@@ -55,7 +57,9 @@ class CameraService:
         if domain_id:
             cameras = await crud.get_cameras_by_domain(self.db, domain_id, organization_id=organization_id)
         else:
-            cameras = await crud.get_cameras(self.db, skip=skip, limit=limit, organization_id=organization_id)
+            cameras = await crud.get_cameras(
+                self.db, skip=skip, limit=limit, organization_id=organization_id, after_id=after_id
+            )
         
         logger.info(f"Retrieved {len(cameras)} cameras for organization {organization_id}")
         return cameras
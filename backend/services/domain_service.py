@@ -8,10 +8,23 @@ from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database import crud, schemas
+from backend.database.connection import AsyncSessionLocal
 from backend.database.models import Domain
+from backend.utils.cache import domain_rules_cache, domains_cache
 from backend.utils.logger import logger
 
 
+async def _load_detached(loader, *args):
+    """
+    Run a crud loader in its own short session
+    
+    The returned objects are detached (nothing another request's commit or
+    rollback can expire), so they can be cached and shared between requests.
+    """
+    async with AsyncSessionLocal() as session:
+        return await loader(session, *args)
+
+
 class DomainService:
     """
     Service class for domain business logic
@@ -31,19 +44,20 @@ class DomainService:
         """
         self.db = db
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Domain]:
+    async def get_all(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[Domain]:
         """
         Get all domains with pagination
         
         Args:
             skip: Number of records to skip
             limit: Maximum number of records
+            after_id: Keyset pagination - only domains with id > after_id (optional)
             
         Returns:
             List of domains
         """
-        logger.debug(f"Fetching domains (skip={skip}, limit={limit})")
-        domains = await crud.get_domains(self.db, skip=skip, limit=limit)
+        logger.debug(f"Fetching domains (skip={skip}, limit={limit}, after_id={after_id})")
+        domains = await crud.get_domains(self.db, skip=skip, limit=limit, after_id=after_id)
         logger.info(f"Retrieved {len(domains)} domains")
         return domains
     
@@ -58,7 +72,12 @@ class DomainService:
             Domain if found, None otherwise
         """
         logger.debug(f"Fetching domain {domain_id}")
-        domain = await crud.get_domain_by_id(self.db, domain_id)
+        # Read on every detection frame and rarely changed - cached (writers invalidate)
+        domain = domains_cache.get(("id", domain_id))
+        if domain is None:
+            domain = await _load_detached(crud.get_domain_by_id, domain_id)
+            if domain:
+                domains_cache.set(("id", domain_id), domain)
         if domain:
             logger.debug(f"Domain {domain_id} found: {domain.name}")
         else:
@@ -76,7 +95,11 @@ class DomainService:
             Domain if found, None otherwise
         """
         logger.debug(f"Fetching domain by type: {domain_type}")
-        domain = await crud.get_domain_by_type(self.db, domain_type)
+        domain = domains_cache.get(("type", domain_type))
+        if domain is None:
+            domain = await _load_detached(crud.get_domain_by_type, domain_type)
+            if domain:
+                domains_cache.set(("type", domain_type), domain)
         if domain:
             logger.debug(f"Domain found: {domain.name} (id={domain.id})")
         else:
@@ -111,6 +134,7 @@ class DomainService:
         
         # Create domain
         domain = await crud.create_domain(self.db, domain_data)
+        domains_cache.clear()
         logger.info(f"Domain {domain.id} created successfully: {domain.name}")
         
         return domain
@@ -133,6 +157,7 @@ class DomainService:
         logger.info(f"Updating domain {domain_id}")
         
         domain = await crud.update_domain(self.db, domain_id, update_data)
+        domains_cache.clear()
         
         if domain:
             logger.info(f"Domain {domain_id} updated successfully")
@@ -154,6 +179,8 @@ class DomainService:
         logger.warning(f"Deleting domain {domain_id}")
         
         success = await crud.delete_domain(self.db, domain_id)
+        domains_cache.clear()
+        domain_rules_cache.invalidate(domain_id)
         
         if success:
             logger.info(f"Domain {domain_id} deleted successfully")
@@ -173,7 +200,10 @@ class DomainService:
             List of domain PPE rules
         """
         logger.debug(f"Fetching rules for domain {domain_id}")
-        rules = await crud.get_domain_rules(self.db, domain_id)
+        rules = domain_rules_cache.get(domain_id)
+        if rules is None:
+            rules = await _load_detached(crud.get_domain_rules, domain_id)
+            domain_rules_cache.set(domain_id, rules)
         logger.debug(f"Retrieved {len(rules)} rules for domain {domain_id}")
         return rules
 
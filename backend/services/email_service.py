@@ -523,8 +523,9 @@ def get_email_service() -> EmailService:
     return _email_service
 
 
-def configure_email_service(config: EmailConfig):
-    """Configure the global email service"""
+def configure_email_service(config: EmailConfig) -> EmailService:
+    """Configure the global email service and return the new instance"""
     logger.info(f"Configuring email service: smtp_user='{config.smtp_user}', smtp_password={'***' if config.smtp_password else 'EMPTY'}")
     global _email_service
     _email_service = EmailService(config)
+    return _email_service
@@ -3,6 +3,7 @@ Face Recognition Service using DeepFace
 Handles face encoding extraction and user matching for violation snapshots
 """
 
+import asyncio
 from pathlib import Path
 from typing import List, Optional, Tuple
 import numpy as np
@@ -10,6 +11,7 @@ from deepface import DeepFace
 from backend.config import settings
 from backend.utils.logger import logger
 from backend.database import crud
+from backend.database.connection import AsyncSessionLocal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -173,3 +175,36 @@ class FaceRecognitionService:
             logger.error(f"Error finding matching user: {str(e)}", exc_info=True)
             return None
 
+
+
+# Global service instance
+_face_service_instance = None
+
+
+def get_face_recognition_service() -> FaceRecognitionService:
+    """Get global face recognition service instance (singleton)"""
+    global _face_service_instance
+    if _face_service_instance is None:
+        _face_service_instance = FaceRecognitionService()
+    return _face_service_instance
+
+
+async def encode_user_photo(photo_id: int, image_path: str):
+    """
+    Extract and store the face encoding of an uploaded user photo
+    
+    Runs as a background task after the upload response has been sent,
+    so it opens its own session instead of reusing the request's.
+    """
+    try:
+        face_service = get_face_recognition_service()
+        # Encoding is CPU-bound - keep it off the event loop
+        face_encoding = await asyncio.to_thread(face_service.extract_face_encoding, image_path)
+        if face_encoding is None:
+            logger.warning(f"No face detected in uploaded photo {photo_id}")
+            return
+        async with AsyncSessionLocal() as db:
+            await crud.update_user_photo(db, photo_id, face_encoding=face_encoding)
+        logger.info(f"Stored face encoding for photo {photo_id}")
+    except Exception as e:
+        logger.error(f"Error extracting face encoding for photo {photo_id}: {str(e)}", exc_info=True)
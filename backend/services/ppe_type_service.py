@@ -31,19 +31,20 @@ class PPETypeService:
         """
         self.db = db
     
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[PPEType]:
+    async def get_all(self, skip: int = 0, limit: int = 100, after_id: Optional[int] = None) -> List[PPEType]:
         """
         Get all PPE types with pagination
         
         Args:
             skip: Number of records to skip
             limit: Maximum number of records
+            after_id: Keyset pagination - only PPE types with id > after_id (optional)
             
         Returns:
             List of PPE types
         """
-        logger.debug(f"Fetching PPE types (skip={skip}, limit={limit})")
-        ppe_types = await crud.get_ppe_types(self.db, skip=skip, limit=limit)
+        logger.debug(f"Fetching PPE types (skip={skip}, limit={limit}, after_id={after_id})")
+        ppe_types = await crud.get_ppe_types(self.db, skip=skip, limit=limit, after_id=after_id)
         logger.info(f"Retrieved {len(ppe_types)} PPE types")
         return ppe_types
     
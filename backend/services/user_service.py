@@ -4,11 +4,15 @@ User service for authentication and admin management
 
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update, delete, insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 from backend.database import crud, schemas
+from backend.database.connection import AsyncSessionLocal
 from backend.database.models import User, UserRole, user_domains, Domain
+from backend.utils.cache import current_user_cache, email_domain_org_cache
 from backend.utils.security import verify_password, get_password_hash
 from backend.utils.logger import logger
 
@@ -20,12 +24,18 @@ class UserService:
         self.db = db
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        return await crud.get_user_by_email(self.db, email.lower())
+        return await crud.get_user_by_email(self.db, email)
 
-    async def get_by_id(self, user_id: int) -> Optional[User]:
-        return await crud.get_user(self.db, user_id)
+    async def get_by_id(self, user_id: int, organization_id: Optional[int] = None) -> Optional[User]:
+        return await crud.get_user(self.db, user_id, organization_id=organization_id)
 
-    async def list_users(self, skip: int = 0, limit: int = 100, organization_id: Optional[int] = None) -> tuple[List[User], int]:
+    async def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        organization_id: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> tuple[List[Row], int]:
         """
         List users with optional organization filtering
         
@@ -33,15 +43,24 @@ class UserService:
             skip: Number of records to skip
             limit: Maximum number of records to return
             organization_id: Organization ID for multi-tenant filtering (optional)
+            after_id: Keyset pagination - only users with id > after_id (optional)
             
         Returns:
-            Tuple of (List of users, total count), filtered by organization if provided
+            Tuple of (List of crud.USER_LIST_COLUMNS rows, total count),
+            filtered by organization if provided
         """
-        return await crud.get_users(self.db, skip=skip, limit=limit, organization_id=organization_id)
+        return await crud.get_user_rows(
+            self.db,
+            skip=skip,
+            limit=limit,
+            organization_id=organization_id,
+            after_id=after_id
+        )
 
-    async def create_user(self, user_in: schemas.UserCreate) -> User:
+    async def create_user(self, user_in: schemas.UserCreate) -> Optional[User]:
         """
         Create a new user with organization assignment
+        Returns None if the email is already registered
         
         Organization assignment logic:
         1. If organization_name provided → get or create organization
@@ -76,8 +95,7 @@ class UserService:
             organization_id = 1
         
         # Check if this is the first user in the organization
-        user_count = await org_crud.get_organization_user_count(self.db, organization_id)
-        is_first_user = user_count == 0
+        is_first_user = not await org_crud.organization_has_users(self.db, organization_id)
         
         # Role assignment: First user gets ADMIN role automatically
         final_role = user_in.role
@@ -101,12 +119,37 @@ class UserService:
         return user
 
     async def update_user(self, user_id: int, user_in: schemas.UserUpdate) -> Optional[User]:
+        """
+        Update a user
+        Raises ValueError if the new email is already registered
+        """
         hashed = get_password_hash(user_in.password) if user_in.password else None
-        return await crud.update_user(self.db, user_id, user_in, hashed_password=hashed)
+        try:
+            user = await crud.update_user(self.db, user_id, user_in, hashed_password=hashed)
+        except IntegrityError as e:
+            await self.db.rollback()
+            # Unique email index rejected the change (no SELECT pre-check, no race)
+            if "email" in str(e.orig):
+                raise ValueError("Bu e-posta zaten kayıtlı")
+            raise
+        current_user_cache.invalidate(user_id)
+        if user_in.email:
+            # The old address may have been the one its domain was matched by
+            email_domain_org_cache.clear()
+        return user
     
     async def delete_user(self, user_id: int) -> bool:
         """Delete a user"""
-        return await crud.delete_user(self.db, user_id)
+        deleted = await crud.delete_user(self.db, user_id)
+        current_user_cache.invalidate(user_id)
+        email_domain_org_cache.clear()
+        return deleted
+    
+    async def soft_delete_user(self, user_id: int) -> bool:
+        """Mark a user as deleted; purge_deleted_user removes the row later"""
+        deleted = await crud.soft_delete_user(self.db, user_id)
+        current_user_cache.invalidate(user_id)
+        return deleted
 
     async def authenticate(self, email: str, password: str) -> Optional[User]:
         user = await self.get_by_email(email)
@@ -114,14 +157,10 @@ class UserService:
             return None
         if not verify_password(password, user.hashed_password):
             return None
-        # Update last login
-        await self.db.execute(
-            update(User)
-            .where(User.id == user.id)
-            .values(last_login=datetime.utcnow())
-        )
+        # Update last login (flushes just this column; no refresh, so the
+        # eagerly loaded domains aren't selected again)
+        user.last_login = datetime.utcnow()
         await self.db.commit()
-        await self.db.refresh(user)
         return user
 
     async def update_user_domains(self, user_id: int, domain_ids: List[int]) -> Optional[User]:
@@ -145,6 +184,7 @@ class UserService:
             )
         
         await self.db.commit()
+        current_user_cache.invalidate(user_id)
         await self.db.refresh(user)
         return user
     
@@ -155,20 +195,23 @@ class UserService:
         User domains are now derived from organization domains.
         Users automatically have access to all domains integrated into their organization.
         """
-        user = await self.get_by_id(user_id)
-        if not user:
+        # Only role and organization are needed - skip loading the user's relationships
+        result = await self.db.execute(
+            select(User.role, User.organization_id).where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
             return []
+        role, organization_id = row
         
         # SUPER_ADMIN has access to all domains
-        if user.role == UserRole.SUPER_ADMIN:
-            result = await self.db.execute(select(Domain))
+        if role == UserRole.SUPER_ADMIN:
+            result = await self.db.execute(select(Domain).order_by(Domain.id))
             return list(result.scalars().all())
         
-        # Get organization's domains
-        if user.organization_id:
-            from backend.database import crud
-            org_domains = await crud.get_organization_domains(self.db, user.organization_id)
-            return org_domains
+        # Get organization's domains (single JOIN query)
+        if organization_id:
+            return await crud.get_organization_domains(self.db, organization_id)
         
         return []
 
@@ -187,3 +230,17 @@ class UserService:
         return await self.create_user(admin)
 
 
+async def purge_deleted_user(user_id: int):
+    """
+    Hard-delete a soft-deleted user and its related rows
+    
+    Runs as a background task after the DELETE response has been sent,
+    so it opens its own session instead of reusing the request's.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await crud.delete_user(db, user_id)
+        email_domain_org_cache.clear()
+        logger.info(f"Purged deleted user {user_id}")
+    except Exception as e:
+        logger.error(f"Failed to purge deleted user {user_id}: {str(e)}", exc_info=True)
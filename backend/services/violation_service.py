@@ -4,17 +4,31 @@ Business logic layer for violation management
 Follows SOLID principles and clean architecture
 """
 
-from typing import Optional, List, Tuple
+from typing import AsyncIterator, Dict, Iterable, Optional, List, Tuple
 from datetime import datetime
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database import crud, schemas
+from backend.database.connection import AsyncSessionLocal
 from backend.database.models import Violation, ViolationSeverity
+from backend.utils.cache import violation_stats_cache
 from backend.utils.logger import logger
 from backend.utils.snapshots import save_snapshot_image
 from backend.services.notification_service import get_notification_service
 
 
+def _invalidate_violation_stats(organization_ids: Iterable[Optional[int]]) -> None:
+    """
+    Drop cached stats the written organizations' violations count towards
+
+    Unscoped stats (organization_id None, the super admin view) span every
+    organization, so any write makes them stale too.
+    """
+    for organization_id in {*organization_ids, None}:
+        violation_stats_cache.invalidate_group(organization_id)
+
+
 class ViolationService:
     """
     Service class for violation business logic
@@ -39,7 +53,7 @@ class ViolationService:
         self,
         filters: schemas.ViolationFilterParams,
         organization_id: Optional[int] = None
-    ) -> Tuple[List[Violation], int]:
+    ) -> Tuple[List[Row], Optional[int]]:
         """
         Get violations with filtering and pagination
         
@@ -48,25 +62,48 @@ class ViolationService:
             organization_id: Organization ID for multi-tenant filtering (required for data isolation)
             
         Returns:
-            Tuple of (violations list, total count)
+            Tuple of (crud.VIOLATION_LIST_COLUMNS rows, total count or None if filters.include_total is False)
         """
         logger.debug(f"Fetching violations with filters: {filters}, organization_id: {organization_id}")
         violations, total = await crud.get_violations(self.db, filters, organization_id=organization_id)
         logger.info(f"Retrieved {len(violations)} violations (total: {total}) for organization {organization_id}")
         return violations, total
     
-    async def get_violation_by_id(self, violation_id: int) -> Optional[Violation]:
+    def stream_violations(
+        self,
+        filters: schemas.ViolationFilterParams,
+        organization_id: Optional[int] = None
+    ) -> AsyncIterator[Row]:
+        """
+        Stream all violations matching the filters (for exports)
+        
+        Args:
+            filters: Filter parameters (pagination fields are ignored)
+            organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+            
+        Returns:
+            Async iterator of crud.VIOLATION_LIST_COLUMNS rows, newest first
+        """
+        logger.debug(f"Streaming violations with filters: {filters}, organization_id: {organization_id}")
+        return crud.stream_violations(self.db, filters, organization_id=organization_id)
+    
+    async def get_violation_by_id(
+        self,
+        violation_id: int,
+        organization_id: Optional[int] = None
+    ) -> Optional[Violation]:
         """
         Get violation by ID
         
         Args:
             violation_id: Violation ID
+            organization_id: Organization ID for multi-tenant filtering (optional)
             
         Returns:
             Violation if found, None otherwise
         """
         logger.debug(f"Fetching violation {violation_id}")
-        violation = await crud.get_violation_by_id(self.db, violation_id)
+        violation = await crud.get_violation_by_id(self.db, violation_id, organization_id=organization_id)
         if violation:
             logger.debug(f"Violation {violation_id} found")
         else:
@@ -96,20 +133,83 @@ class ViolationService:
         """
         logger.info(f"Creating violation for camera {violation_data.camera_id}")
         
-        # Validate camera exists
-        camera = await crud.get_camera_by_id(self.db, violation_data.camera_id)
-        if not camera:
+        # Validate camera and domain exist (single query)
+        camera_check = await crud.get_camera_with_domain_check(
+            self.db, violation_data.camera_id, violation_data.domain_id
+        )
+        if camera_check is None:
             error_msg = f"Camera {violation_data.camera_id} not found"
             logger.error(error_msg)
             raise ValueError(error_msg)
+        camera, domain_exists = camera_check
         
-        # Validate domain exists
-        domain = await crud.get_domain_by_id(self.db, violation_data.domain_id)
-        if not domain:
+        if not domain_exists:
             error_msg = f"Domain {violation_data.domain_id} not found"
             logger.error(error_msg)
             raise ValueError(error_msg)
         
+        self._prepare_violation(violation_data)
+
+        # Create violation with organization_id from camera
+        violation = await crud.create_violation(self.db, violation_data, organization_id=camera.organization_id)
+        _invalidate_violation_stats([violation.organization_id])
+        logger.info(f"Violation {violation.id} created successfully")
+
+        await self._send_violation_alert(violation, camera)
+
+        return violation
+    
+    async def create_violations_bulk(
+        self,
+        violations_data: List[schemas.ViolationCreate]
+    ) -> List[Violation]:
+        """
+        Create many violations with one validation query per table and a single INSERT
+        
+        Same business logic as create_violation (severity, snapshots, alerts);
+        the whole batch is rejected if any camera or domain is missing.
+        
+        Args:
+            violations_data: Violation creation data (ML engine batch)
+            
+        Returns:
+            Created violations, in input order
+            
+        Raises:
+            ValueError: If a camera or domain is not found
+        """
+        logger.info(f"Creating {len(violations_data)} violations in bulk")
+        
+        cameras = await crud.get_cameras_by_ids(self.db, {v.camera_id for v in violations_data})
+        domain_ids = await crud.get_existing_domain_ids(self.db, {v.domain_id for v in violations_data})
+        for violation_data in violations_data:
+            if violation_data.camera_id not in cameras:
+                error_msg = f"Camera {violation_data.camera_id} not found"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            if violation_data.domain_id not in domain_ids:
+                error_msg = f"Domain {violation_data.domain_id} not found"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+        
+        for violation_data in violations_data:
+            self._prepare_violation(violation_data)
+        
+        violations = await crud.create_violations(
+            self.db,
+            violations_data,
+            organization_ids=[cameras[v.camera_id].organization_id for v in violations_data]
+        )
+        _invalidate_violation_stats(v.organization_id for v in violations)
+        logger.info(f"{len(violations)} violations created successfully")
+        
+        for violation in violations:
+            await self._send_violation_alert(violation, cameras[violation.camera_id])
+        
+        return violations
+    
+    def _prepare_violation(self, violation_data: schemas.ViolationCreate) -> None:
+        """Fill in severity and move the base64 snapshot to disk before insert"""
         # Calculate severity if not provided
         if not violation_data.severity:
             violation_data.severity = self._calculate_severity(
@@ -122,12 +222,9 @@ class ViolationService:
             snapshot_path = save_snapshot_image(violation_data.frame_snapshot)
             violation_data.snapshot_path = snapshot_path
             violation_data.frame_snapshot = None  # do not store base64 in DB
-
-        # Create violation with organization_id from camera
-        violation = await crud.create_violation(self.db, violation_data, organization_id=camera.organization_id)
-        logger.info(f"Violation {violation.id} created successfully")
-
-        # Send email notification (non-blocking)
+    
+    async def _send_violation_alert(self, violation: Violation, camera) -> None:
+        """Send the email notification for a new violation (never raises)"""
         try:
             notification_service = get_notification_service()
 
@@ -138,7 +235,7 @@ class ViolationService:
                 'camera_id': violation.camera_id,
                 'camera_name': camera.name,
                 'location': camera.location or 'Unknown',
-                'missing_ppe': [item.get('type', '') for item in violation_data.missing_ppe],
+                'missing_ppe': [item.get('type', '') for item in violation.missing_ppe or []],
                 'timestamp': violation.timestamp.isoformat(),
                 'confidence': violation.confidence,
             }
@@ -152,8 +249,6 @@ class ViolationService:
         except Exception as e:
             # Don't fail violation creation if notification fails
             logger.error(f"Failed to send violation notification: {str(e)}")
-
-        return violation
     
     async def update_violation(
         self,
@@ -179,6 +274,7 @@ class ViolationService:
         )
         
         if violation:
+            _invalidate_violation_stats([violation.organization_id])
             logger.info(f"Violation {violation_id} updated successfully")
         else:
             logger.warning(f"Violation {violation_id} not found for update")
@@ -231,6 +327,13 @@ class ViolationService:
         Returns:
             Statistics dictionary
         """
+        # Dashboards poll this; identical queries within the TTL share one result.
+        # Writes below drop the organization's entries, so counts never lag behind them.
+        cache_key = (organization_id, domain_id, start_date, end_date)
+        stats = violation_stats_cache.get(cache_key)
+        if stats is not None:
+            return stats
+        
         logger.debug(f"Fetching statistics for domain {domain_id}, organization {organization_id}")
         stats = await crud.get_violation_stats(
             self.db,
@@ -240,8 +343,55 @@ class ViolationService:
             organization_id=organization_id
         )
         logger.debug(f"Statistics retrieved: {stats}")
+        violation_stats_cache.set(cache_key, stats)
         return stats
     
+    async def get_statistics_by_domain(
+        self,
+        domain_ids: List[int],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        organization_id: Optional[int] = None
+    ) -> Dict[int, dict]:
+        """
+        Get violation statistics for several domains at once
+        
+        Cached domains are served from violation_stats_cache; the rest are
+        computed concurrently, one pooled session per domain.
+        
+        Args:
+            domain_ids: Domains to compute statistics for
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            organization_id: Organization ID for multi-tenant filtering (required for data isolation)
+            
+        Returns:
+            Dictionary of domain_id -> statistics dictionary
+        """
+        stats_by_domain = {}
+        missing = []
+        for domain_id in dict.fromkeys(domain_ids):
+            stats = violation_stats_cache.get((organization_id, domain_id, start_date, end_date))
+            if stats is None:
+                missing.append(domain_id)
+            else:
+                stats_by_domain[domain_id] = stats
+        
+        if missing:
+            logger.debug(f"Fetching statistics for domains {missing}, organization {organization_id}")
+            computed = await crud.get_violation_stats_multi(
+                AsyncSessionLocal,
+                missing,
+                start_date,
+                end_date,
+                organization_id=organization_id
+            )
+            for domain_id, stats in computed.items():
+                violation_stats_cache.set((organization_id, domain_id, start_date, end_date), stats)
+            stats_by_domain.update(computed)
+        
+        return {domain_id: stats_by_domain[domain_id] for domain_id in dict.fromkeys(domain_ids)}
+    
     def _calculate_severity(
         self,
         missing_ppe: List[dict]
@@ -0,0 +1,81 @@
+"""
+In-process TTL cache for read-mostly reference data
+Entries expire after a fixed time; writers invalidate explicitly
+"""
+
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Small time-based cache (per process, not shared between workers)
+
+    Usage:
+        from backend.utils.cache import ppe_types_cache
+        ppe_types = ppe_types_cache.get(key)
+        if ppe_types is None:
+            ppe_types = await load_ppe_types()
+            ppe_types_cache.set(key, ppe_types)
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        """
+        Initialize cache
+
+        Args:
+            ttl_seconds: Lifetime of each entry
+            maxsize: Maximum number of entries before eviction
+        """
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value, or default if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value for ttl_seconds"""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._evict()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def invalidate_group(self, group: Hashable) -> None:
+        """Drop every tuple key whose first element is group"""
+        for key in [key for key in self._entries if isinstance(key, tuple) and key[:1] == (group,)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        """Remove expired entries, or the oldest entry if none expired"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+
+
+# Shared caches (writers in any module can invalidate them)
+ppe_types_cache = TTLCache(ttl_seconds=30)  # keys: ("list", skip, limit) -> JSON bytes / ("id", ppe_type_id) -> model
+organization_domains_cache = TTLCache(ttl_seconds=10)  # keys: organization_id -> JSON bytes
+violation_stats_cache = TTLCache(ttl_seconds=15)  # keys: (organization_id, domain_id, start_date, end_date) -> stats dict
+current_user_cache = TTLCache(ttl_seconds=15)  # keys: user_id -> (User, [Domain]) detached from any session
+domains_cache = TTLCache(ttl_seconds=60)  # keys: ("id", domain_id) / ("type", domain_type) -> Domain detached from any session
+domain_rules_cache = TTLCache(ttl_seconds=60)  # keys: domain_id -> [DomainPPERule] with ppe_type loaded, detached
+email_domain_org_cache = TTLCache(ttl_seconds=300, maxsize=10_000)  # keys: email domain ("acme.com") -> organization_id
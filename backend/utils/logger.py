@@ -3,7 +3,10 @@ Logging utility for PPE Compliance System
 Centralized logging with different log levels
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from typing import Optional
@@ -35,7 +38,14 @@ class Logger:
             self._setup_handlers()
     
     def _setup_handlers(self):
-        """Setup console and file handlers"""
+        """
+        Setup console and file handlers
+        
+        Handlers are drained by a QueueListener thread: logging calls only
+        enqueue the record, so console/file I/O never blocks the event loop.
+        """
+        handlers = []
+        
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
@@ -43,7 +53,7 @@ class Logger:
             '[%(levelname)s] %(message)s'
         )
         console_handler.setFormatter(console_format)
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler (if logs directory exists)
         if settings.logs_dir.exists():
@@ -55,7 +65,16 @@ class Logger:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(file_format)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        # Flush pending records on interpreter exit
+        atexit.register(self._listener.stop)
     
     def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
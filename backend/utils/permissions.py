@@ -141,33 +141,64 @@ ROLE_PERMISSIONS: dict[UserRole, List[Permission]] = {
 }
 
 
-def get_user_permissions(user: User) -> List[Permission]:
-    """
-    Get all permissions for a user (role-based + custom permissions)
-    
-    Args:
-        user: User object
-        
-    Returns:
-        List of Permission enums
-    """
-    permissions = set()
+# Decision tables, computed once at import time
+_ROLE_PERMISSION_SETS: dict[UserRole, frozenset[Permission]] = {
+    role: frozenset(perms) for role, perms in ROLE_PERMISSIONS.items()
+}
+
+# Roles that may manage an organization's domains (SUPER_ADMIN: any organization)
+CAN_MODIFY_ORG_DOMAINS: frozenset[UserRole] = frozenset({UserRole.SUPER_ADMIN, UserRole.ADMIN})
+
+
+_ALL_PERMISSIONS: frozenset[Permission] = frozenset(Permission)
+
+
+def _resolve_permissions(user: User) -> frozenset[Permission]:
+    """Effective permission set of a user (role-based + valid custom permissions)"""
+    # SUPER_ADMIN has all permissions
+    if user.role == UserRole.SUPER_ADMIN:
+        return _ALL_PERMISSIONS
     
-    # Add role-based permissions
-    role_perms = ROLE_PERMISSIONS.get(user.role, [])
-    permissions.update(role_perms)
+    permissions = _ROLE_PERMISSION_SETS.get(user.role, frozenset())
     
     # Add custom permissions from user.permissions
     if user.permissions:
+        custom = set()
         for perm_str in user.permissions:
             try:
-                perm = Permission(perm_str)
-                permissions.add(perm)
+                custom.add(Permission(perm_str))
             except ValueError:
                 # Invalid permission string, skip
                 pass
+        permissions = permissions | custom
+    
+    return permissions
+
+
+def _permission_set(user: User) -> frozenset[Permission]:
+    """
+    Effective permissions, resolved once per user object
+    
+    Users are loaded per request, so the memo lives as long as the request.
+    """
+    permissions = user.__dict__.get("_permission_set")
+    if permissions is None:
+        permissions = _resolve_permissions(user)
+        user._permission_set = permissions
+    return permissions
+
+
+def get_user_permissions(user: User) -> List[Permission]:
+    """
+    Get all permissions for a user (role-based + custom permissions)
     
-    return list(permissions)
+    Args:
+        user: User object
+        
+    Returns:
+        List of Permission enums
+    """
+    return list(_permission_set(user))
 
 
 def has_permission(user: User, permission: Permission) -> bool:
@@ -181,12 +212,7 @@ def has_permission(user: User, permission: Permission) -> bool:
     Returns:
         True if user has permission, False otherwise
     """
-    # SUPER_ADMIN has all permissions
-    if user.role == UserRole.SUPER_ADMIN:
-        return True
-    
-    user_permissions = get_user_permissions(user)
-    return permission in user_permissions
+    return permission in _permission_set(user)
 
 
 def has_any_permission(user: User, permissions: List[Permission]) -> bool:
@@ -229,3 +255,32 @@ def can_access_domain(user: User, domain_id: int) -> bool:
     # Other roles need explicit domain_id
     return False
 
+
+def can_access_org(user: User, organization_id: int) -> bool:
+    """
+    Check if user can read data of an organization
+    
+    Args:
+        user: User object
+        organization_id: Organization ID to check
+        
+    Returns:
+        True for SUPER_ADMIN or members of the organization
+    """
+    return user.role == UserRole.SUPER_ADMIN or user.organization_id == organization_id
+
+
+def can_modify_org(user: User, organization_id: int) -> bool:
+    """
+    Check if user can manage an organization's domains
+    
+    Args:
+        user: User object
+        organization_id: Organization ID to check
+        
+    Returns:
+        True for SUPER_ADMIN, or ADMIN of the organization
+    """
+    return user.role == UserRole.SUPER_ADMIN or (
+        user.role in CAN_MODIFY_ORG_DOMAINS and user.organization_id == organization_id
+    )
@@ -0,0 +1,72 @@
+"""
+JSON serialization helpers for list endpoints
+Large pages are validated/encoded in the threadpool to keep the event loop free
+"""
+
+import hashlib
+from typing import Any, Callable, Sequence, TypeVar
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+
+
+T = TypeVar("T")
+
+# Pages up to this many rows are cheap enough to encode inline
+OFFLOAD_THRESHOLD = 32
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, size: int) -> T:
+    """
+    Run func(*args) inline for small inputs, in the threadpool for large ones
+
+    Args:
+        func: Synchronous function (must not touch the DB session or lazy-load)
+        size: Number of rows func will process
+    """
+    if size > OFFLOAD_THRESHOLD:
+        return await run_in_threadpool(func, *args)
+    return func(*args)
+
+
+def _validate_and_dump(adapter: TypeAdapter, rows: Sequence[Any]) -> bytes:
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+async def dump_json_list(adapter: TypeAdapter, rows: Sequence[Any]) -> bytes:
+    """
+    Validate ORM rows against a list TypeAdapter and encode them as JSON bytes
+
+    Rows must already have every attribute the schema reads loaded.
+    """
+    return await run_cpu_bound(_validate_and_dump, adapter, rows, size=len(rows))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already covers etag (weak tags and * included)"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def cached_json_response(request: Request, body: bytes, max_age: int = 0) -> Response:
+    """
+    Wrap JSON bytes in a response with an ETag and Cache-Control: private
+
+    The ETag is a hash of the body, so it changes exactly when the data does.
+    If the client's If-None-Match already has it, a bodyless 304 is returned.
+
+    Args:
+        max_age: Seconds the browser may reuse the response without asking
+                 (0 = always revalidate)
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
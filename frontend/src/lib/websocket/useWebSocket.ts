@@ -22,7 +22,7 @@ export interface ViolationNotification {
 }
 
 export interface WebSocketMessage {
-  type: 'connected' | 'violation' | 'keepalive' | 'pong'
+  type: 'connected' | 'violation' | 'violation_batch' | 'keepalive' | 'pong'
   data?: any
   message?: string
   timestamp?: string
@@ -113,6 +113,14 @@ export function useWebSocket(options: UseWebSocketOptions = {}) {
                 onViolationRef.current(message.data)
               }
               break
+            case 'violation_batch':
+              // Burst of violations sent as one message
+              if (Array.isArray(message.data) && onViolationRef.current) {
+                message.data.forEach((violation: ViolationNotification['data']) => {
+                  onViolationRef.current?.(violation)
+                })
+              }
+              break
             case 'keepalive':
             case 'pong':
               // Keep connection alive
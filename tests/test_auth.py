@@ -0,0 +1,56 @@
+"""
+Tests for the get_current_user dependency (backend/api/auth.py)
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from backend.api import auth
+from backend.database.models import Base, Domain, Organization, User, UserRole, organization_domains
+from backend.utils.cache import current_user_cache
+from backend.utils.security import create_access_token
+
+
+@pytest.mark.asyncio
+async def test_back_to_back_writes_with_cached_user(tmp_path, monkeypatch):
+    """
+    The cached user's domains must not be re-inserted on the next flush
+
+    Two writes with the same token inside the current_user_cache TTL used to
+    fail with IntegrityError on user_domains for the second request.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(auth, "AsyncSessionLocal", session_factory)
+    current_user_cache.clear()
+
+    async with session_factory() as db:
+        db.add(Organization(id=1, name="Acme", slug="acme"))
+        db.add_all([Domain(id=i, name=f"Domain {i}", type=f"type_{i}") for i in (1, 2)])
+        db.add(User(
+            id=1, email="admin@acme.com", full_name="Admin", hashed_password="x",
+            role=UserRole.ADMIN, organization_id=1
+        ))
+        await db.flush()
+        await db.execute(organization_domains.insert().values([
+            {"organization_id": 1, "domain_id": 1},
+            {"organization_id": 1, "domain_id": 2},
+        ]))
+        await db.commit()
+
+    token = create_access_token(subject=1, role=UserRole.ADMIN.value)
+    try:
+        for name in ("First", "Second"):
+            async with session_factory() as db:
+                user = await auth.get_current_user(token, db)
+                assert [domain.id for domain in user.domains] == [1, 2]
+                user.full_name = name
+                await db.commit()
+
+        async with session_factory() as db:
+            assert (await db.get(User, 1)).full_name == "Second"
+    finally:
+        current_user_cache.clear()
+        await engine.dispose()